@@ -0,0 +1,30 @@
+"""
+pytest-benchmark configuration - Benchmarks are skipped when pytest-benchmark is not installed.
+
+Run the suite with `nox -s benchmark` or `pytest benchmarks/`. Results are stored in `.benchmarks/` when
+`--benchmark-autosave` or `--benchmark-save=<name>` is passed. To evaluate an upgrade, save a baseline with the
+current release and compare the candidate against it:
+
+    nox -s benchmark -- --benchmark-save=baseline
+    # install/checkout the candidate
+    nox -s benchmark -- --benchmark-compare --benchmark-compare-fail=mean:10%
+
+`pytest-benchmark compare` renders reports (tables, histograms, csv) of stored runs.
+"""
+
+import pytest
+
+try:
+    import pytest_benchmark  # noqa: F401 pylint: disable=unused-import
+    collect_ignore_glob = []
+except ImportError:
+    collect_ignore_glob = ['test_*.py']
+
+
+class Model(object):
+    """A plain model without callbacks."""
+
+
+@pytest.fixture
+def model():
+    return Model()
@@ -0,0 +1,86 @@
+import asyncio
+import sys
+
+import pytest
+
+from transitions.extensions.asyncio import AsyncMachine, HierarchicalAsyncMachine
+
+from .conftest import Model
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+NUM_MODELS = 10
+TRIGGERS_PER_MODEL = 10
+SEQUENTIAL_TRIGGERS = 100
+
+
+def _new_loop(loop_type):
+    if loop_type == 'uvloop':
+        if uvloop is None:
+            pytest.skip('uvloop is not installed')
+        return uvloop.new_event_loop()
+    if loop_type == 'eager' and sys.version_info < (3, 12):
+        pytest.skip('eager task factories require Python 3.12 or later')
+    loop = asyncio.new_event_loop()
+    if loop_type == 'eager':
+        loop.set_task_factory(asyncio.eager_task_factory)
+    return loop
+
+
+def _run_concurrently(models):
+    async def run():
+        for _ in range(TRIGGERS_PER_MODEL):
+            await asyncio.gather(*[model.next_state() for model in models])
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize('queued', [False, True, 'model'])
+def test_async_trigger_throughput(benchmark, queued):
+    models = [Model() for _ in range(NUM_MODELS)]
+    AsyncMachine(models, states=['A', 'B', 'C'], initial='A', auto_transitions=False, ordered_transitions=True,
+                 queued=queued)
+    benchmark(_run_concurrently, models)
+    benchmark.extra_info['triggers'] = NUM_MODELS * TRIGGERS_PER_MODEL
+
+
+def test_async_callbacks(benchmark):
+    async def callback():
+        await asyncio.sleep(0)
+
+    models = [Model() for _ in range(NUM_MODELS)]
+    AsyncMachine(models, states=['A', 'B', 'C'], initial='A', auto_transitions=False, ordered_transitions=True,
+                 before_state_change=[callback, callback], after_state_change=callback)
+    benchmark(_run_concurrently, models)
+
+
+def test_async_nested_trigger_throughput(benchmark):
+    states = [{'name': 'A', 'children': ['1', '2', '3'], 'initial': '1'}]
+    models = [Model() for _ in range(NUM_MODELS)]
+    machine = HierarchicalAsyncMachine(models, states=states, initial='A', auto_transitions=False)
+    machine.add_ordered_transitions(['A_1', 'A_2', 'A_3'])
+    benchmark(_run_concurrently, models)
+
+
+@pytest.mark.parametrize('loop_type', ['asyncio', 'eager', 'uvloop'])
+@pytest.mark.parametrize('callback', [False, True])
+def test_async_trigger_latency(benchmark, loop_type, callback):
+    async def process():
+        await asyncio.sleep(0)
+
+    async def run():
+        for _ in range(SEQUENTIAL_TRIGGERS):
+            await model.next_state()
+
+    model = Model()
+    AsyncMachine(model, states=['A', 'B', 'C'], initial='A', auto_transitions=False, ordered_transitions=True,
+                 after_state_change=process if callback else None)
+    loop = _new_loop(loop_type)
+    try:
+        benchmark(lambda: loop.run_until_complete(run()))
+    finally:
+        loop.close()
+    benchmark.extra_info['triggers'] = SEQUENTIAL_TRIGGERS
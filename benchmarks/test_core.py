@@ -0,0 +1,64 @@
+import pytest
+
+from transitions import Machine
+
+from .conftest import Model
+
+
+def _state_names(num):
+    return ['s%d' % i for i in range(num)]
+
+
+@pytest.mark.parametrize('num_states', [10, 1000, 10000])
+def test_trigger_throughput(benchmark, model, num_states):
+    # auto transitions would add num_states ** 2 transitions
+    machine = Machine(model, states=_state_names(num_states), initial='s0', auto_transitions=False,
+                      ordered_transitions=True)
+    benchmark(model.next_state)
+    assert machine.get_state(model.state)
+
+
+@pytest.mark.parametrize('num_states', [10, 1000])
+def test_auto_transition(benchmark, model, num_states):
+    Machine(model, states=_state_names(num_states), initial='s0')
+    target = getattr(model, 'to_s%d' % (num_states - 1))
+    benchmark(target)
+    assert model.state == 's%d' % (num_states - 1)
+
+
+def test_conditions_and_callbacks(benchmark):
+
+    class CallbackModel(object):
+
+        def check(self):
+            return True
+
+        def callback(self):
+            pass
+
+    model = CallbackModel()
+    Machine(model, states=['A', 'B'], initial='A', auto_transitions=False,
+            transitions=[dict(trigger='go', source='A', dest='B', conditions='check', before='callback',
+                              after='callback'),
+                         dict(trigger='go', source='B', dest='A', unless='check'),
+                         dict(trigger='go', source='B', dest='A', prepare='callback')],
+            before_state_change='callback', after_state_change='callback')
+    benchmark(model.go)
+
+
+@pytest.mark.parametrize('num_models', [1, 100, 1000])
+def test_add_model(benchmark, num_models):
+
+    def setup():
+        machine = Machine(model=None, states=_state_names(10), initial='s0', ordered_transitions=True)
+        return (machine, [Model() for _ in range(num_models)]), {}
+
+    def add_model(machine, models):
+        machine.add_model(models)
+
+    benchmark.pedantic(add_model, setup=setup, rounds=20)
+
+
+@pytest.mark.parametrize('num_states', [10, 100])
+def test_machine_init(benchmark, num_states):
+    benchmark(Machine, states=_state_names(num_states), initial='s0')
@@ -0,0 +1,85 @@
+import pytest
+
+from transitions.extensions.markup import MarkupMachine, HierarchicalMarkupMachine
+from transitions.extensions.diagrams import GraphMachine, HierarchicalGraphMachine
+
+try:
+    import graphviz
+    graphviz.version()
+except (ImportError, RuntimeError, OSError):  # graphviz.ExecutableNotFound is a RuntimeError
+    graphviz = None
+
+try:
+    import pygraphviz
+except ImportError:
+    pygraphviz = None
+
+NUM_STATES = 50
+
+
+def _states():
+    return ['s%d' % i for i in range(NUM_STATES)]
+
+
+def _nested_states():
+    return [{'name': 'n%d' % i, 'children': ['a', 'b', {'name': 'c', 'children': ['1', '2'], 'initial': '1'}],
+             'initial': 'a'} for i in range(NUM_STATES // 5)]
+
+
+def test_markup(benchmark):
+    machine = MarkupMachine(states=_states(), initial='s0', ordered_transitions=True, auto_transitions=False)
+
+    def generate():
+        machine.auto_transitions_markup = False  # invalidates the cached markup
+        return machine.markup
+
+    assert len(benchmark(generate)['states']) == NUM_STATES
+
+
+def test_nested_markup(benchmark):
+    machine = HierarchicalMarkupMachine(states=_nested_states(), initial='n0', auto_transitions=False)
+    machine.add_ordered_transitions()
+
+    def generate():
+        machine.auto_transitions_markup = False
+        return machine.markup
+
+    benchmark(generate)
+
+
+@pytest.mark.parametrize('graph_engine', [
+    'mermaid',
+    pytest.param('graphviz', marks=pytest.mark.skipif(graphviz is None, reason='graphviz is not available')),
+    pytest.param('pygraphviz', marks=pytest.mark.skipif(pygraphviz is None, reason='pygraphviz is not available'))
+])
+def test_graph_generation(benchmark, graph_engine):
+    machine = GraphMachine(states=_states(), initial='s0', ordered_transitions=True, auto_transitions=False,
+                           graph_engine=graph_engine)
+    benchmark(machine.get_graph, force_new=True)
+
+
+@pytest.mark.parametrize('graph_engine', [
+    'mermaid',
+    pytest.param('graphviz', marks=pytest.mark.skipif(graphviz is None, reason='graphviz is not available')),
+    pytest.param('pygraphviz', marks=pytest.mark.skipif(pygraphviz is None, reason='pygraphviz is not available'))
+])
+def test_nested_graph_generation(benchmark, graph_engine):
+    machine = HierarchicalGraphMachine(states=_nested_states(), initial='n0', auto_transitions=False,
+                                       graph_engine=graph_engine)
+    machine.add_ordered_transitions()
+    benchmark(machine.get_graph, force_new=True)
+
+
+@pytest.mark.skipif(graphviz is None, reason='graphviz is not available')
+def test_graphviz_rendering(benchmark):
+    machine = GraphMachine(states=_states(), initial='s0', ordered_transitions=True, auto_transitions=False,
+                           graph_engine='graphviz')
+    graph = machine.get_graph()
+    benchmark(graph.draw, None, format='svg', prog='dot')
+
+
+@pytest.mark.skipif(pygraphviz is None, reason='pygraphviz is not available')
+def test_pygraphviz_rendering(benchmark):
+    machine = GraphMachine(states=_states(), initial='s0', ordered_transitions=True, auto_transitions=False)
+    graph = machine.get_graph()
+    benchmark(graph.draw, None, format='svg', prog='dot')
@@ -0,0 +1,21 @@
+import subprocess
+import sys
+
+import pytest
+
+# every statement is executed in a fresh interpreter; 'pass' measures the interpreter startup as reference
+STATEMENTS = [
+    'pass',
+    'import transitions',
+    'import transitions.extensions',
+    'from transitions.extensions import HierarchicalMachine',
+    'from transitions.extensions import LockedMachine',
+    'from transitions.extensions import AsyncMachine',
+    'from transitions.extensions import GraphMachine',
+    'from transitions.extensions import MachineFactory',
+]
+
+
+@pytest.mark.parametrize('statement', STATEMENTS)
+def test_import_time(benchmark, statement):
+    benchmark.pedantic(subprocess.check_call, args=([sys.executable, '-c', statement],), rounds=10)
@@ -0,0 +1,35 @@
+from threading import Thread
+
+import pytest
+
+from transitions.extensions import LockedMachine
+
+from .conftest import Model
+
+TRIGGERS_PER_THREAD = 200
+
+
+@pytest.mark.parametrize('num_threads', [1, 4, 16])
+def test_contention(benchmark, num_threads):
+    """All threads trigger events of the same model and thus compete for the machine lock."""
+    model = Model()
+    LockedMachine(model, states=['A', 'B', 'C'], initial='A', auto_transitions=False, ordered_transitions=True)
+
+    def work():
+        for _ in range(TRIGGERS_PER_THREAD):
+            model.next_state()
+
+    def run():
+        threads = [Thread(target=work) for _ in range(num_threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    benchmark.pedantic(run, rounds=10)
+    benchmark.extra_info['triggers'] = num_threads * TRIGGERS_PER_THREAD
+
+
+def test_uncontended_trigger(benchmark, model):
+    LockedMachine(model, states=['A', 'B', 'C'], initial='A', auto_transitions=False, ordered_transitions=True)
+    benchmark(model.next_state)
@@ -0,0 +1,62 @@
+import pytest
+
+from transitions.extensions import HierarchicalMachine
+
+
+def _deep_states(depth):
+    """Returns a single root state 'L' with `depth` levels. The innermost level contains two states
+        '1' and '2' which are connected by 'go' transitions."""
+    state = {'name': 'L', 'children': ['1', '2'], 'initial': '1',
+             'transitions': [['go', '1', '2'], ['go', '2', '1']]}
+    for _ in range(depth - 1):
+        state = {'name': 'L', 'children': [state], 'initial': 'L'}
+    return [state]
+
+
+def _parallel_states(width):
+    """Returns a single root state 'P' with `width` parallel regions which all handle 'go'."""
+    return [{'name': 'P', 'parallel': [{'name': str(i), 'children': ['a', 'b'], 'initial': 'a',
+                                        'transitions': [['go', 'a', 'b'], ['go', 'b', 'a']]}
+                                       for i in range(width)]}]
+
+
+@pytest.mark.parametrize('depth', [1, 5, 10])
+def test_deep_trigger(benchmark, model, depth):
+    HierarchicalMachine(model, states=_deep_states(depth), initial='L', auto_transitions=False)
+    benchmark(model.go)
+    assert model.state.startswith('L')
+
+
+@pytest.mark.parametrize('depth', [1, 5, 10])
+def test_deep_enter_exit(benchmark, model, depth):
+    HierarchicalMachine(model, states=['A'] + _deep_states(depth), initial='A')
+
+    def roundtrip():
+        model.to_L()
+        model.to_A()
+
+    benchmark(roundtrip)
+
+
+@pytest.mark.parametrize('width', [2, 8, 32])
+def test_parallel_trigger(benchmark, model, width):
+    HierarchicalMachine(model, states=_parallel_states(width), initial='P', auto_transitions=False)
+    benchmark(model.go)
+    assert len(model.state) == width
+
+
+@pytest.mark.parametrize('width', [2, 8])
+def test_parallel_enter(benchmark, model, width):
+    HierarchicalMachine(model, states=['A'] + _parallel_states(width), initial='A')
+
+    def roundtrip():
+        model.to_P()
+        model.to_A()
+
+    benchmark(roundtrip)
+
+
+@pytest.mark.parametrize('depth', [1, 5])
+def test_hsm_init(benchmark, depth):
+    states = ['A'] + _deep_states(depth) + _parallel_states(4)
+    benchmark(HierarchicalMachine, states=states, initial='A')
@@ -33,3 +33,11 @@ def test_no_gv(session):
     session.install(".")
     session.install("-rrequirements_test.txt")
     session.run("pytest", "-nauto", "tests/")
+
+
+@nox.session(python=python[-1])
+def benchmark(session):
+    session.install(".")
+    session.install("-rrequirements_benchmark.txt")
+    session.install("-rrequirements_diagrams.txt")
+    session.run("pytest", "benchmarks/", *session.posargs)
@@ -37,7 +37,7 @@ setup(
     maintainer="Alexander Neumann",
     maintainer_email="aleneum@gmail.com",
     url="http://github.com/pytransitions/transitions",
-    packages=find_packages(exclude=["tests", "test_*"]),
+    packages=find_packages(exclude=["tests", "test_*", "benchmarks"]),
     package_data={
         "transitions": ["py.typed", "data/*"],
         "transitions.tests": ["data/*"],
@@ -1,5 +1,7 @@
 from asyncio import CancelledError
 import sys
+import gc
+import warnings
 
 from transitions.extensions.factory import AsyncGraphMachine, HierarchicalAsyncGraphMachine
 from transitions.extensions.states import add_state_features
@@ -7,12 +9,12 @@ from transitions.extensions.states import add_state_features
 try:
     import asyncio
     from transitions.extensions.asyncio import AsyncMachine, HierarchicalAsyncMachine, AsyncEventData, \
-        AsyncTransition, AsyncTimeout
+        AsyncTransition, AsyncTimeout, CANCELLED_MSG
 
 except (ImportError, SyntaxError):
     asyncio = None  # type: ignore
 
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from unittest import skipIf
 from functools import partial
 import weakref
@@ -22,7 +24,7 @@ from .test_graphviz import pgv as gv
 from .test_pygraphviz import pgv
 
 if TYPE_CHECKING:
-    from typing import Type, Sequence, List
+    from typing import Any, Type, Sequence, List
     from transitions.extensions.asyncio import AsyncTransitionConfig
 
 
@@ -139,6 +141,110 @@ class TestAsync(TestTransitions):
         self.assertEqual(m.state, 'C')
         self.assertTrue(mock.called)
 
+    def test_sync_conditions_not_gathered(self):
+        m = self.machine_cls(states=['A', 'B', 'C'], initial='A')
+        m.add_transition('sync', 'A', 'B', conditions=[self.synced_true, self.synced_true],
+                         unless=lambda: False)
+        m.add_transition('single', 'B', 'C', conditions=self.await_true)
+        m.add_transition('mixed', 'C', 'A', conditions=[self.synced_true, self.await_true, self.await_false])
+        with patch('transitions.extensions.asyncio.asyncio.gather', wraps=asyncio.gather) as gather:
+            asyncio.run(m.sync())
+            asyncio.run(m.may_single())
+            asyncio.run(m.single())
+            self.assertTrue(m.is_C())
+            # conditions are only gathered if at least two of them return awaitables
+            self.assertEqual([], [call for call in gather.call_args_list if call.args])
+            asyncio.run(m.mixed())
+            self.assertTrue(m.is_C())
+            self.assertEqual([2], [len(call.args) for call in gather.call_args_list if call.args])
+
+    def test_callback_classification(self):
+
+        class Model:
+
+            def __init__(self):
+                self.calls = []
+
+            def sync_cb(self):
+                self.calls.append('sync')
+
+            async def async_cb(self):
+                await asyncio.sleep(0)
+                self.calls.append('async')
+
+            @property
+            def prop(self):
+                self.calls.append('prop')
+                return True
+
+        model = Model()
+        m = self.machine_cls(model, states=['A', 'B'], initial='A')
+        event_data = AsyncEventData(m.get_state('A'), None, m, model, (), {})
+        self.assertFalse(m.is_coroutine_callback('sync_cb', event_data))
+        self.assertTrue(m.is_coroutine_callback('async_cb', event_data))
+        self.assertFalse(m.is_coroutine_callback('prop', event_data))
+        self.assertTrue(m.is_coroutine_callback(self.await_true, event_data))
+        self.assertFalse(m.is_coroutine_callback(self.synced_true, event_data))
+        self.assertIn((Model, 'async_cb'), m._coroutine_callbacks)
+        model.instance_cb = self.await_true
+        self.assertTrue(m.is_coroutine_callback('instance_cb', event_data))
+        self.assertNotIn((Model, 'instance_cb'), m._coroutine_callbacks)
+        self.assertEqual([], model.calls)
+
+        callbacks = ['async_cb', 'sync_cb', 'prop', partial(model.calls.append, 'partial')]  # type: List[Any]
+        m.add_transition('go', 'A', 'B', after=callbacks)
+        with patch('transitions.extensions.asyncio.asyncio.gather', wraps=asyncio.gather) as gather:
+            asyncio.run(model.go())
+            self.assertFalse(gather.called)
+        # synchronous callbacks are processed before the (single) coroutine is awaited
+        self.assertEqual(['sync', 'prop', 'partial', 'async'], model.calls)
+
+    def test_mixed_callback_order(self):
+        calls = []
+
+        def sync_cb(name):
+            calls.append(name)
+
+        async def async_cb(name):
+            calls.append(name)
+            await asyncio.sleep(0.01)
+            calls.append(name + '_done')
+
+        m = self.machine_cls(states=['A', 'B', 'C', 'D'], initial='A')
+        m.add_transition('go', 'A', 'B', after=[partial(async_cb, 'a'), partial(sync_cb, 'b')])
+        callbacks = [partial(async_cb, 'a'), partial(async_cb, 'b'), partial(sync_cb, 'c'),
+                     partial(async_cb, 'd'), partial(sync_cb, 'e'), partial(async_cb, 'f')]  # type: List[Any]
+        m.add_transition('go', 'B', 'C', after=callbacks)
+        failing = [partial(async_cb, 'a'), self.raise_value_error]  # type: List[Any]
+        m.add_transition('fail', 'C', 'D', after=failing)
+
+        async def run():
+            await m.go()
+            # callbacks are started in the order they have been passed
+            self.assertEqual(['a', 'b', 'a_done'], calls)
+            calls.clear()
+            await m.go()
+            self.assertEqual(['a', 'b', 'c', 'd', 'e', 'f'], [name for name in calls if '_' not in name])
+            self.assertEqual({'a_done', 'b_done', 'd_done', 'f_done'}, {name for name in calls if '_' in name})
+            calls.clear()
+            with self.assertRaises(ValueError):
+                await m.fail()
+            # started callbacks are not cancelled by errors of other callbacks
+            await asyncio.sleep(0.02)
+            self.assertEqual(['a', 'a_done'], calls)
+
+        asyncio.run(run())
+
+    def test_sync_condition_error(self):
+        m = self.machine_cls(states=['A', 'B'], initial='A')
+        m.add_transition('go', 'A', 'B', conditions=[self.await_true, self.raise_value_error])
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            with self.assertRaises(ValueError):
+                asyncio.run(m.go())
+            gc.collect()
+        self.assertTrue(m.is_A())
+
     def test_multiple_models(self):
 
         m1 = self.machine_cls(states=['A', 'B', 'C'], initial='A', name="m1")
@@ -219,6 +325,159 @@ class TestAsync(TestTransitions):
         self.assertEqual('C', model2.state)
         self.assertEqual(machine.initial, model3.state)
 
+    def test_dispatch_concurrency(self):
+        running = []
+        max_running = []
+
+        async def process(event_data):
+            # failing and rejecting triggers return right away
+            if event_data.kwargs.get('fail') is event_data.model:
+                raise ValueError("dispatch failed")
+            if event_data.kwargs.get('reject') is event_data.model:
+                return False
+            running.append(event_data.model)
+            max_running.append(len(running))
+            await asyncio.sleep(0.01)
+            running.remove(event_data.model)
+            return True
+
+        models = [DummyModel() for _ in range(20)]
+        transitions = [['go', 'A', 'B', process], ['go', 'B', 'A', process]]  # type: List[Any]
+        machine = self.machine_cls(model=models, states=['A', 'B'], initial='A', send_event=True,
+                                   transitions=transitions)
+
+        async def run():
+            results = [res async for res in machine.dispatch_iter('go', concurrency=5)]
+            self.assertEqual(5, max(max_running))
+            self.assertEqual(set(models), {model for model, _ in results})
+            self.assertTrue(all(res for _, res in results))
+            self.assertTrue(all(model.is_B() for model in models))
+
+            max_running.clear()
+            results = [res async for res in machine.dispatch_iter('go', concurrency=2, stop_on_failure=True,
+                                                                  reject=models[3])]
+            # models[2] was still running when models[3] had been rejected
+            self.assertEqual(4, len(results))
+            self.assertEqual(2, max(max_running))
+            self.assertFalse(dict(results)[models[3]])
+            self.assertTrue(all(model.is_A() for model in models[:3]))
+            self.assertTrue(all(model.is_B() for model in models[3:]))
+
+            await machine.dispatch('to_A')
+            with self.assertRaises(ValueError):
+                async for _ in machine.dispatch_iter('go', concurrency=4, fail=models[1]):
+                    pass
+            # running triggers finish but no further triggers are started
+            self.assertFalse(running)
+            self.assertTrue(models[0].is_B() and models[2].is_B() and models[3].is_B())
+            self.assertTrue(models[1].is_A())
+            self.assertTrue(all(model.is_A() for model in models[4:]))
+
+            await machine.dispatch('to_A')
+            max_running.clear()
+            machine.dispatch_concurrency = 3
+            self.assertTrue(await machine.dispatch('go'))
+            self.assertEqual(3, max(max_running))
+            self.assertTrue(all(model.is_B() for model in models))
+            # a limit passed to dispatch overrides dispatch_concurrency
+            max_running.clear()
+            self.assertTrue(await machine.dispatch('go', concurrency=6))
+            self.assertEqual(6, max(max_running))
+            self.assertTrue(all(model.is_A() for model in models))
+
+        asyncio.run(run())
+
+    def test_consume(self):
+        running = []
+        max_running = []
+        processed = []
+
+        class Model:
+
+            def __init__(self, name):
+                self.name = name
+
+            async def process(self, event_data):
+                running.append(self)
+                max_running.append(len(running))
+                # later messages of other models may finish earlier
+                await asyncio.sleep(event_data.kwargs.get('delay', 0))
+                running.remove(self)
+                processed.append((self.name, event_data.args))
+
+            def raise_error(self, event_data):
+                raise ValueError("consume failed")
+
+        models = [Model(name) for name in 'abc']
+        machine = self.machine_cls(model=models, states=['A', 'B'], initial='A', send_event=True,
+                                   after_state_change='process')
+        machine.add_transition('go', '*', 'B')
+        machine.add_transition('fail', '*', 'A', after='raise_error')
+
+        async def source(messages, error=None):
+            for message in messages:
+                yield message
+            if error is not None:
+                raise error
+
+        messages = [('a', 'go', (1,), {'delay': 0.03}), ('b', 'go', (1,), {'delay': 0.01}), ('a', 'go', (2,)),
+                    ('b', 'go', (2,)), ('c', 'go'), ('x', 'go'), ('b', 'fail'), ('d', 'go', (1,)), ('c', 'unknown')]
+
+        async def run():
+            results = [res async for res in machine.consume(source(messages), 'name', concurrency=2)]
+            self.assertEqual(len(messages), len(results))
+            self.assertEqual(2, max(max_running))
+            # messages of a model are processed in order
+            self.assertEqual([(1,), (2,)], [args for name, args in processed if name == 'a'])
+            self.assertEqual([(1,), (2,)], [args for name, args in processed if name == 'b'])
+            errors = {message: error for message, _, error in results if error is not None}
+            self.assertIsInstance(errors[('x', 'go')], ValueError)
+            self.assertIsInstance(errors[('b', 'fail')], ValueError)
+            self.assertIsInstance(errors[('c', 'unknown')], AttributeError)
+            self.assertIsInstance(errors[('d', 'go', (1,))], ValueError)
+            self.assertTrue(all(res for message, res, error in results if error is None))
+
+            machine.add_model(Model('d'))
+            processed.clear()
+            results = [res async for res in machine.consume(source(messages[7:8]), lambda model: model.name)]
+            self.assertEqual([(messages[7], True, None)], results)
+            self.assertEqual([('d', (1,))], processed)
+
+            async def late_source():
+                yield 'a', 'go'
+                machine.add_model(Model('e'))
+                yield 'e', 'go'
+
+            # models without a key are skipped and unknown keys only rebuild the index if models have changed
+            machine.add_model(DummyModel())
+            with patch.object(machine, '_index_models', wraps=machine._index_models) as index_models:
+                results = [res async for res in machine.consume(source([('x', 'go'), ('y', 'go'), (['a'], 'go')]),
+                                                                'name')]
+                self.assertEqual([ValueError] * 3, [type(error) for _, _, error in results])
+                self.assertEqual(1, index_models.call_count)
+                index_models.reset_mock()
+                results = [res async for res in machine.consume(late_source(), 'name')]
+                self.assertEqual([True, True], [res for _, res, _ in results])
+                self.assertEqual(2, index_models.call_count)
+
+            processed.clear()
+            with self.assertRaises(KeyError):
+                async for _ in machine.consume(source(messages[:5], KeyError('source failed')), 'name'):
+                    pass
+            # received messages are processed before the error is raised
+            self.assertEqual(5, len(processed))
+
+            processed.clear()
+            stream = machine.consume(source(messages[:2]), 'name')
+            async for _ in stream:
+                break
+            await stream.aclose()
+            # running triggers finish when the consumer stops
+            self.assertFalse(running)
+            self.assertEqual(2, len(processed))
+
+        asyncio.run(run())
+
     def test_queued(self):
         states = ['A', 'B', 'C', 'D']
         # Define with list of dictionaries
@@ -303,6 +562,171 @@ class TestAsync(TestTransitions):
             self.assertTrue(m2.is_A())
         asyncio.run(run())
 
+    def test_bounded_model_queue(self):
+        processed = []
+
+        async def process(event_data):
+            await asyncio.sleep(0.01)
+            processed.append((event_data.model, event_data.kwargs.get('idx')))
+
+        def raise_error(event_data):
+            raise ValueError("queued event failed")
+
+        def build(overflow):
+            machine = self.machine_cls(model=[DummyModel(), DummyModel()], states=['A', 'B'], initial='A',
+                                       queued='model', send_event=True, after_state_change=process)
+            machine.queue_capacity = 2
+            machine.queue_overflow = overflow
+            machine.add_transition('go', ['A', 'B'], 'B')
+            machine.add_transition('error', 'B', 'A', before=raise_error)
+            return machine
+
+        async def drain(machine):
+            for queue, _ in list(machine._model_queues.values()):
+                await queue.join()
+
+        async def run():
+            m = build('wait')
+            m1, m2 = m.models
+            # triggers return when their event has been queued; the third event has to wait for a free slot
+            res = await asyncio.gather(*[m1.go(idx=i) for i in range(5)], m2.go(idx=0))
+            self.assertTrue(all(res))
+            await drain(m)
+            self.assertEqual([0, 1, 2, 3, 4], [idx for model, idx in processed if model is m1])
+            self.assertEqual([0], [idx for model, idx in processed if model is m2])
+            # consumers end and queues are removed when they are empty
+            self.assertEqual({}, m._model_queues)
+            self.assertEqual(0, len(m.async_tasks))
+            # errors are logged and do not stop the consumer
+            self.assertTrue(await m1.error())
+            self.assertTrue(await m1.go(idx=5))
+            await drain(m)
+            self.assertTrue(m1.is_B())
+            self.assertEqual(5, processed[-1][1])
+            m.remove_model(m1)
+            self.assertNotIn(id(m1), m._model_queues)
+
+            processed.clear()
+            m = build('drop')
+            m1 = m.models[0]
+            res = await asyncio.gather(*[m1.go(idx=i) for i in range(5)])
+            self.assertEqual([True, True, False, False, False], res)
+            await drain(m)
+            self.assertEqual([0, 1], [idx for _, idx in processed])
+
+            processed.clear()
+            m = build('drop_oldest')
+            m1 = m.models[0]
+            self.assertTrue(all(await asyncio.gather(*[m1.go(idx=i) for i in range(5)])))
+            await drain(m)
+            self.assertEqual([3, 4], [idx for _, idx in processed])
+
+        asyncio.run(run())
+
+    def test_model_queue_cancellation(self):
+
+        async def run():
+            model = DummyModel()
+            m = self.machine_cls(model=model, states=['A', 'B', 'C'], initial='A', queued='model')
+            m.queue_capacity = 5
+            m.queued_results = True
+            m.add_transition('go', 'A', 'B', after=partial(asyncio.sleep, 0.05))
+            m.add_transition('go', 'B', 'C')
+            m.add_transition('go', 'C', 'A')
+            futures = [await model.go() for _ in range(3)]
+            await asyncio.sleep(0.01)  # the first event is processed now
+            # transitions of other triggers do not cancel the consumer
+            await m.cancel_running_transitions(model)
+            self.assertEqual([True, True, True], await asyncio.gather(*futures))
+            self.assertTrue(model.is_A())
+            self.assertEqual({}, m._model_queues)
+            # cancelling the consumer cancels all queued events instead of leaving them unprocessed
+            futures = [await model.go() for _ in range(3)]
+            await asyncio.sleep(0.01)
+            m._model_queues[id(model)][1].cancel()
+            results = await asyncio.gather(*futures, return_exceptions=True)
+            self.assertTrue(all(isinstance(res, asyncio.CancelledError) for res in results))
+            self.assertEqual({}, m._model_queues)
+            self.assertEqual({}, m._queued_results)
+            # a new consumer is started for subsequent events
+            self.assertTrue(await (await model.go()))
+            self.assertTrue(model.is_C())
+            # internally cancelled events are unsuccessful but the consumer continues
+            futures = [await model.go() for _ in range(2)]
+            await asyncio.sleep(0.01)
+            m._model_queues[id(model)][1].cancel(CANCELLED_MSG)
+            self.assertEqual([True, False], await asyncio.gather(*futures))
+            self.assertTrue(model.is_B())
+
+        asyncio.run(run())
+
+    def test_queued_results(self):
+
+        def raise_error():
+            raise ValueError("queued event failed")
+
+        transitions = [
+            {'trigger': 'go', 'source': 'A', 'dest': 'B', 'after': partial(asyncio.sleep, 0.05)},
+            {'trigger': 'go', 'source': 'B', 'dest': 'C'},
+            {'trigger': 'check', 'source': 'B', 'dest': 'A', 'conditions': lambda: False},
+            {'trigger': 'error', 'source': 'C', 'dest': 'A', 'before': raise_error}
+        ]  # type: Sequence[AsyncTransitionConfig]
+
+        async def run(queued, capacity):
+            m1 = DummyModel()
+            m2 = DummyModel()
+            m = self.machine_cls(model=[m1, m2], states=['A', 'B', 'C'], transitions=transitions,
+                                 initial='A', queued=queued)
+            m.queued_results = True
+            m.queue_capacity = capacity
+            futures = await asyncio.gather(m1.go(), m1.check(), m1.go(), m1.error(), m1.go())
+            self.assertTrue(all(isinstance(future, asyncio.Future) for future in futures))
+            results = await asyncio.gather(*futures[:3], return_exceptions=True)
+            self.assertEqual([True, False, True], results)
+            with self.assertRaises(ValueError):
+                await futures[3]
+            if capacity:
+                # events behind a failed event are still processed by the model's consumer
+                with self.assertRaises(MachineError):
+                    await futures[4]
+            else:
+                # events behind a failed event are removed from the queue
+                with self.assertRaises(asyncio.CancelledError):
+                    await futures[4]
+            self.assertEqual({}, m._queued_results)
+            self.assertTrue(await (await m1.to_A()))
+            first = asyncio.ensure_future(m1.go())
+            await asyncio.sleep(0.01)  # m1 is processing its first event now
+            queued_future = await m1.go()
+            m.remove_model(m1)
+            other_future = await m2.go()
+            self.assertTrue(await (await first))
+            self.assertTrue(await other_future)
+            with self.assertRaises(asyncio.CancelledError):
+                await queued_future
+            self.assertEqual({}, m._queued_results)
+
+        for queued, capacity in [(True, None), ('model', None), ('model', 10)]:
+            asyncio.run(run(queued, capacity))
+
+    def test_memory_report_async(self):
+        reports = []
+
+        async def collect(event_data):
+            # tasks are registered once their event suspends
+            await asyncio.sleep(0)
+            reports.append(event_data.machine.memory_report())
+
+        m1 = DummyModel()
+        m2 = DummyModel()
+        m = self.machine_cls(model=[m1, m2], states=['A', 'B'], initial='A', queued='model', send_event=True,
+                             after_state_change=collect)
+        asyncio.run(m1.to_B())
+        # one queue of the machine and one for each model; one running task
+        self.assertEqual(3, reports[0].categories['queues']['objects'])
+        self.assertEqual(1, reports[0].categories['tasks']['objects'])
+        self.assertNotIn('tasks', m.memory_report().categories)
+
     def test_queued_remove(self):
 
         def remove_model(event_data):
@@ -377,6 +801,45 @@ class TestAsync(TestTransitions):
 
         asyncio.run(run())
 
+    def test_timeout_scheduler(self):
+
+        @add_state_features(AsyncTimeout)
+        class TimeoutMachine(self.machine_cls):  # type: ignore
+            pass
+
+        models = [DummyModel() for _ in range(200)]
+        m = TimeoutMachine(models, states=['A', {'name': 'B', 'timeout': 0.05, 'on_timeout': 'to_C'},
+                                           {'name': 'C', 'timeout': 10, 'on_timeout': 'to_A'}], initial='A')
+        self.assertEqual(0, m.pending_timeouts)
+
+        async def run():
+            tasks_before = len(asyncio.all_tasks())
+            for model in models:
+                await model.to_B()
+            scheduler = m.get_timeout_scheduler()
+            self.assertIs(scheduler, m.get_timeout_scheduler())
+            self.assertEqual(200, m.pending_timeouts)
+            # timeouts do not create tasks before they are due
+            self.assertEqual(tasks_before, len(asyncio.all_tasks()))
+            for model in models[:150]:
+                await model.to_A()
+            self.assertEqual(50, m.pending_timeouts)
+            # cancelled timeouts are removed from the heap once they outnumber pending ones
+            self.assertLess(len(scheduler._heap), 200)
+            await asyncio.sleep(0.1)
+            self.assertTrue(all(model.is_A() for model in models[:150]))
+            self.assertTrue(all(model.is_C() for model in models[150:]))
+            # timeouts of C are pending now
+            self.assertEqual(50, m.pending_timeouts)
+            for model in models[150:]:
+                await model.to_A()
+            self.assertEqual(0, m.pending_timeouts)
+            return scheduler
+
+        scheduler = asyncio.run(run())
+        # a new event loop gets a new scheduler
+        self.assertIsNot(scheduler, asyncio.run(run()))
+
     def test_timeout_cancel(self):
         error_mock = MagicMock()
         timout_mock = MagicMock()
@@ -510,6 +973,114 @@ class TestAsync(TestTransitions):
         asyncio.run(run())
         self.assertEqual(0, len(m.async_tasks))
 
+    def test_task_registry(self):
+        model = DummyModel()
+        m1 = self.machine_cls(model=model, states=['A', 'B'], initial='A')
+        m2 = self.machine_cls(states=['A', 'B'], initial='A')
+        self.assertIsNot(m1.async_tasks, m2.async_tasks)
+        self.assertIsNot(m1.protected_tasks, m2.protected_tasks)
+        registered = []
+
+        async def check():
+            await asyncio.sleep(0)
+            registered.append((model in m1.async_tasks, len(m2.async_tasks)))
+
+        m1.on_enter_B(check)
+
+        async def run():
+            await model.to_B()
+
+        asyncio.run(run())
+        self.assertEqual([(True, 0)], registered)
+        self.assertEqual(0, len(m1.async_tasks))
+
+        async def register():
+            other = DummyModel()
+            task = asyncio.current_task()
+            assert task is not None
+            m1.async_tasks.add(other, task)
+            self.assertIn(other, m1.async_tasks)
+            self.assertNotIn(model, m1.async_tasks)
+            del other
+            gc.collect()
+            # tasks of collected models are dropped without being discarded explicitly
+            self.assertEqual(0, len(m1.async_tasks))
+
+        asyncio.run(register())
+
+    def test_task_registry_compatibility(self):
+        model = DummyModel()
+        m = self.machine_cls(model=model, states=['A', 'B', 'C'], initial='A')
+        legacy = []
+
+        async def protect():
+            task = asyncio.current_task()
+            assert task is not None
+            with self.assertWarns(DeprecationWarning):
+                m.protected_tasks.append(task)
+            self.assertIn(task, m.protected_tasks)
+            # protected tasks are not cancelled by the next transition
+            await asyncio.sleep(0.05)
+            m.protected_tasks.discard(task)
+
+        async def check():
+            await asyncio.sleep(0)
+            with self.assertWarns(DeprecationWarning):
+                legacy.append((id(model) in m.async_tasks, m.async_tasks.get(id(model), []),
+                               m.async_tasks[id(model)]))
+
+        m.add_transition('go', 'A', 'B', after=protect)
+        m.add_transition('check', 'B', 'C', after=check)
+
+        async def run():
+            go = asyncio.ensure_future(model.go())
+            await asyncio.sleep(0.01)
+            self.assertTrue(await model.check())
+            self.assertTrue(await go)
+
+        asyncio.run(run())
+        self.assertTrue(model.is_C())
+        self.assertEqual(1, len(legacy))
+        self.assertTrue(legacy[0][0])
+        self.assertEqual(2, len(legacy[0][1]))
+        self.assertEqual(set(legacy[0][1]), set(legacy[0][2]))
+        self.assertFalse(hasattr(self.machine_cls, 'protected_tasks'))
+
+        class IntModel(int):
+            pass
+
+        # models which subclass int are not mistaken for model ids
+        int_model = IntModel(id(model))
+        self.machine_cls(model=int_model, states=['A', 'B'], initial='A')
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            self.assertNotIn(int_model, m.async_tasks)
+            self.assertEqual((), m.async_tasks.get(int_model))
+
+    @skipIf(sys.version_info < (3, 12), "eager tasks require Python 3.12 or later")
+    def test_eager_tasks(self):
+        models = [DummyModel() for _ in range(3)]
+        m = self.machine_cls(model=models, states=['A', 'B'], initial='A')
+
+        async def run():
+            with patch('transitions.extensions.asyncio.asyncio.eager_task_factory',
+                       wraps=asyncio.eager_task_factory) as factory:
+                # tasks are created by the loop's task factory by default
+                self.assertTrue(await m.dispatch('to_B'))
+                self.assertFalse(factory.called)
+                m.eager_tasks = True
+                self.assertTrue(await m.dispatch('to_A'))
+                self.assertEqual(3, factory.call_count)
+                # custom task factories are not overridden
+                factory.reset_mock()
+                asyncio.get_running_loop().set_task_factory(
+                    lambda loop, coro, **kwargs: asyncio.Task(coro, loop=loop, **kwargs))
+                self.assertTrue(await m.dispatch('to_B'))
+                self.assertFalse(factory.called)
+
+        asyncio.run(run())
+        self.assertTrue(all(model.is_B() for model in models))
+
     def test_on_exception_callback(self):
         mock = MagicMock()
 
@@ -792,6 +1363,72 @@ class TestHierarchicalAsync(TestAsync):
         asyncio.run(machine.to_B())
         self.assertTrue(machine.is_B())
 
+    def test_concurrent_nested_triggers(self):
+        separator = self.machine_cls.state_cls.separator
+        states = [{'name': 'A', 'children': [{'name': str(i), 'children': ['x', 'y'], 'initial': 'x'}
+                                             for i in range(3)]}]
+
+        class Model(object):
+
+            async def pause(self):
+                await asyncio.sleep(0)
+
+        models = [Model() for _ in range(4)]
+        m = self.machine_cls(models, states=states, initial='A{0}0{0}x'.format(separator), auto_transitions=False)
+        for i in range(3):
+            with m('A'):
+                with m(str(i)):
+                    # tasks interleave while the event is processed in a nested scope
+                    m.add_transition('go', 'x', 'y', prepare='pause')
+                    m.add_transition('go', 'y', 'x', prepare='pause')
+                m.add_transition('next', str(i), str((i + 1) % 3))
+
+        async def run(model):
+            for _ in range(30):
+                await model.go()
+                await model.go()
+                await model.next()
+
+        async def run_all():
+            await asyncio.gather(*[run(model) for model in models])
+
+        asyncio.run(run_all())
+        for model in models:
+            self.assertEqual('A{0}0{0}x'.format(separator), model.state)
+
+    def test_concurrent_regions(self):
+        separator = self.machine_cls.state_cls.separator
+
+        class Model(object):
+
+            def __init__(self):
+                self.waiting = 0
+                self.event = asyncio.Event()
+
+            async def wait(self):
+                # every region has to check its condition before any of them may pass
+                self.waiting += 1
+                if self.waiting == 3:
+                    self.event.set()
+                await asyncio.wait_for(self.event.wait(), 5)
+                return True
+
+        regions = [{'name': str(i), 'children': ['a', 'b'], 'initial': 'a',
+                    'transitions': [['go', 'a', 'b', 'wait']]} for i in range(3)]
+        states = ['A', {'name': 'P', 'parallel': regions + [{'name': '3', 'children': ['x'], 'initial': 'x'}]}]
+        model = Model()
+        m = self.machine_cls(model, states=states, initial='P')
+        m.concurrent_regions = True
+
+        async def run():
+            self.assertTrue(await model.go())
+            self.assertEqual(['P{0}0{0}b'.format(separator), 'P{0}1{0}b'.format(separator),
+                              'P{0}2{0}b'.format(separator), 'P{0}3{0}x'.format(separator)], model.state)
+            self.assertFalse(await model.may_go())
+            self.assertTrue(await model.to_A())
+
+        asyncio.run(run())
+
     def test_final_state_nested(self):
         final_mock_B = MagicMock()
         final_mock_Y = MagicMock()
@@ -1418,3 +1418,19 @@ class TestTransitions(TestCase):
         assert trans[0].my_int == 23
         assert trans[0].my_dict == {"baz": "bar"}
         assert trans[0].my_none is None
+
+    def test_memory_report(self):
+        machine = self.machine_cls(states=['A', 'B', 'C'], initial='A', before_state_change='check',
+                                   transitions=[dict(trigger='go', source='A', dest='B', conditions='check')])
+        report = machine.memory_report()
+        self.assertEqual(3, report.categories['states']['objects'])
+        self.assertEqual(4, report.categories['events']['objects'])
+        self.assertEqual(10, report.categories['transitions']['objects'])
+        self.assertEqual(2, report.categories['callbacks']['objects'])
+        self.assertTrue(all(entry['bytes'] > 0 for category, entry in report.categories.items()
+                            if entry['objects']))
+        self.assertEqual(sum(entry['bytes'] for entry in report.categories.values()), report.total()['bytes'])
+        self.assertIn('model_bindings', report.format())
+        bindings = report.categories['model_bindings']['objects']
+        machine.add_model(DummyModel())
+        self.assertGreater(machine.memory_report().categories['model_bindings']['objects'], bindings)
@@ -265,6 +265,29 @@ class TestNestedStateEnums(TestEnumsAsStates):
         m.go()
         self.assertEqual(m.state, Bar.C)
 
+    def test_enum_path_index(self):
+        class Foo(enum.Enum):
+            A = 0
+            B = 1
+
+        class Bar(enum.Enum):
+            FOO = Foo
+            C = 2
+
+        m = self.machine_cls(states=Bar, initial=Bar.C)
+        self.assertEqual(['FOO', 'A'], m._state_paths[Foo.A])
+        self.assertEqual(['FOO', 'A'], m._get_enum_path(Foo.A))
+        with m(Bar.FOO):
+            self.assertEqual(['A'], m._get_enum_path(Foo.A))
+            with self.assertRaises(ValueError):
+                m._get_enum_path(Bar.C)
+        # enums referenced in multiple locations are resolved relative to the current scope
+        m.add_state({'name': 'D', 'children': [Foo.A]})
+        self.assertIsNone(m._state_paths[Foo.A])
+        self.assertEqual(['FOO', 'A'], m._get_enum_path(Foo.A))
+        with m('D'):
+            self.assertEqual(['A'], m._get_enum_path(Foo.A))
+
     def test_add_nested_enums_as_nested_state(self):
         class Foo(enum.Enum):
             A = 0
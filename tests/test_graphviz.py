@@ -114,6 +114,12 @@ class TestDiagrams(TestTransitions):
         m.add_model(model)
         model.walk()
 
+    def test_memory_report(self):
+        m = self.machine_cls(states=self.states, transitions=self.transitions, initial='A',
+                             graph_engine=self.graph_engine)
+        m.add_model(DummyModel())
+        self.assertEqual(2, m.memory_report().categories['graphs']['objects'])
+
     def test_add_custom_state(self):
         m = self.machine_cls(states=self.states, transitions=self.transitions, initial='A', auto_transitions=False,
                              title='a test', graph_engine=self.graph_engine)
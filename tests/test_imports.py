@@ -9,3 +9,41 @@ def test_imports() -> None:
         from transitions.extensions import AsyncGraphMachine, HierarchicalAsyncGraphMachine
     except (ImportError, SyntaxError):  # pragma: no cover
         pass
+
+
+def test_lazy_imports() -> None:
+    import subprocess
+    import sys
+    code = "\n".join([
+        "import sys",
+        "import transitions.extensions as ext",
+        "assert 'transitions.extensions.asyncio' not in sys.modules",
+        "assert 'transitions.extensions.diagrams' not in sys.modules",
+        "assert 'AsyncMachine' in dir(ext)",
+        "from transitions.extensions import LockedMachine",
+        "assert 'transitions.extensions.locking' in sys.modules",
+        "assert 'transitions.extensions.nesting' not in sys.modules",
+        "from transitions.extensions.locking import LockedMachine as Locked",
+        "assert Locked is LockedMachine",
+        "assert ext.nesting.HierarchicalMachine is ext.HierarchicalMachine",
+        "try:",
+        "    ext.UnknownMachine",
+        "except AttributeError:",
+        "    pass",
+        "else:",
+        "    raise AssertionError('UnknownMachine should not exist')",
+    ])
+    subprocess.check_call([sys.executable, "-c", code])
+
+
+def test_lazy_diagram_backends() -> None:
+    import subprocess
+    import sys
+    code = "\n".join([
+        "import sys",
+        "from transitions.extensions import GraphMachine",
+        "m = GraphMachine(states=['A', 'B'], initial='A', graph_engine='mermaid')",
+        "assert 'transitions.extensions.diagrams_graphviz' not in sys.modules",
+        "assert 'transitions.extensions.diagrams_pygraphviz' not in sys.modules",
+    ])
+    subprocess.check_call([sys.executable, "-c", code])
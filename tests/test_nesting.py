@@ -5,6 +5,7 @@ except ImportError:
     pass
 
 import sys
+from enum import Enum
 import tempfile
 from os.path import getsize
 from os import unlink
@@ -56,6 +57,226 @@ class TestNestedTransitions(TestTransitions):
         model = Dummy()
         self.stuff.machine.add_model(model, initial='E')
 
+    def test_memory_report_nested(self):
+        report = self.stuff.machine.memory_report()
+        self.assertEqual(12, report.categories['states']['objects'])
+        # transitions of substates are stored in their parent state
+        states = ['A', {'name': 'B', 'children': ['1', '2'], 'initial': '1',
+                        'transitions': [['go', '1', '2'], ['back', '2', '1']]}]
+        machine = self.machine_cls(states=states, initial='A', auto_transitions=False)
+        report = machine.memory_report()
+        self.assertEqual(4, report.categories['states']['objects'])
+        self.assertEqual(2, report.categories['events']['objects'])
+        self.assertEqual(2, report.categories['transitions']['objects'])
+        machine.add_transition('reset', 'B', 'A')
+        report = machine.memory_report()
+        self.assertEqual(3, report.categories['events']['objects'])
+        self.assertEqual(3, report.categories['transitions']['objects'])
+
+    def test_state_tree_cache(self):
+        separator = self.state_cls.separator
+        m = self.stuff.machine
+        m.state_tree_cache_size = 2
+        s = self.stuff
+        s.to_C()
+        self.assertIn(('A', ()), m._state_tree_cache)
+        s.to('C{0}1'.format(separator))
+        tree, order = m._get_state_tree(s.state)
+        self.assertEqual({'C': {'1': {}}}, tree)
+        self.assertEqual((('C', '1'), ('C',)), order)
+        self.assertIs(tree, m._get_state_tree(s.state)[0])
+        self.assertTrue(m.is_state('C', s, allow_substates=True))
+        self.assertIn((s.state, ()), m._state_tree_cache)
+        # scoped trees are cached separately
+        self.assertEqual({'1': {}}, m._get_state_tree(s.state, ['C'])[0])
+        self.assertEqual(2, len(m._state_tree_cache))
+        # least recently used entries are dropped
+        m._get_state_tree(['A', 'B'])
+        self.assertEqual(2, len(m._state_tree_cache))
+        self.assertNotIn((s.state, ()), m._state_tree_cache)
+        self.assertIn((('A', 'B'), ()), m._state_tree_cache)
+        m.add_state('X')
+        self.assertEqual(0, len(m._state_tree_cache))
+        m.state_tree_cache_size = 0
+        m._get_state_tree(s.state)
+        self.assertEqual(0, len(m._state_tree_cache))
+
+    def test_state_tree_cache_enum(self):
+        class Mixed(str, Enum):
+            ONE = 'A'
+
+        m = self.machine_cls(states=[Mixed.ONE, 'A'], initial='A')
+        self.assertEqual({'ONE': {}}, m._get_state_tree(Mixed.ONE)[0])
+        self.assertEqual({'A': {}}, m._get_state_tree('A')[0])
+        self.assertEqual(2, len(m._state_tree_cache))
+        m.add_transition('go', 'A', Mixed.ONE)
+        m.add_transition('go', Mixed.ONE, 'A')
+        m.go()
+        self.assertEqual(Mixed.ONE, m.state)
+        self.assertTrue(m.is_ONE())
+        m.go()
+        self.assertEqual('A', m.state)
+        self.assertIsNot(Mixed.ONE, m.state)
+
+    def test_transition_plan_cache(self):
+        separator = self.state_cls.separator
+        mock = MagicMock()
+        states = ['A', {'name': 'B', 'children': ['1', {'name': '2', 'children': ['x', 'y'], 'initial': 'x'}],
+                        'initial': '2', 'on_enter': mock, 'on_exit': mock}]
+        m = self.machine_cls(states=states, initial='A', auto_transitions=False)
+        m.add_transition('go', 'A', 'B')
+        m.add_transition('go', 'B', 'A')
+        m.add_transition('reset', 'B{0}2{0}y'.format(separator), 'B')
+        for _ in range(3):
+            m.go()
+            self.assertEqual('B{0}2{0}x'.format(separator), m.state)
+            m.go()
+            self.assertEqual('A', m.state)
+        self.assertEqual(6, mock.call_count)
+        self.assertEqual(2, len(m._transition_plan_cache))
+        tree, exit_steps, enter_steps = m._transition_plan_cache[('B', 'A', ())]
+        self.assertEqual({'B': {'2': {'x': {}}}}, tree)
+        self.assertEqual([(m.states['A'], [])], exit_steps)
+        self.assertEqual(['B', '2', 'x'], [state.name for state, _ in enter_steps])
+        # plans are cached per destination and model state
+        m.to_state(m, 'B{0}2{0}y'.format(separator))
+        m.reset()
+        self.assertEqual('B{0}2{0}x'.format(separator), m.state)
+        self.assertEqual(4, len(m._transition_plan_cache))
+        m.add_state('C')
+        self.assertEqual(0, len(m._transition_plan_cache))
+        m.transition_plan_cache_size = 0
+        m.go()
+        self.assertEqual('A', m.state)
+        self.assertEqual(0, len(m._transition_plan_cache))
+
+    def test_scopes(self):
+        from threading import Thread
+        m = self.stuff.machine
+        self.assertIs(m, m.scoped)
+        self.assertIs(m('C'), m('C'))
+        root_states = m.states
+        other_thread = []
+        with m('C'):
+            self.assertEqual(['C'], m.prefix_path)
+            self.assertIs(root_states['C'], m.scoped)
+            self.assertEqual(['1', '2', '3'], list(m.states))
+            with m('3'):
+                self.assertEqual(['C', '3'], m.prefix_path)
+                self.assertEqual(['a', 'b', 'c'], list(m.states))
+                with m():
+                    self.assertIs(root_states, m.states)
+                self.assertEqual(['a', 'b', 'c'], list(m.states))
+            # scopes are context-local; other threads operate on the root scope
+            thread = Thread(target=lambda: other_thread.append((m.scoped, list(m.states))))
+            thread.start()
+            thread.join()
+        self.assertEqual([(m, list(root_states))], other_thread)
+        self.assertIs(m, m.scoped)
+        self.assertEqual([], m.prefix_path)
+
+    def test_state_index(self):
+        separator = self.state_cls.separator
+        m = self.stuff.machine
+        state_c = m.states['C']
+        state_3 = state_c.states['3']
+        self.assertEqual((state_3.states['a'], (state_c, state_3)),
+                         m._state_index['C{0}3{0}a'.format(separator)])
+        self.assertIs(state_3.states['a'], m.get_state('C{0}3{0}a'.format(separator)))
+        self.assertEqual(['C', '3'], m._get_state_path(state_3))
+        with m('C'):
+            self.assertIs(state_3.states['a'], m.get_state('3{0}a'.format(separator)))
+            self.assertEqual(['3'], m._get_state_path(state_3))
+        # states added to a NestedState directly are not indexed but can be retrieved anyway
+        state_3.add_substate(self.state_cls('d'))
+        self.assertNotIn('C{0}3{0}d'.format(separator), m._state_index)
+        self.assertIs(state_3.states['d'], m.get_state('C{0}3{0}d'.format(separator)))
+        # replacing a state drops the entries of its former substates
+        m.add_state({'name': 'C', 'children': ['1']})
+        self.assertIn('C{0}1'.format(separator), m._state_index)
+        self.assertNotIn('C{0}3{0}a'.format(separator), m._state_index)
+        self.assertEqual([], m._get_state_path(state_3))
+        with self.assertRaises(ValueError):
+            m.get_state('C{0}3{0}a'.format(separator))
+
+    def test_has_state(self):
+        m = self.stuff.machine
+        state_3 = m.get_state('C{0}3'.format(self.state_cls.separator))
+        self.assertIs(state_3, m._registered_states[id(state_3)])
+        self.assertTrue(m._has_state(state_3))
+        # states added to a NestedState directly are not registered but found anyway
+        state_d = self.state_cls('d')
+        state_3.add_substate(state_d)
+        self.assertNotIn(id(state_d), m._registered_states)
+        self.assertTrue(m._has_state(state_d))
+        self.assertFalse(m._has_state(self.state_cls('d')))
+        with self.assertRaises(ValueError):
+            m._has_state(self.state_cls('d'), raise_error=True)
+        # replaced states are not registered any longer
+        m.add_state({'name': 'C', 'children': ['1']})
+        self.assertNotIn(id(state_3), m._registered_states)
+        self.assertFalse(m._has_state(state_3))
+
+    def test_deep_hierarchy_stack_depth(self):
+        from traceback import extract_stack
+        separator = self.state_cls.separator
+        depths = []  # type: List[int]
+
+        def stack_depth():
+            depths.append(len(extract_stack()))
+            return True
+
+        # events are processed iteratively; callbacks of deeply nested states do not require more stack frames
+        for levels in (1, 30):
+            # the transition is defined in the innermost state
+            state = {'name': str(levels - 1), 'children': ['a', 'b'], 'initial': 'a',
+                     'transitions': [{'trigger': 'step', 'source': 'a', 'dest': 'b', 'conditions': stack_depth}]}
+            for level in reversed(range(levels - 1)):
+                state = {'name': str(level), 'children': [state], 'initial': state['name']}
+            path = separator.join(str(level) for level in range(levels))
+            m = self.machine_cls(states=[state, 'B'], initial='B')
+            m.add_transition('go', 'B', path + separator + 'a')
+            m.add_transition('reset', path, 'B')
+            self.assertTrue(m.go())
+            self.assertEqual(path + separator + 'a', m.state)
+            self.assertTrue(m.may_step())
+            self.assertTrue(m.step())
+            self.assertTrue(m.reset())
+            self.assertTrue(m.is_B())
+            m.remove_transition('step')
+            self.assertFalse(m.get_transitions('step'))
+        self.assertEqual(depths[:2], depths[2:])
+
+    def test_concurrent_nested_triggers(self):
+        from threading import Thread
+        from time import sleep
+        separator = self.state_cls.separator
+        states = [{'name': 'A', 'children': [{'name': str(i), 'children': ['x', 'y'], 'initial': 'x'}
+                                             for i in range(5)]}]
+        models = [DummyModel() for _ in range(4)]
+        m = self.machine_cls(models, states=states, initial='A{0}0{0}x'.format(separator), auto_transitions=False)
+        for i in range(5):
+            with m('A'):
+                with m(str(i)):
+                    # force thread switches while the event is processed in a nested scope
+                    m.add_transition('go', 'x', 'y', prepare=partial(sleep, 0))
+                    m.add_transition('go', 'y', 'x', prepare=partial(sleep, 0))
+                m.add_transition('next', str(i), str((i + 1) % 5))
+
+        def run(model):
+            for _ in range(200):
+                model.go()
+                model.go()
+                model.next()
+
+        threads = [Thread(target=run, args=(model,)) for model in models]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for model in models:
+            self.assertEqual('A{0}0{0}x'.format(separator), model.state)
+
     def test_init_machine_with_hella_arguments(self):
         states = [
             self.state_cls('State1'),
@@ -550,7 +771,7 @@ class TestNestedTransitions(TestTransitions):
 
     def test_exception_in_state_enter_exit(self):
         # https://github.com/pytransitions/transitions/issues/486
-        # NestedState._scope needs to be reset when an error is raised in a state callback
+        # the scope of a NestedState needs to be reset when an error is raised in a state callback
         class Model:
             def on_enter_B_1(self):
                 raise RuntimeError("Oh no!")
@@ -669,6 +890,26 @@ class TestNestedTransitions(TestTransitions):
         self.assertEqual(2, len(m.get_nested_triggers(['C', '1'])))
         self.assertEqual(2, len(m.get_nested_triggers(['C'])))
 
+    def test_nested_cache(self):
+        separator = self.state_cls.separator
+        m = self.machine_cls(states=test_states, auto_transitions=False, initial='A')
+        names = m.get_nested_state_names()
+        self.assertIn('C{0}3{0}a'.format(separator), names)
+        # cached results are copied and can be altered
+        names.clear()
+        self.assertEqual(12, len(m.get_nested_state_names()))
+        with m('C'):
+            self.assertEqual([name.format(separator) for name in ('C{0}1', 'C{0}2', 'C{0}3', 'C{0}3{0}a', 'C{0}3{0}b',
+                                                                  'C{0}3{0}c')], m.get_nested_state_names())
+        self.assertFalse(m.get_nested_transitions('go'))
+        m.add_state('C{0}3{0}d'.format(separator))
+        self.assertIn('C{0}3{0}d'.format(separator), m.get_nested_state_names())
+        m.add_transition('go', 'C{0}3{0}a'.format(separator), 'C{0}3{0}d'.format(separator))
+        self.assertEqual(1, len(m.get_nested_transitions('go')))
+        self.assertEqual(['go'], m.get_nested_triggers(['C', '3', 'a']))
+        m.remove_transition('go')
+        self.assertFalse(m.get_nested_transitions('go'))
+
     def test_stop_transition_evaluation(self):
         states = ['A', {'name': 'B', 'states': ['C', 'D']}]
         transitions = [['next', 'A', 'B_C'], ['next', 'B_C', 'B_D'], ['next', 'B', 'A']]
@@ -891,6 +1132,29 @@ class TestSeparatorsBase(TestCase):
             self.assertTrue(event_name in s.machine.events)
             self.assertEqual(len(s.machine.events[event_name].transitions), num_base_states)
 
+    def test_lazy_function_wrapper(self):
+        if self.separator == '_':
+            self.skipTest('Function wrappers are only used with custom separators')
+        separator = self.state_cls.separator
+        models = [DummyModel(), DummyModel()]
+        m = self.machine_cls(models, states=test_states, initial='A')
+        # wrappers of nested states are created on first access and per model
+        self.assertNotIn('s3', vars(models[0].to_C))
+        self.assertTrue(models[0].to_C.s3.a())
+        self.assertEqual('C{0}3{0}a'.format(separator), models[0].state)
+        self.assertIn('s3', vars(models[0].to_C))
+        self.assertNotIn('s3', vars(models[1].to_C))
+        self.assertTrue(models[0].is_C.s3.a())
+        self.assertFalse(models[1].is_C.s3.a())
+        self.assertTrue(models[1].is_A())
+        with self.assertRaises(AttributeError):
+            models[0].to_C.s4()
+        with self.assertRaises(AttributeError):
+            models[0].is_C.s3.d()
+        m.add_state('C{0}3{0}d'.format(separator))
+        self.assertTrue(models[0].to_C.s3.d())
+        self.assertTrue(models[0].is_C.s3.d())
+
     @skipIf(pgv is None, 'NestedGraph diagram test requires graphviz')
     def test_ordered_with_graph(self):
         class CustomHierarchicalGraphMachine(HierarchicalGraphMachine):
@@ -263,6 +263,34 @@ class TestParallel(TestNested):
         assert m.is_P_2(allow_substates=True)
         assert not m.is_A(allow_substates=True)
 
+    def test_region_executor(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from threading import Barrier
+        separator = State.separator
+        # conditions of all regions must be evaluated at the same time to pass the barrier
+        barrier = Barrier(3, timeout=5)
+
+        def wait():
+            barrier.wait()
+            return True
+
+        def fail():
+            raise ValueError("region failed")
+
+        regions = [{'name': str(i), 'children': ['a', 'b', 'c'], 'initial': 'a',
+                    'transitions': [['go', 'a', 'b', wait], ['go', 'b', 'c', fail]]} for i in range(3)]
+        states = ['A', {'name': 'P', 'parallel': regions + [{'name': '3', 'children': ['x'], 'initial': 'x'}]}]
+        m = self.machine_cls(states=states, initial='P')
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            m.region_executor = executor
+            self.assertTrue(m.go())
+            self.assertEqual(['P{0}0{0}b'.format(separator), 'P{0}1{0}b'.format(separator),
+                              'P{0}2{0}b'.format(separator), 'P{0}3{0}x'.format(separator)], m.state)
+            with self.assertRaises(ValueError):
+                m.go()
+            self.assertTrue(m.to_A())
+            self.assertTrue(m.is_A())
+
 
 @skipIf(pgv is None, "pygraphviz is not available")
 class TestParallelWithPyGraphviz(TestParallel):
@@ -0,0 +1,179 @@
+from unittest import TestCase, skipIf
+import pickle
+
+from transitions.extensions.nesting import HierarchicalMachine
+from transitions.extensions.profiling import CallbackProfiler, ProfiledMachine
+
+try:
+    import asyncio
+    from transitions.extensions.profiling import AsyncProfiledMachine
+except (ImportError, SyntaxError):  # pragma: no cover
+    asyncio = None  # type: ignore
+
+
+class FakeTimer:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class TestProfiling(TestCase):
+
+    def setUp(self):
+        self.timer = FakeTimer()
+        self.profiler = CallbackProfiler(timer=self.timer)
+
+    def test_identify(self):
+        def local_func():
+            pass
+
+        self.assertEqual("on_enter_A", CallbackProfiler.identify("on_enter_A"))
+        self.assertEqual(__name__ + ".TestProfiling.test_identify.<locals>.local_func",
+                         CallbackProfiler.identify(local_func))
+        self.assertEqual(__name__ + ".FakeTimer.advance", CallbackProfiler.identify(self.timer.advance))
+
+    def test_callback_stats(self):
+        timer = self.timer
+
+        class Model:
+            def slow(self):
+                timer.advance(2)
+
+            def fast(self):
+                timer.advance(0.5)
+
+            def failing(self):
+                timer.advance(1)
+                raise ValueError("Oh no")
+
+        model = Model()
+        machine = ProfiledMachine(model, states=['A', 'B'], initial='A', profiler=self.profiler,
+                                  transitions=[dict(trigger='go', source='A', dest='B', before='slow', after='fast'),
+                                               dict(trigger='fail', source='B', dest='A', before='failing')])
+        self.assertIs(self.profiler, machine.profiler)
+        model.go()
+        model.to_A()
+        model.go()
+        with self.assertRaises(ValueError):
+            model.fail()
+        stats = self.profiler.stats
+        self.assertEqual(2, stats['slow'].calls)
+        self.assertEqual(4, stats['slow'].cumulative_time)
+        self.assertEqual(2, stats['slow'].mean_time)
+        self.assertEqual(1, stats['fast'].cumulative_time)
+        self.assertEqual(1, stats['failing'].calls)
+        self.assertEqual(1, stats['failing'].exceptions)
+        self.assertEqual(['slow', 'fast', 'failing'], [s.name for s in self.profiler.report()])
+        self.assertEqual(['slow'], [s.name for s in self.profiler.report(limit=1)])
+        self.assertEqual('failing', self.profiler.report(sort_by='exceptions')[0].name)
+        report = self.profiler.format_report()
+        self.assertEqual(4, len(report.splitlines()))
+        self.assertIn('failing', report)
+        self.profiler.reset()
+        self.assertFalse(self.profiler.stats)
+
+    def test_self_time(self):
+        timer = self.timer
+
+        class Model:
+            def outer(self):
+                timer.advance(1)
+                self.inner_go()
+                timer.advance(1)
+
+            def inner(self):
+                timer.advance(3)
+
+        model = Model()
+        outer = ProfiledMachine(model, states=['A', 'B'], initial='A', profiler=self.profiler,
+                                transitions=[['go', 'A', 'B']], after_state_change='outer')
+        _ = ProfiledMachine(model, states=['A', 'B'], initial='A', profiler=self.profiler,
+                            transitions=[['inner_go', 'A', 'B']], model_attribute='inner_state',
+                            after_state_change='inner')
+        model.go()
+        self.assertTrue(outer.is_state('B', model))
+        self.assertEqual(5, self.profiler.stats['outer'].cumulative_time)
+        self.assertEqual(2, self.profiler.stats['outer'].self_time)
+        self.assertEqual(3, self.profiler.stats['inner'].self_time)
+
+    def test_nested(self):
+        class NestedProfiledMachine(ProfiledMachine, HierarchicalMachine):
+            pass
+
+        states = ['A', {'name': 'B', 'children': ['1', '2'], 'initial': '1'}]
+        machine = NestedProfiledMachine(states=states, initial='A', profiler=self.profiler,
+                                        before_state_change='advance')
+        machine.advance = lambda: None
+        machine.to_B()
+        machine.to_B_2()
+        self.assertEqual(2, self.profiler.stats['advance'].calls)
+
+    def test_pickle(self):
+        self.profiler.add('callback', 1, 1)
+        dump = pickle.dumps(self.profiler)
+        profiler2 = pickle.loads(dump)
+        self.assertEqual(1, profiler2.stats['callback'].calls)
+        with profiler2.measure('callback'):
+            pass
+        self.assertEqual(2, profiler2.stats['callback'].calls)
+
+    def test_disabled(self):
+        calls = []
+        machine = ProfiledMachine(states=['A', 'B'], initial='A', after_state_change=lambda: calls.append(True))
+        self.assertIsInstance(machine.profiler, CallbackProfiler)
+        machine.profiler = None
+        machine.to_B()
+        self.assertEqual([True], calls)
+        machine = ProfiledMachine(states=['A', 'B'], initial='A', after_state_change=lambda: calls.append(True),
+                                  profiler=None)
+        self.assertIsNone(machine.profiler)
+        machine.to_B()
+        self.assertEqual([True, True], calls)
+
+
+@skipIf(asyncio is None, "AsyncMachine requires asyncio and contextvars suppport")
+class TestAsyncProfiling(TestCase):
+
+    def test_async_callbacks(self):
+        profiler = CallbackProfiler()
+
+        async def sleeper():
+            await asyncio.sleep(0.05)
+
+        def sync_func():
+            pass
+
+        machine = AsyncProfiledMachine(states=['A', 'B'], initial='A', profiler=profiler,
+                                       transitions=[dict(trigger='go', source='A', dest='B',
+                                                         after=[sleeper, sleeper, sync_func])])
+        asyncio.run(machine.go())
+        self.assertTrue(machine.is_B())
+        stats = profiler.stats[CallbackProfiler.identify(sleeper)]
+        self.assertEqual(2, stats.calls)
+        self.assertGreaterEqual(stats.cumulative_time, 0.1)
+        self.assertEqual(1, profiler.stats[CallbackProfiler.identify(sync_func)].calls)
+
+    def test_async_self_time(self):
+        profiler = CallbackProfiler()
+
+        async def outer():
+            await asyncio.sleep(0.01)
+            await inner_machine.go()
+
+        async def inner():
+            await asyncio.sleep(0.1)
+
+        machine = AsyncProfiledMachine(states=['A', 'B'], initial='A', profiler=profiler, after_state_change=outer)
+        inner_machine = AsyncProfiledMachine(states=['A', 'B'], initial='A', profiler=profiler,
+                                             transitions=[['go', 'A', 'B']], after_state_change=inner)
+        asyncio.run(machine.to_B())
+        outer_stats = profiler.stats[CallbackProfiler.identify(outer)]
+        inner_stats = profiler.stats[CallbackProfiler.identify(inner)]
+        self.assertGreaterEqual(outer_stats.cumulative_time, inner_stats.cumulative_time)
+        self.assertLess(outer_stats.self_time, inner_stats.self_time)
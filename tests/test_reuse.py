@@ -538,3 +538,35 @@ class TestReuse(TestCase):
         # selfs should only contain references to the same model. If the set is larger than one this means
         # that at some poin the model was falsely copied.
         self.assertEqual(1, len(set(selfs)))
+
+    def test_reuse_remap_copies_transitions(self):
+        child = self.machine_cls(None, states=['A', 'B', 'done'], initial='A', auto_transitions=False,
+                                 transitions=[['go', 'A', 'B'], ['go', 'B', 'done'], ['reset', '*', 'A']])
+        states = ['X'] + [{'name': name, 'children': child, 'remap': {'done': 'X'}}
+                          for name in ('P', 'Q')]  # type: List[Union[str, Dict[str, Any]]]
+        parent = self.machine_cls(states=states, initial='P', auto_transitions=False)
+        with parent('P'):
+            events_p = parent.events
+        with parent('Q'):
+            events_q = parent.events
+        # every embedding has its own events and transitions but conditions and callbacks are not deep copied
+        self.assertIsNot(child.events['go'].transitions['A'][0], events_p['go'].transitions['A'][0])
+        self.assertIsNot(events_p['go'].transitions['A'][0], events_q['go'].transitions['A'][0])
+        self.assertIsNot(events_p['go'].transitions['A'], events_q['go'].transitions['A'])
+        # callbacks added to one embedding do not affect the other embedding or the child machine
+        mock = MagicMock()
+        events_p['go'].transitions['A'][0].add_callback('after', mock)
+        self.assertEqual([mock], events_p['go'].transitions['A'][0].after)
+        self.assertEqual([], events_q['go'].transitions['A'][0].after)
+        self.assertEqual([], child.events['go'].transitions['A'][0].after)
+        self.assertNotIn('B', events_p['go'].transitions)
+        self.assertEqual(1, len(child.events['go'].transitions['B']))
+        self.assertEqual(3, len(child.events['reset'].transitions))
+        parent.remove_transition('reset', 'P_B')
+        self.assertFalse(events_p['reset'].transitions['B'])
+        self.assertTrue(events_q['reset'].transitions['B'])
+        self.assertTrue(child.events['reset'].transitions['B'])
+        self.assertTrue(parent.go())
+        self.assertTrue(parent.go())
+        self.assertEqual('X', parent.state)
+        self.assertEqual(1, mock.call_count)
@@ -1,7 +1,7 @@
 from transitions import Machine, MachineError
 from transitions.extensions.states import *
 from transitions.extensions import MachineFactory
-from time import sleep
+from time import monotonic, sleep
 
 from unittest import TestCase, skipIf
 from .test_core import TYPE_CHECKING
@@ -128,6 +128,12 @@ class TestTransitions(TestCase):
 
         with self.assertRaises(AttributeError):
             m.add_state({'name': 'D', 'timeout': 0.3})
+        # timers are removed from their states when they have been processed or cancelled
+        self.assertNotIn('timers', m.memory_report().categories)
+        m.to_B()
+        self.assertEqual(1, m.memory_report().categories['timers']['objects'])
+        m.to_A()
+        self.assertNotIn('timers', m.memory_report().categories)
 
     def test_timeout_callbacks(self):
         timeout = MagicMock()
@@ -196,6 +202,97 @@ class TestTransitions(TestCase):
         self.assertTrue(machine.is_A())
         self.assertTrue(timeout_mock.called)
 
+    def test_timeout_scheduler(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from threading import active_count, current_thread
+        from transitions.extensions.states import _SCHEDULER
+
+        threads = set()
+
+        class Model(object):
+
+            def record_thread(self):
+                threads.add(current_thread().name)
+
+        if TYPE_CHECKING:
+            @add_state_features(Timeout)
+            class CustomMachine(Machine):
+                pass
+        else:
+            @add_state_features(Timeout)
+            class CustomMachine(self.machine_cls):
+                pass
+
+        # wait for timeouts of previous tests
+        for _ in range(50):
+            if _SCHEDULER.pending == 0:
+                break
+            sleep(0.1)
+        models = [Model() for _ in range(100)]
+        states = ['A', {'name': 'B', 'timeout': 0.1, 'on_timeout': ['record_thread', 'to_A']}, 'C']
+        machine = CustomMachine(model=models, states=states, initial='A')
+        thread_count = active_count()
+        for model in models:
+            model.to_B()
+        # all timeouts share one scheduler thread
+        self.assertLessEqual(active_count(), thread_count + 1)
+        self.assertEqual(100, _SCHEDULER.pending)
+        for model in models[:50]:
+            model.to_C()
+        self.assertEqual(50, _SCHEDULER.pending)
+        self.assertEqual(50, len(machine.get_state('B').runner))
+        sleep(0.3)
+        self.assertTrue(all(model.is_A() for model in models[50:]))
+        self.assertEqual(0, _SCHEDULER.pending)
+        self.assertEqual(0, len(machine.get_state('B').runner))
+        # callbacks are processed by the default thread pool
+        self.assertTrue(all(name.startswith('transitions-timeouts_') for name in threads))
+        self.assertLessEqual(len(threads), _SCHEDULER.max_workers)
+
+        threads.clear()
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix='timeout-worker') as executor:
+            machine.get_state('B').timeout_executor = executor
+            for model in models[:10]:
+                model.to_B()
+            sleep(0.3)
+        self.assertTrue(all(model.is_A() for model in models[:10]))
+        self.assertTrue(all(name.startswith('timeout-worker') for name in threads))
+
+    def test_timeout_blocking_callback(self):
+        called = {}
+
+        class Model(object):
+
+            def __init__(self, name, delay):
+                self.name = name
+                self.delay = delay
+
+            def block(self):
+                called[self.name] = monotonic()
+                sleep(self.delay)
+
+        if TYPE_CHECKING:
+            @add_state_features(Timeout)
+            class CustomMachine(Machine):
+                pass
+        else:
+            @add_state_features(Timeout)
+            class CustomMachine(self.machine_cls):
+                pass
+
+        states = ['A', {'name': 'B', 'timeout': 0.05, 'on_timeout': 'block'}]
+        slow = Model('slow', 0.5)
+        fast = Model('fast', 0)
+        CustomMachine(model=[slow, fast], states=states, initial='A')
+        start = monotonic()
+        slow.to_B()
+        sleep(0.02)
+        fast.to_B()
+        sleep(0.2)
+        # a blocking timeout callback does not delay the timeouts of other models
+        self.assertIn('fast', called)
+        self.assertLess(called['fast'] - start, 0.3)
+
     def test_volatile(self):
 
         class TemporalState(object):
@@ -3,11 +3,13 @@ try:
 except ImportError:
     pass
 
+import sys
 import time
 from threading import Thread
 import logging
+from unittest import TestCase
 
-from transitions.extensions import LockedHierarchicalMachine, LockedMachine
+from transitions.extensions import HierarchicalMachine, LockedHierarchicalMachine, LockedMachine
 from .test_nesting import TestNestedTransitions
 from .test_core import TestTransitions, TYPE_CHECKING
 from .utils import Stuff, DummyModel, SomeContext
@@ -299,3 +301,61 @@ class TestLockedHierarchicalTransitions(TestNestedTransitions, TestLockedTransit
         blocked = time.time()
         self.assertAlmostEqual(fast - begin, 0, delta=0.1)
         self.assertAlmostEqual(blocked - begin, 1, delta=0.1)
+
+
+class TestHierarchicalThreads(TestCase):
+
+    def test_different_models(self):
+        # threads which trigger events of different models do not need a LockedHierarchicalMachine
+        names = []  # type: List[str]
+        errors = []  # type: List[Exception]
+
+        def record(event_data):
+            names.append(event_data.state.name)
+
+        class Model(object):
+            pass
+
+        states = ['A', {'name': 'C', 'children': [{'name': '1', 'on_enter': record}, '2'], 'initial': '1'}]
+        models = [Model() for _ in range(8)]
+        machine = HierarchicalMachine(models, states=states, initial='A', send_event=True)
+        # evict cache entries all the time
+        machine.state_tree_cache_size = 1
+        machine.transition_plan_cache_size = 1
+
+        def run(model):
+            try:
+                for _ in range(500):
+                    model.to_C()
+                    model.to_C_2()
+                    model.to_A()
+            except Exception as err:  # pragma: no cover
+                errors.append(err)
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [Thread(target=run, args=(model,)) for model in models]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+        self.assertEqual([], errors)
+        self.assertEqual(4000, len(names))
+        self.assertEqual({'C_1'}, set(names))
+        self.assertTrue(all(model.is_A() for model in models))
+
+    def test_cache_lock(self):
+        import pickle
+        machines = [HierarchicalMachine(states=['A', 'B'], initial='A') for _ in range(2)]
+        # machines do not contend for a global lock
+        self.assertIsNot(machines[0]._cache_lock, machines[1]._cache_lock)
+        with machines[0]._cache_lock:
+            machines[1].to_B()
+        self.assertTrue(machines[1].is_B())
+        dump = pickle.dumps(machines[0])
+        restored = pickle.loads(dump)
+        restored.to_B()
+        self.assertTrue(restored.is_B())
@@ -0,0 +1,248 @@
+from unittest import TestCase, skipIf
+import json
+import os
+import pickle
+import random
+import tempfile
+
+from transitions.extensions.tracing import Tracer, TracedMachine, TracedHierarchicalMachine, InMemorySpanExporter, \
+    FileSpanExporter, encode_spans, STATUS_ERROR
+
+try:
+    import asyncio
+    from transitions.extensions.tracing import TracedAsyncMachine, TracedHierarchicalAsyncMachine
+except (ImportError, SyntaxError):  # pragma: no cover
+    asyncio = None  # type: ignore
+
+
+def _children(spans, parent):
+    return [span.name for span in spans if span.parent_span_id == parent.span_id]
+
+
+class TestTracing(TestCase):
+
+    def setUp(self):
+        self.exporter = InMemorySpanExporter()
+        self.tracer = Tracer(exporter=self.exporter, rng=random.Random(42))
+
+    def test_span_tree(self):
+
+        class Model:
+            def check(self):
+                return True
+
+            def on_enter_B(self):
+                pass
+
+        model = Model()
+        machine = TracedMachine(model, states=['A', 'B'], initial='A', tracer=self.tracer,
+                                transitions=[dict(trigger='go', source='A', dest='B', conditions='check',
+                                                  after=lambda: None)])
+        self.assertIs(self.tracer, machine.tracer)
+        self.assertTrue(model.go())
+        spans = self.exporter.spans
+        root = spans[0]
+        self.assertEqual('trigger go', root.name)
+        self.assertIsNone(root.parent_span_id)
+        self.assertEqual('A', root.attributes['transitions.source'])
+        self.assertTrue(root.attributes['transitions.result'])
+        self.assertEqual(['conditions', 'change_state', 'after'], _children(spans, root))
+        change_state = spans[2]
+        self.assertEqual(['on_enter'], _children(spans, change_state))
+        self.assertEqual(['on_enter_B'], spans[3].attributes['transitions.callbacks'])
+        self.assertEqual(1, len({span.trace_id for span in spans}))
+        self.assertTrue(all((span.end_time or 0) >= span.start_time for span in spans))
+
+    def test_machine_callbacks(self):
+        machine = TracedMachine(states=['A', 'B'], initial='A', tracer=self.tracer,
+                                prepare_event=lambda: None, before_state_change=[lambda: None],
+                                finalize_event=lambda: None)
+        machine.to_B()
+        self.assertEqual(['prepare_event', 'before_state_change', 'change_state', 'finalize_event'],
+                         _children(self.exporter.spans, self.exporter.spans[0]))
+
+    def test_nested_trigger(self):
+        outer_spans = []
+
+        def trigger_inner():
+            outer_spans.extend(self.exporter.spans)
+            machine.inner()
+
+        machine = TracedMachine(states=['A', 'B', 'C'], initial='A', tracer=self.tracer,
+                                transitions=[['inner', 'B', 'C']])
+        machine.add_transition('go', 'A', 'B', after=trigger_inner)
+        machine.go()
+        self.assertTrue(machine.is_C())
+        # spans are exported when the root span has been finished
+        self.assertFalse(outer_spans)
+        spans = self.exporter.spans
+        self.assertEqual(1, len({span.trace_id for span in spans}))
+        inner = [span for span in spans if span.name == 'trigger inner'][0]
+        self.assertEqual('after', [span for span in spans if span.span_id == inner.parent_span_id][0].name)
+
+    def test_error_status(self):
+        def raise_error():
+            raise ValueError("Oh no")
+
+        machine = TracedMachine(states=['A', 'B'], initial='A', tracer=self.tracer, before_state_change=raise_error)
+        with self.assertRaises(ValueError):
+            machine.to_B()
+        root, before = self.exporter.spans
+        self.assertEqual(STATUS_ERROR, root.status_code)
+        self.assertEqual(STATUS_ERROR, before.status_code)
+        self.assertEqual('ValueError', before.attributes['exception.type'])
+        self.assertEqual('Oh no', before.status_message)
+
+    def test_sampling(self):
+        with self.assertRaises(ValueError):
+            Tracer(sample_rate=1.5)
+        tracer = Tracer(sample_rate=0, exporter=self.exporter)
+        machine = TracedMachine(states=['A', 'B'], initial='A', tracer=tracer, after_state_change=lambda: None)
+        machine.to_B()
+        self.assertTrue(machine.is_B())
+        self.assertFalse(self.exporter.spans)
+        machine.tracer = Tracer(sample_rate=0.5, exporter=self.exporter, rng=random.Random(1))
+        for _ in range(100):
+            machine.to_A()
+        roots = [span for span in self.exporter.spans if span.parent_span_id is None]
+        self.assertTrue(0 < len(roots) < 100)
+        # sampled traces are always complete
+        self.assertEqual(3 * len(roots), len(self.exporter.spans))
+
+    def test_disabled(self):
+        machine = TracedMachine(states=['A', 'B'], initial='A')
+        self.assertIsInstance(machine.tracer, Tracer)
+        machine.tracer = None
+        machine.to_B()
+        self.assertTrue(machine.is_B())
+        machine = TracedMachine(states=['A', 'B'], initial='A', tracer=None)
+        self.assertIsNone(machine.tracer)
+        machine.to_B()
+        self.assertTrue(machine.is_B())
+
+    def test_traceparent(self):
+        machine = TracedMachine(states=['A', 'B'], initial='A', tracer=self.tracer)
+        trace_id = '4bf92f3577b34da6a3ce929d0e0e4736'
+        with self.tracer.attach_traceparent('00-%s-00f067aa0ba902b7-01' % trace_id):
+            machine.to_B()
+        root = self.exporter.spans[0]
+        self.assertEqual(trace_id, root.trace_id)
+        self.assertEqual('00f067aa0ba902b7', root.parent_span_id)
+        self.exporter.clear()
+        with self.tracer.attach_traceparent('00-%s-00f067aa0ba902b7-00' % trace_id):
+            machine.to_A()
+        self.assertFalse(self.exporter.spans)
+        with self.assertRaises(ValueError):
+            self.tracer.attach_traceparent('invalid')
+
+    def test_hierarchical(self):
+        states = ['A', {'name': 'B', 'children': ['1', '2'], 'initial': '1',
+                        'transitions': [['go', '1', '2']]}]
+        machine = TracedHierarchicalMachine(states=states, initial='A', tracer=self.tracer,
+                                            transitions=[['go', 'A', 'B']])
+        machine.go()
+        machine.go()
+        self.assertTrue(machine.is_B_2())
+        roots = [span for span in self.exporter.spans if span.parent_span_id is None]
+        self.assertEqual(['trigger go', 'trigger go'], [span.name for span in roots])
+        self.assertEqual('B_1', roots[1].attributes['transitions.source'])
+        nested = [span for span in self.exporter.spans if span.name == 'trigger_nested']
+        self.assertIn('B', [span.attributes['transitions.scope'] for span in nested])
+
+    def test_file_exporter(self):
+        fd, path = tempfile.mkstemp(suffix='.jsonl')
+        os.close(fd)
+        try:
+            exporter = FileSpanExporter(path, resource_attributes={'service.name': 'test'})
+            tracer = Tracer(exporter=exporter)
+            machine = TracedMachine(states=['A', 'B'], initial='A', tracer=tracer)
+            machine.to_B()
+            machine.to_A()
+            exporter.shutdown()
+            with open(path) as f:
+                lines = [json.loads(line) for line in f]
+            self.assertEqual(2, len(lines))
+            resource_spans = lines[0]['resourceSpans'][0]
+            self.assertEqual({'key': 'service.name', 'value': {'stringValue': 'test'}},
+                             resource_spans['resource']['attributes'][0])
+            spans = resource_spans['scopeSpans'][0]['spans']
+            self.assertEqual('trigger to_B', spans[0]['name'])
+            self.assertEqual(32, len(spans[0]['traceId']))
+            self.assertEqual(spans[0]['spanId'], spans[1]['parentSpanId'])
+            self.assertIsInstance(spans[0]['startTimeUnixNano'], str)
+        finally:
+            os.remove(path)
+
+    def test_encode_spans(self):
+        span = self.tracer.start_span('test', {'flag': True, 'count': 3, 'ratio': 0.5, 'names': ['a', 'b']})
+        assert span is not None
+        self.tracer.end_span(span)
+        attributes = encode_spans(self.exporter.spans)['resourceSpans'][0]['scopeSpans'][0]['spans'][0]['attributes']
+        self.assertEqual([{'key': 'flag', 'value': {'boolValue': True}},
+                          {'key': 'count', 'value': {'intValue': '3'}},
+                          {'key': 'ratio', 'value': {'doubleValue': 0.5}},
+                          {'key': 'names', 'value': {'arrayValue': {'values': [{'stringValue': 'a'},
+                                                                               {'stringValue': 'b'}]}}}],
+                         attributes)
+
+    def test_pickle(self):
+        machine = TracedMachine(states=['A', 'B'], initial='A', tracer=self.tracer)
+        dump = pickle.dumps(machine)
+        machine2 = pickle.loads(dump)
+        machine2.to_B()
+        self.assertTrue(machine2.is_B())
+        self.assertEqual('trigger to_B', machine2.tracer.exporter.spans[0].name)
+
+
+@skipIf(asyncio is None, "AsyncMachine requires asyncio and contextvars suppport")
+class TestAsyncTracing(TestCase):
+
+    def setUp(self):
+        self.exporter = InMemorySpanExporter()
+        self.tracer = Tracer(exporter=self.exporter)
+
+    def test_async_span_tree(self):
+        async def check():
+            await asyncio.sleep(0.01)
+            return True
+
+        async def after():
+            await asyncio.sleep(0.01)
+
+        machine = TracedAsyncMachine(states=['A', 'B'], initial='A', tracer=self.tracer,
+                                     transitions=[dict(trigger='go', source='A', dest='B', conditions=check,
+                                                       after=[after, after])])
+        self.assertTrue(asyncio.run(machine.go()))
+        root = self.exporter.spans[0]
+        self.assertEqual('trigger go', root.name)
+        self.assertEqual(['conditions', 'change_state', 'after'], _children(self.exporter.spans, root))
+        after_span = self.exporter.spans[-1]
+        self.assertGreaterEqual((after_span.end_time or 0) - after_span.start_time, 10 ** 7)
+
+    def test_concurrent_triggers(self):
+        async def wait():
+            await asyncio.sleep(0.01)
+
+        machines = [TracedAsyncMachine(states=['A', 'B'], initial='A', tracer=self.tracer, after_state_change=wait)
+                    for _ in range(3)]
+
+        async def run():
+            await asyncio.gather(*[m.to_B() for m in machines])
+
+        asyncio.run(run())
+        roots = [span for span in self.exporter.spans if span.parent_span_id is None]
+        self.assertEqual(3, len(roots))
+        self.assertEqual(3, len({span.trace_id for span in roots}))
+        for root in roots:
+            self.assertEqual(['change_state', 'after_state_change'], _children(self.exporter.spans, root))
+
+    def test_async_hierarchical(self):
+        states = ['A', {'name': 'B', 'children': ['1', '2'], 'initial': '1'}]
+        machine = TracedHierarchicalAsyncMachine(states=states, initial='A', tracer=self.tracer,
+                                                 transitions=[['go', 'A', 'B'], ['go', 'B_1', 'B_2']])
+        asyncio.run(machine.go())
+        asyncio.run(machine.go())
+        self.assertTrue(machine.is_B_2())
+        roots = [span for span in self.exporter.spans if span.parent_span_id is None]
+        self.assertEqual(2, len(roots))
+        self.assertTrue(all(span.end_time is not None for span in self.exporter.spans))
@@ -24,13 +24,14 @@ except ImportError:  # pragma: no cover
     class EnumMeta:  # type:ignore
         """This is just an EnumMeta stub for Python 2 and Python 3.3 and before without Enum support."""
 
-import inspect
 import itertools
 import logging
+import sys
 import warnings
 
 from collections import OrderedDict, defaultdict, deque
 from functools import partial
+from types import MethodType
 from six import string_types
 
 _LOGGER = logging.getLogger(__name__)
@@ -883,7 +884,7 @@ class Machine(object):
         # except if they are already mentioned in 'on_enter/exit' of the defined state
         for callback in self.state_cls.dynamic_methods:
             method = "{0}_{1}".format(callback, state.name)
-            if hasattr(model, method) and inspect.ismethod(getattr(model, method)) and \
+            if hasattr(model, method) and isinstance(getattr(model, method), MethodType) and \
                     method not in getattr(state, callback):
                 state.add_callback(callback[3:], method)
 
@@ -1259,6 +1260,69 @@ class Machine(object):
                 raise
         return True
 
+    def memory_report(self):
+        """Estimates how much memory the machine's structures occupy. This includes states, events, transitions,
+            callbacks, methods and partials bound to models and queued events. Extensions add their own
+            categories such as 'timers' or 'graphs'. Models and the callables referenced as callbacks are
+            counted but not measured beyond the referencing object itself.
+        Returns:
+            MemoryReport: Object counts and approximate sizes per category.
+        """
+        report = MemoryReport(['states', 'events', 'transitions', 'callbacks', 'model_bindings', 'queues'])
+        self._collect_memory_usage(report)
+        return report
+
+    def _collect_memory_usage(self, report):
+        for state in self.states.values():
+            self._collect_state_memory_usage(report, state)
+        for event in self.events.values():
+            self._collect_event_memory_usage(report, event)
+        for funcs in (self.prepare_event, self.before_state_change, self.after_state_change, self.finalize_event,
+                      self.on_exception, self.on_final):
+            report.add_callbacks(funcs)
+        for model in self.models:
+            self._collect_model_memory_usage(report, model)
+        report.add('queues', self._transition_queue)
+        for trigger in self._transition_queue:
+            report.add('queues', trigger, count=False)
+
+    def _collect_state_memory_usage(self, report, state):
+        report.add('states', state)
+        for method in state.dynamic_methods:
+            report.add_callbacks(getattr(state, method))
+        # timeout states keep track of their running timers
+        for timer in getattr(state, 'runner', {}).values():
+            report.add('timers', timer)
+
+    @staticmethod
+    def _collect_event_memory_usage(report, event):
+        report.add('events', event)
+        for transitions in event.transitions.values():
+            report.add('events', transitions, count=False)
+            for transition in transitions:
+                report.add('transitions', transition)
+                report.add_callbacks(transition.conditions)
+                for method in transition.dynamic_methods:
+                    report.add_callbacks(getattr(transition, method))
+
+    def _collect_model_memory_usage(self, report, model):
+        try:
+            attributes = vars(model)
+        except TypeError:  # models with __slots__
+            return
+        for value in list(attributes.values()):
+            func = value
+            # unwrap FunctionWrapper of nested convenience functions
+            while hasattr(func, '_func'):
+                func = func._func  # pylint: disable=protected-access
+            if not isinstance(func, partial):
+                continue
+            owner = getattr(func.func, '__self__', None)
+            if owner is self or (isinstance(owner, Event) and owner.machine is self):
+                report.add('model_bindings', value)
+                if func is not value:
+                    report.add('model_bindings', func, count=False)
+
     def _identify_callback(self, name):
         # Does the prefix match a known callback?
         for callback in itertools.chain(self.state_cls.dynamic_methods, self.transition_cls.dynamic_methods):
@@ -1305,6 +1369,92 @@ class Machine(object):
             raise AttributeError("'{}' does not exist on <Machine@{}>".format(name, id(self)))
 
 
+class MemoryReport(object):
+    """Collects object counts and approximate sizes of a machine's structures per category.
+        Sizes are estimated with `sys.getsizeof` and include an object's attribute dictionary and the
+        containers directly referenced by it. Every object is only measured once, even if it is added
+        to the report several times.
+
+    Attributes:
+        categories (OrderedDict): Maps category names to dictionaries with 'objects' and 'bytes'.
+    """
+
+    def __init__(self, categories=None):
+        """
+        Args:
+            categories (list): Names of categories which should be part of the report even if they remain empty.
+        """
+        self.categories = OrderedDict((category, {'objects': 0, 'bytes': 0}) for category in categories or [])
+        self._seen = set()
+
+    @staticmethod
+    def sizeof(obj):
+        """Returns the approximate size of an object in bytes.
+        Args:
+            obj: The object to measure.
+        Returns:
+            int: Size of the object, its attribute dictionary and containers referenced by it.
+        """
+        size = sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            values = obj.values()
+        elif isinstance(obj, partial):
+            size += sys.getsizeof(obj.args) + sys.getsizeof(obj.keywords)
+            values = []
+        else:
+            attributes = getattr(obj, '__dict__', None)
+            if not isinstance(attributes, dict):
+                return size
+            size += sys.getsizeof(attributes)
+            values = attributes.values()
+        for value in values:
+            if isinstance(value, (list, tuple, set, dict, deque)):
+                size += sys.getsizeof(value)
+        return size
+
+    def add(self, category, obj, count=True):
+        """Adds an object to a category.
+        Args:
+            category (str): Name of the category.
+            obj: The object to measure.
+            count (bool): Whether the object should be counted. Containers (e.g. lists of an event)
+                are usually only added to the byte count of their owner's category.
+        """
+        try:
+            entry = self.categories[category]
+        except KeyError:
+            entry = self.categories[category] = {'objects': 0, 'bytes': 0}
+        if count:
+            entry['objects'] += 1
+        if id(obj) not in self._seen:
+            self._seen.add(id(obj))
+            entry['bytes'] += self.sizeof(obj)
+
+    def add_callbacks(self, funcs):
+        """Adds all callbacks of a list to the category 'callbacks'. Conditions are added with the callback
+            they wrap.
+        Args:
+            funcs (list): Callbacks, for instance `State.on_enter` or `Transition.conditions`.
+        """
+        for func in funcs:
+            if isinstance(func, Condition):
+                self.add('callbacks', func, count=False)
+                func = func.func
+            self.add('callbacks', func)
+
+    def total(self):
+        """Returns the sum of all categories as dictionary with 'objects' and 'bytes'."""
+        return {'objects': sum(entry['objects'] for entry in self.categories.values()),
+                'bytes': sum(entry['bytes'] for entry in self.categories.values())}
+
+    def format(self):
+        """Renders the report as a table with one line per category and the total in the last line."""
+        lines = ["%-16s %10s %12s" % ("category", "objects", "bytes")]
+        for category, entry in itertools.chain(self.categories.items(), [('total', self.total())]):
+            lines.append("%-16s %10d %12d" % (category, entry['objects'], entry['bytes']))
+        return "\n".join(lines)
+
+
 class MachineError(Exception):
     """MachineError is used for issues related to state transitions and current states.
     For instance, it is raised for invalid transitions or machine configuration issues.
@@ -1,7 +1,7 @@
 from logging import Logger
 from typing import (
     Any, Optional, Callable, Sequence, Union, Iterable, List, Dict, DefaultDict,
-    Type, Deque, OrderedDict, Tuple, Literal, Collection, TypedDict, Required
+    Type, Deque, OrderedDict, Tuple, Literal, Collection, TypedDict, Required, Set
 )
 
 # Enums are supported for Python 3.4+ and Python 2.7 with enum34 package installed
@@ -247,9 +247,26 @@ class Machine:
     def resolve_callable(func: Callback, event_data: EventData) -> CallbackFunc:  ...
     def _has_state(self, state: StateIdentifier, raise_error: bool = ...) -> bool: ...
     def _process(self, trigger: Callable[[], bool]) -> bool: ...
+    def memory_report(self) -> MemoryReport: ...
+    def _collect_memory_usage(self, report: MemoryReport) -> None: ...
+    def _collect_state_memory_usage(self, report: MemoryReport, state: State) -> None: ...
+    @staticmethod
+    def _collect_event_memory_usage(report: MemoryReport, event: Event) -> None: ...
+    def _collect_model_memory_usage(self, report: MemoryReport, model: object) -> None: ...
     def _identify_callback(self, name: str) -> Tuple[Optional[str], Optional[str]]: ...
     def __getattr__(self, name: str) -> Any: ...
 
+class MemoryReport:
+    categories: OrderedDict[str, Dict[str, int]]
+    _seen: Set[int]
+    def __init__(self, categories: Optional[List[str]] = ...) -> None: ...
+    @staticmethod
+    def sizeof(obj: Any) -> int: ...
+    def add(self, category: str, obj: Any, count: bool = ...) -> None: ...
+    def add_callbacks(self, funcs: Iterable[Union[Callback, Condition]]) -> None: ...
+    def total(self) -> Dict[str, int]: ...
+    def format(self) -> str: ...
+
 class MachineError(Exception):
     value: str
     def __init__(self, value: str) -> None: ...
@@ -5,18 +5,47 @@ transitions.extensions
 Additional functionality such as hierarchical (nested) machine support, Graphviz-based diagram creation
 and threadsafe execution of machine methods. Additionally, combinations of all those features are possible
 and made easier to access with a convenience factory.
+
+Extension modules are imported when one of their classes is accessed for the first time (PEP 562).
+This way, `import transitions.extensions` does not import asyncio or diagram modules unless they are used.
 """
 
-from .diagrams import GraphMachine, HierarchicalGraphMachine
-from .nesting import HierarchicalMachine
-from .locking import LockedMachine
+import importlib
+
+# maps exported names to the module which defines them
+_LAZY_IMPORTS = {
+    'GraphMachine': 'diagrams',
+    'HierarchicalGraphMachine': 'diagrams',
+    'HierarchicalMachine': 'nesting',
+    'LockedMachine': 'locking',
+    'MachineFactory': 'factory',
+    'LockedHierarchicalGraphMachine': 'factory',
+    'LockedHierarchicalMachine': 'factory',
+    'LockedGraphMachine': 'factory',
+    'AsyncMachine': 'asyncio',
+    'HierarchicalAsyncMachine': 'asyncio',
+    'AsyncGraphMachine': 'factory',
+    'HierarchicalAsyncGraphMachine': 'factory',
+}
+
+# submodules which used to be imported along with this package and thus could be accessed as attributes
+_SUBMODULES = ('asyncio', 'diagrams', 'diagrams_base', 'factory', 'locking', 'markup', 'nesting')
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module('.' + name, __name__)
+    try:
+        module_name = _LAZY_IMPORTS[name]
+    except KeyError:
+        raise AttributeError("module '{0}' has no attribute '{1}'".format(__name__, name))
+    value = getattr(importlib.import_module('.' + module_name, __name__), name)
+    # cache the class to skip __getattr__ for subsequent lookups
+    globals()[name] = value
+    return value
 
-from .factory import MachineFactory, LockedHierarchicalGraphMachine
-from .factory import LockedHierarchicalMachine, LockedGraphMachine
 
-try:
-    # only available for Python 3
-    from .asyncio import AsyncMachine, HierarchicalAsyncMachine
-    from .factory import AsyncGraphMachine, HierarchicalAsyncGraphMachine
-except (ImportError, SyntaxError):  # pragma: no cover
-    pass
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
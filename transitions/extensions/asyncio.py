@@ -16,17 +16,22 @@
 
 import logging
 import asyncio
+import operator
 import contextvars
 import inspect
 import sys
 import warnings
+import weakref
 from collections import deque
-from functools import partial, reduce
+from functools import partial
 import copy
+import heapq
+import itertools
 
 from ..core import State, Condition, Transition, EventData, listify
 from ..core import Event, MachineError, Machine
-from .nesting import HierarchicalMachine, NestedState, NestedEvent, NestedTransition, resolve_order
+from .nesting import HierarchicalMachine, NestedState, NestedEvent, NestedTransition, _CURRENT_SCOPE, \
+    _REGION_LOCK, _STATE_SCOPE
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -63,19 +68,35 @@ class NestedAsyncState(NestedState, AsyncState):
     """A state that allows substates. Callback execution is done asynchronously."""
 
     async def scoped_enter(self, event_data, scope=None):
-        self._scope = scope or []
-        await self.enter(event_data)
-        self._scope = []
+        token = self._set_scope(scope)
+        try:
+            await self.enter(event_data)
+        finally:
+            _STATE_SCOPE.reset(token)
 
     async def scoped_exit(self, event_data, scope=None):
-        self._scope = scope or []
-        await self.exit(event_data)
-        self._scope = []
+        token = self._set_scope(scope)
+        try:
+            await self.exit(event_data)
+        finally:
+            _STATE_SCOPE.reset(token)
 
 
 class AsyncCondition(Condition):
     """A helper class to await condition checks in the intended way."""
 
+    def evaluate(self, event_data):
+        """Calls the condition function without awaiting its result.
+        Args:
+            event_data (EventData): An EventData instance to pass to the
+                condition (if event sending is enabled) or to extract arguments
+                from (if event sending is disabled).
+        Returns:
+            The (possibly awaitable) return value of the condition function.
+        """
+        func = event_data.machine.resolve_callable(self.func, event_data)
+        return func(event_data) if event_data.machine.send_event else func(*event_data.args, **event_data.kwargs)
+
     async def check(self, event_data):
         """Check whether the condition passes.
         Args:
@@ -85,8 +106,7 @@ class AsyncCondition(Condition):
                 model attached to the current machine which is used to invoke
                 the condition.
         """
-        func = event_data.machine.resolve_callable(self.func, event_data)
-        res = func(event_data) if event_data.machine.send_event else func(*event_data.args, **event_data.kwargs)
+        res = self.evaluate(event_data)
         if inspect.isawaitable(res):
             return await res == self.target
         return res == self.target
@@ -98,8 +118,7 @@ class AsyncTransition(Transition):
     condition_cls = AsyncCondition
 
     async def _eval_conditions(self, event_data):
-        res = await event_data.machine.await_all([partial(cond.check, event_data) for cond in self.conditions])
-        if not all(res):
+        if not await event_data.machine.check_conditions(self.conditions, event_data):
             _LOGGER.debug("%sTransition condition failed: Transition halted.", event_data.machine.name)
             return False
         return True
@@ -153,6 +172,18 @@ class AsyncTransition(Transition):
 class NestedAsyncTransition(AsyncTransition, NestedTransition):
     """Representation of an asynchronous transition managed by a ``HierarchicalMachine`` instance."""
     async def _change_state(self, event_data):
+        lock = _REGION_LOCK.get()
+        if lock is None:
+            await self._change_nested_state(event_data)
+            return
+        async with lock:
+            token = _REGION_LOCK.set(None)
+            try:
+                await self._change_nested_state(event_data)
+            finally:
+                _REGION_LOCK.reset(token)
+
+    async def _change_nested_state(self, event_data):
         if hasattr(event_data.machine, "model_graphs"):
             graph = event_data.machine.model_graphs[id(event_data.model)]
             graph.reset_styling()
@@ -239,9 +270,8 @@ class NestedAsyncEvent(NestedEvent):
         """
         machine = event_data.machine
         model = event_data.model
-        state_tree = machine.build_state_tree(getattr(model, machine.model_attribute), machine.state_cls.separator)
-        state_tree = reduce(dict.get, machine.get_global_name(join=False), state_tree)
-        ordered_states = resolve_order(state_tree)
+        _, ordered_states = machine._get_state_tree(getattr(model, machine.model_attribute),
+                                                    machine.get_global_name(join=False))
         done = set()
         event_data.event = self
         for state_path in ordered_states:
@@ -249,13 +279,11 @@ class NestedAsyncEvent(NestedEvent):
             if state_name not in done and state_name in self.transitions:
                 event_data.state = machine.get_state(state_name)
                 event_data.source_name = state_name
-                event_data.source_path = copy.copy(state_path)
+                event_data.source_path = list(state_path)
                 await self._process(event_data)
                 if event_data.result:
-                    elems = state_path
-                    while elems:
-                        done.add(machine.state_cls.separator.join(elems))
-                        elems.pop()
+                    for idx in range(len(state_path), 0, -1):
+                        done.add(machine.state_cls.separator.join(state_path[:idx]))
         return event_data.result
 
     async def _process(self, event_data):
@@ -270,6 +298,17 @@ class NestedAsyncEvent(NestedEvent):
                 break
 
 
+class _ProtectedTasks(weakref.WeakSet):
+    """A set of tasks which are not cancelled by transitions. It is referencing tasks weakly."""
+
+    def append(self, task):
+        """Adds a task. This method only exists for backward compatibility since `protected_tasks` used
+        to be a list."""
+        warnings.warn("'AsyncMachine.protected_tasks' is a set. Use 'add' instead of 'append'.",
+                      category=DeprecationWarning, stacklevel=2)
+        self.add(task)
+
+
 class AsyncMachine(Machine):
     """Machine manages states, transitions and models. In case it is initialized without a specific model
     (or specifically no model), it will also act as a model itself. Machine takes also care of decorating
@@ -299,13 +338,34 @@ class AsyncMachine(Machine):
             present state (e.g., calling an a_to_b() trigger when the current state is c) will be silently
             ignored rather than raising an invalid transition exception.
         name (str): Name of the ``Machine`` instance mainly used for easier log message distinction.
+        async_tasks (_TaskRegistry): Currently running tasks of this machine's models.
+        protected_tasks (WeakSet): Tasks which will not be cancelled when a model transitions.
+        queue_capacity (int): If set and ``queued='model'``, events are put into an ``asyncio.Queue`` with this
+            capacity per model. Every model with pending events gets a consumer task which processes them one
+            after another and ends when the queue is empty. Triggers return as soon as their event is queued.
+        queue_overflow (str): What happens to an event when the model's queue is full: 'wait' (default) waits
+            for a free slot, 'drop' discards the event and the trigger returns False and 'drop_oldest' discards
+            the oldest queued event instead.
+        queued_results (bool): If True, triggers of queued machines return an ``asyncio.Future`` which resolves
+            to the result of the event (or raises its exception) once the event has been processed. Events
+            removed from a queue without being processed cancel their futures. Callbacks must not await
+            futures of events queued for the model they are processing.
+        dispatch_concurrency (int): If set, ``dispatch`` processes triggers of at most this many models
+            concurrently (see ``dispatch_iter``) unless another ``concurrency`` is passed.
+        eager_tasks (bool): If True, the tasks of triggers created by ``dispatch``, ``dispatch_iter`` and ``consume``
+            start right away instead of in the next iteration of the event loop. This requires Python 3.12 or later
+            and an event loop without a custom task factory. Note that this changes the order in which the
+            callbacks of different models are executed.
     """
 
     state_cls = AsyncState
     transition_cls = AsyncTransition
     event_cls = AsyncEvent
-    async_tasks = {}
-    protected_tasks = []
+    queue_capacity = None
+    queue_overflow = 'wait'
+    queued_results = False
+    dispatch_concurrency = None
+    eager_tasks = False
     current_context = contextvars.ContextVar('current_context', default=None)
 
     def __init__(self, model=Machine.self_literal, states=None, initial='initial', transitions=None,
@@ -315,6 +375,13 @@ class AsyncMachine(Machine):
                  queued=False, prepare_event=None, finalize_event=None, model_attribute='state',
                  model_override=False, on_exception=None, on_final=None, **kwargs):
 
+        self.async_tasks = _TaskRegistry()
+        self._coroutine_callbacks = {}
+        self._coroutine_functions = weakref.WeakKeyDictionary()
+        self._model_queues = {}
+        self._queued_results = {}
+        self._timeout_scheduler = None
+        self.protected_tasks = _ProtectedTasks()
         super().__init__(model=None, states=states, initial=initial, transitions=transitions,
                          send_event=send_event, auto_transitions=auto_transitions,
                          ordered_transitions=ordered_transitions, ignore_invalid_triggers=ignore_invalid_triggers,
@@ -334,21 +401,223 @@ class AsyncMachine(Machine):
             for mod in listify(model):
                 self._transition_queue_dict[id(self) if mod is self.self_literal else id(mod)] = deque()
 
-    async def dispatch(self, trigger, *args, **kwargs):
+    async def dispatch(self, trigger, *args, concurrency=None, **kwargs):
         """Trigger an event on all models assigned to the machine.
         Args:
             trigger (str): Event name
             *args (list): List of arguments passed to the event trigger
+            concurrency (int): Maximum number of triggers processed concurrently (see `dispatch_iter`).
+                Defaults to `dispatch_concurrency`; all triggers are processed at once if neither is set.
             **kwargs (dict): Dictionary of keyword arguments passed to the event trigger
         Returns:
             bool The truth value of all triggers combined with AND
         """
-        results = await self.await_all([partial(getattr(model, trigger), *args, **kwargs) for model in self.models])
+        concurrency = concurrency or self.dispatch_concurrency
+        if concurrency:
+            results = [res async for _, res in self.dispatch_iter(
+                trigger, *args, concurrency=concurrency, **kwargs)]
+        elif self.eager_tasks:
+            results = await asyncio.gather(*[_create_task(getattr(model, trigger)(*args, **kwargs), eager=True)
+                                             for model in self.models])
+        else:
+            results = await self.await_all([partial(getattr(model, trigger), *args, **kwargs)
+                                            for model in self.models])
         return all(results)
 
+    async def dispatch_iter(self, trigger, *args, concurrency=100, stop_on_failure=False, **kwargs):
+        """Triggers an event on all models assigned to the machine but processes at most `concurrency`
+        triggers at a time. Results are yielded in the order in which triggers finish. If a trigger raises
+        an exception, no further triggers are started and the exception is raised after the triggers
+        already running have finished. Running triggers also finish when iteration is stopped early.
+        Args:
+            trigger (str): Event name
+            *args (list): List of arguments passed to the event trigger
+            concurrency (int): Maximum number of triggers processed concurrently
+            stop_on_failure (bool): If True, no further triggers are started after a trigger returned False
+            **kwargs (dict): Dictionary of keyword arguments passed to the event trigger
+        Yields:
+            tuple: The model and the result of its trigger
+        """
+        models = iter(list(self.models))
+        running = {}
+        error = None
+        stop = False
+        try:
+            while True:
+                while not stop and len(running) < concurrency:
+                    model = next(models, None)
+                    if model is None:
+                        stop = True
+                        break
+                    running[_create_task(getattr(model, trigger)(*args, **kwargs), eager=self.eager_tasks)] = model
+                if not running:
+                    break
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    model = running.pop(task)
+                    if task.cancelled() or task.exception() is not None:
+                        stop = True
+                        if error is None:
+                            error = asyncio.CancelledError() if task.cancelled() else task.exception()
+                        continue
+                    res = task.result()
+                    if stop_on_failure and not res:
+                        stop = True
+                    yield model, res
+            if error is not None:
+                raise error
+        finally:
+            if running:
+                await asyncio.wait(running)
+                for task in running:
+                    if not task.cancelled():
+                        task.exception()  # retrieve exceptions to prevent warnings about unhandled errors
+
+    async def consume(self, source, key, concurrency=100):
+        """Processes messages of an asynchronous iterable. Every message is routed to the model whose key matches
+        the message's model key. Messages of the same model are processed in the order in which they have been
+        received while messages of different models are processed concurrently. Models are looked up in an index
+        which is built once and only rebuilt when a key cannot be found and models have been added or removed in
+        the meantime. Models without a key are not indexed. Messages without a matching model yield an error.
+        Exceptions raised by triggers are yielded and do not stop the consumption. If `source` raises an
+        exception, no further messages are read and the exception is raised once all received messages have
+        been processed.
+        Args:
+            source: An asynchronous iterable of messages. Messages are tuples of a model key, a trigger name and,
+                optionally, a tuple of positional arguments and a dictionary of keyword arguments.
+            key (str or callable): Name of the model attribute or a callable which returns the key of a model.
+            concurrency (int): Maximum number of models whose messages are processed concurrently. This is also
+                the maximum number of received messages which wait to be processed.
+        Yields:
+            tuple: The message, the result of its trigger (or None) and the raised exception (or None)
+        """
+        get_key = key if callable(key) else operator.attrgetter(key)
+        index = self._index_models(get_key)
+        indexed = len(self.models)
+        queues = {}  # received messages of models which are processed or wait for a free slot
+        ready = deque()
+        running = {}
+        waiting = 0
+        messages = source.__aiter__()
+        reader = None
+        error = None
+        try:
+            while True:
+                if reader is None and messages is not None and waiting < concurrency:
+                    reader = asyncio.ensure_future(messages.__anext__())
+                if reader is None and not running:
+                    break
+                done, _ = await asyncio.wait(set(running) | ({reader} if reader else set()),
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if reader in done:
+                    done.discard(reader)
+                    try:
+                        message = reader.result()
+                    except StopAsyncIteration:
+                        messages = None
+                    except Exception as err:  # pylint: disable=broad-except
+                        messages = None
+                        error = err
+                    else:
+                        try:
+                            model = index.get(message[0])
+                            if model is None and len(self.models) != indexed:
+                                index = self._index_models(get_key)
+                                indexed = len(self.models)
+                                model = index.get(message[0])
+                        except TypeError:  # unhashable keys cannot match any model
+                            model = None
+                        if model is None:
+                            yield message, None, ValueError("No model with key '%s' found." % (message[0],))
+                        else:
+                            if id(model) not in queues:
+                                queues[id(model)] = deque()
+                                ready.append(model)
+                            queues[id(model)].append(message)
+                            waiting += 1
+                    reader = None
+                for task in done:
+                    model, message = running.pop(task)
+                    if queues[id(model)]:
+                        ready.append(model)
+                    else:
+                        del queues[id(model)]
+                    if task.cancelled():
+                        yield message, None, asyncio.CancelledError()
+                    elif task.exception() is not None:
+                        yield message, None, task.exception()
+                    else:
+                        yield message, task.result(), None
+                while ready and len(running) < concurrency:
+                    model = ready.popleft()
+                    message = queues[id(model)].popleft()
+                    waiting -= 1
+                    running[_create_task(self._trigger_message(model, message), eager=self.eager_tasks)] = model, message
+            if error is not None:
+                raise error
+        finally:
+            if reader is not None:
+                reader.cancel()
+                await asyncio.wait([reader])
+                if not reader.cancelled():
+                    reader.exception()
+            if running:
+                await asyncio.wait(running)
+                for task in running:
+                    if not task.cancelled():
+                        task.exception()  # retrieve exceptions to prevent warnings about unhandled errors
+
+    def _index_models(self, get_key):
+        index = {}
+        for model in self.models:
+            try:
+                index[get_key(model)] = model
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.debug("%sModel %s has no valid key and will not receive messages.", self.name, model)
+        return index
+
+    @staticmethod
+    async def _trigger_message(model, message):
+        _, trigger, *params = message
+        args = params[0] if params else ()
+        kwargs = params[1] if len(params) > 1 else {}
+        return await getattr(model, trigger)(*args, **kwargs)
+
     async def callbacks(self, funcs, event_data):
-        """Triggers a list of callbacks"""
-        await self.await_all([partial(event_data.machine.callback, func, event_data) for func in funcs])
+        """Triggers a list of callbacks in the order in which they have been passed. Callbacks which have not
+        been classified as coroutine functions are processed one after another; coroutine functions are
+        processed concurrently. Coroutine functions which precede a synchronous callback are started before
+        the synchronous callback is called."""
+        if not funcs:
+            return
+        machine = event_data.machine
+        pending = []
+        started = []
+        try:
+            for func in funcs:
+                if machine.is_coroutine_callback(func, event_data):
+                    pending.append(machine.callback(func, event_data))
+                    continue
+                if pending:
+                    coros, pending = pending, []
+                    started.extend(asyncio.ensure_future(coro) for coro in coros)
+                    # let the started callbacks run until they suspend
+                    await asyncio.sleep(0)
+                await machine.callback(func, event_data)
+        except BaseException as err:
+            for coro in pending:
+                coro.close()
+            for task in started:
+                # like asyncio.gather, only cancel running callbacks when the processing itself has been cancelled
+                if isinstance(err, asyncio.CancelledError):
+                    task.cancel()
+                task.add_done_callback(_retrieve_exception)
+            raise
+        pending = started + pending
+        if len(pending) == 1:
+            await pending[0]
+        elif pending:
+            await asyncio.gather(*pending)
 
     async def callback(self, func, event_data):
         """Trigger a callback function with passed event_data parameters. In case func is a string,
@@ -365,9 +634,74 @@ class AsyncMachine(Machine):
         """
         func = self.resolve_callable(func, event_data)
         res = func(event_data) if self.send_event else func(*event_data.args, **event_data.kwargs)
-        if inspect.isawaitable(res):
+        # functions which are not coroutine functions may still return awaitables (e.g. futures)
+        if res is not None and inspect.isawaitable(res):
             await res
 
+    def is_coroutine_callback(self, func, event_data):
+        """Checks whether a callback is a coroutine function. Results are cached per callable and, for
+        callbacks passed by name, per model class. Names of model instance attributes are not cached since
+        they might be reassigned at any time.
+        Args:
+            func (string, callable): The callback function or its name.
+            event_data (EventData): The currently processed event used to resolve callback names.
+        Returns:
+            bool: True if calling the callback returns a coroutine.
+        """
+        if isinstance(func, str):
+            key = (type(event_data.model), func)
+            try:
+                return self._coroutine_callbacks[key]
+            except KeyError:
+                pass
+            # do not evaluate properties just to classify them
+            res = not isinstance(getattr(key[0], func, None), property) \
+                and _is_coroutine_function(self.resolve_callable(func, event_data))
+            if func not in getattr(event_data.model, '__dict__', ()):
+                self._coroutine_callbacks[key] = res
+            return res
+        try:
+            return self._coroutine_functions[func]
+        except KeyError:
+            res = self._coroutine_functions[func] = _is_coroutine_function(func)
+            return res
+        except TypeError:  # callable is neither hashable nor weakly referencable
+            return _is_coroutine_function(func)
+
+    async def check_conditions(self, conditions, event_data):
+        """Checks whether all conditions of a transition pass. Synchronous conditions are evaluated in order
+        without creating coroutines; only awaitable results are gathered.
+        Args:
+            conditions (list): A list of AsyncCondition instances
+            event_data (AsyncEventData): The currently processed event
+
+        Returns:
+            bool: True if all conditions passed
+        """
+        passed = True
+        pending = []
+        targets = []
+        try:
+            for cond in conditions:
+                res = cond.evaluate(event_data)
+                if inspect.isawaitable(res):
+                    pending.append(res)
+                    targets.append(cond.target)
+                elif not res == cond.target:
+                    passed = False
+        except BaseException:
+            # do not leave already created coroutines unawaited
+            for res in pending:
+                if inspect.iscoroutine(res):
+                    res.close()
+            raise
+        if len(pending) == 1:
+            return await pending[0] == targets[0] and passed
+        if pending:
+            results = await asyncio.gather(*pending)
+            return all(res == target for res, target in zip(results, targets)) and passed
+        return passed
+
     @staticmethod
     async def await_all(callables):
         """
@@ -399,7 +733,7 @@ class AsyncMachine(Machine):
                 "transitions will re-raise all raised CancelledError. "
                 "Make sure to catch them in your code. "
                 "The parameter 'msg' will likely be removed in a future release.", category=DeprecationWarning)
-        for running_task in self.async_tasks.get(id(model), []):
+        for running_task in list(self.async_tasks.get(model)):
             if self.current_context.get() == running_task or running_task in self.protected_tasks:
                 continue
             if running_task.done() is False:
@@ -417,12 +751,13 @@ class AsyncMachine(Machine):
         Returns:
             bool: returns the success state of the triggered event
         """
+        if self.queue_capacity and self.has_queue == 'model':
+            # events are processed one after another by the model's consumer task which handles cancellation
+            return await self._process_async(func, model)
         if self.current_context.get() is None:
-            token = self.current_context.set(asyncio.current_task())
-            if id(model) in self.async_tasks:
-                self.async_tasks[id(model)].append(asyncio.current_task())
-            else:
-                self.async_tasks[id(model)] = [asyncio.current_task()]
+            task = asyncio.current_task()
+            token = self.current_context.set(task)
+            self.async_tasks.add(model, task)
             try:
                 res = await self._process_async(func, model)
             except asyncio.CancelledError as err:
@@ -433,10 +768,8 @@ class AsyncMachine(Machine):
                     raise
                 res = False
             finally:
-                self.async_tasks[id(model)].remove(asyncio.current_task())
+                self.async_tasks.discard(model, task)
                 self.current_context.reset(token)
-                if len(self.async_tasks[id(model)]) == 0:
-                    del self.async_tasks[id(model)]
         else:
             res = await self._process_async(func, model)
         return res
@@ -448,17 +781,48 @@ class AsyncMachine(Machine):
         models = listify(model)
         if self.has_queue == 'model':
             for mod in models:
-                del self._transition_queue_dict[id(mod)]
+                # the first event of a queue is currently processed and will be resolved when it is done
+                self._cancel_queued_results(list(self._transition_queue_dict.pop(id(mod)))[1:])
                 self.models.remove(mod)
+                entry = self._model_queues.pop(id(mod), None)
+                if entry is not None:
+                    # a running consumer finishes its current event and ends since the queue is empty
+                    self._clear_model_queue(entry[0])
         else:
             for mod in models:
                 self.models.remove(mod)
         if len(self._transition_queue) > 0:
             queue = self._transition_queue
+            self._cancel_queued_results([e for e in list(queue)[1:] if e.args[0].model in models])
             new_queue = [queue.popleft()] + [e for e in queue if e.args[0].model not in models]
             self._transition_queue.clear()
             self._transition_queue.extend(new_queue)
 
+    @property
+    def pending_timeouts(self):
+        """Number of timeouts of `AsyncTimeout` states which have been scheduled but not processed yet."""
+        scheduler = self._timeout_scheduler
+        return scheduler.pending if scheduler is not None else 0
+
+    def get_timeout_scheduler(self):
+        """Returns the scheduler which processes the timeouts of this machine's `AsyncTimeout` states in the
+        running event loop. A new scheduler is created when the machine is used in another event loop."""
+        loop = asyncio.get_running_loop()
+        if self._timeout_scheduler is None or self._timeout_scheduler.loop is not loop:
+            self._timeout_scheduler = _TimeoutScheduler(loop)
+        return self._timeout_scheduler
+
+    def _collect_memory_usage(self, report):
+        super(AsyncMachine, self)._collect_memory_usage(report)
+        for model in self.models:
+            if self.has_queue == 'model':
+                queue = self._transition_queue_dict.get(id(model), [])
+                report.add('queues', queue)
+                for trigger in queue:
+                    report.add('queues', trigger, count=False)
+            for task in self.async_tasks.get(model):
+                report.add('tasks', task)
+
     async def _can_trigger(self, model, trigger, *args, **kwargs):
         state = self.get_model_state(model)
         event_data = AsyncEventData(state, AsyncEvent(name=trigger, machine=self), self, model, args, kwargs)
@@ -475,7 +839,7 @@ class AsyncMachine(Machine):
                 try:
                     await self.callbacks(self.prepare_event, event_data)
                     await self.callbacks(transition.prepare, event_data)
-                    if all(await self.await_all([partial(c.check, event_data) for c in transition.conditions])):
+                    if await self.check_conditions(transition.conditions, event_data):
                         return True
                 except BaseException as err:
                     event_data.error = err
@@ -496,34 +860,153 @@ class AsyncMachine(Machine):
                 return await trigger()
             raise MachineError("Attempt to process events synchronously while transition queue is not empty!")
 
+        if self.queue_capacity and self.has_queue == 'model':
+            return await self._put_model_queue(trigger, model)
+
         self._transition_queue_dict[id(model)].append(trigger)
         # another entry in the queue implies a running transition; skip immediate execution
         if len(self._transition_queue_dict[id(model)]) > 1:
-            return True
+            return self._create_queued_result(trigger) if self.queued_results else True
 
+        res = None
         while self._transition_queue_dict[id(model)]:
+            current = self._transition_queue_dict[id(model)][0]
             try:
-                await self._transition_queue_dict[id(model)][0]()
-            except BaseException:
+                current_res = await current()
+            except BaseException as err:
                 # if a transition raises an exception, clear queue and delegate exception handling
-                self._transition_queue_dict[id(model)].clear()
+                # to the event's future or, if there is none, to the caller processing the queue
+                queue = self._transition_queue_dict[id(model)]
+                self._cancel_queued_results(list(queue)[1:])
+                queue.clear()
+                if self._resolve_queued_result(current, error=err):
+                    break
                 raise
+            if current is trigger:
+                res = current_res
+            else:
+                self._resolve_queued_result(current, current_res)
             try:
                 self._transition_queue_dict[id(model)].popleft()
             except KeyError:
-                return True
+                break
+        if self.queued_results:
+            future = self._create_queued_result()
+            future.set_result(res)
+            return future
         return True
 
+    def _create_queued_result(self, trigger=None):
+        future = asyncio.get_running_loop().create_future()
+        if trigger is not None:
+            self._queued_results[trigger] = future
+        return future
+
+    def _resolve_queued_result(self, trigger, result=None, error=None):
+        future = self._queued_results.pop(trigger, None)
+        if future is None or future.done():
+            return False
+        if isinstance(error, asyncio.CancelledError):
+            future.cancel()
+        elif error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+        return True
+
+    def _cancel_queued_results(self, triggers):
+        for trigger in triggers:
+            future = self._queued_results.pop(trigger, None)
+            if future is not None:
+                future.cancel()
+
+    async def _put_model_queue(self, trigger, model):
+        # a model's entry contains its queue and its consumer task (or None if the consumer is idle)
+        entry = self._model_queues.get(id(model))
+        if entry is None:
+            entry = self._model_queues[id(model)] = [asyncio.Queue(maxsize=self.queue_capacity), None]
+        queue = entry[0]
+        if queue.full():
+            if self.queue_overflow == 'drop':
+                _LOGGER.warning("%sEvent queue of model %s is full. Event has been dropped.", self.name, model)
+                if self.queued_results:
+                    future = self._create_queued_result()
+                    future.set_result(False)
+                    return future
+                return False
+            if self.queue_overflow == 'drop_oldest':
+                self._cancel_queued_results([queue.get_nowait()])
+                queue.task_done()
+                _LOGGER.warning("%sEvent queue of model %s is full. Oldest event has been dropped.",
+                                self.name, model)
+            elif entry[1] is asyncio.current_task():
+                raise MachineError("Event queue of model %s is full. Its consumer cannot wait for "
+                                   "a free slot." % model)
+        # the future has to be registered before the event can be processed
+        res = self._create_queued_result(trigger) if self.queued_results else True
+        try:
+            await queue.put(trigger)
+        except BaseException:
+            self._cancel_queued_results([trigger])
+            raise
+        if entry[1] is None:
+            entry[1] = asyncio.get_running_loop().create_task(self._consume_model_queue(model, entry))
+        return res
+
+    async def _consume_model_queue(self, model, entry):
+        queue = entry[0]
+        # Events are processed one after another and cannot be cancelled by transitions of subsequent events.
+        # Thus, the consumer is not registered in `async_tasks`.
+        self.current_context.set(asyncio.current_task())
+        try:
+            while not queue.empty():
+                trigger = queue.get_nowait()
+                try:
+                    self._resolve_queued_result(trigger, await trigger())
+                except asyncio.CancelledError as err:
+                    # like in process_context, internally cancelled events were not successful
+                    if CANCELLED_MSG not in err.args:
+                        self._cancel_queued_results([trigger])
+                        raise
+                    self._resolve_queued_result(trigger, False)
+                except Exception as err:  # pylint: disable=broad-except
+                    # the remaining events are processed anyway; errors without a future can only be logged
+                    if not self._resolve_queued_result(trigger, error=err):
+                        _LOGGER.exception("%sError while processing queued event of model %s.", self.name, model)
+                except BaseException:
+                    self._cancel_queued_results([trigger])
+                    raise
+                finally:
+                    queue.task_done()
+        except BaseException:
+            # no consumer would be left to process the remaining events
+            self._clear_model_queue(queue)
+            raise
+        finally:
+            entry[1] = None
+            if queue.empty() and self._model_queues.get(id(model)) is entry:
+                del self._model_queues[id(model)]
+
+    def _clear_model_queue(self, queue):
+        while not queue.empty():
+            self._cancel_queued_results([queue.get_nowait()])
+            queue.task_done()
+
 
 class HierarchicalAsyncMachine(HierarchicalMachine, AsyncMachine):
     """Asynchronous variant of transitions.extensions.nesting.HierarchicalMachine.
         An asynchronous hierarchical machine REQUIRES AsyncNestedStates, AsyncNestedEvent and AsyncNestedTransitions
         (or any subclass of it) to operate.
+
+    Attributes:
+        concurrent_regions (bool): If True, events are processed in the regions of parallel states concurrently
+            with ``asyncio.gather``. Model state changes are still applied one at a time.
     """
 
     state_cls = NestedAsyncState
     transition_cls = NestedAsyncTransition
     event_cls = NestedAsyncEvent
+    concurrent_regions = False
 
     async def trigger_event(self, model, trigger, *args, **kwargs):
         """Processes events recursively and forwards arguments if suitable events are found.
@@ -570,59 +1053,109 @@ class HierarchicalAsyncMachine(HierarchicalMachine, AsyncMachine):
         return event_data.result
 
     async def _trigger_event_nested(self, event_data, _trigger, _state_tree):
-        model = event_data.model
         if _state_tree is None:
-            _state_tree = self.build_state_tree(listify(getattr(model, self.model_attribute)),
-                                                self.state_cls.separator)
-        res = {}
-        for key, value in _state_tree.items():
-            if value:
-                with self(key):
-                    tmp = await self._trigger_event_nested(event_data, _trigger, value)
+            _state_tree, _ = self._get_state_tree(getattr(event_data.model, self.model_attribute))
+        outer = _CURRENT_SCOPE.get()
+        # see HierarchicalMachine._trigger_event_nested
+        stack = [[self._get_current_scope() or self._get_root_scope(), iter(_state_tree.items()), {},
+                  await self._trigger_fan_out(event_data, _trigger, _state_tree), None]]
+        try:
+            while True:
+                frame = stack[-1]
+                scope, items, res, regions, key = frame
+                if key is None:
+                    item = next(items, None)
+                    if item is None:
+                        stack.pop()
+                        value = None if not res or all(v is None for v in res.values()) else any(res.values())
+                        if not stack:
+                            return value
+                        _CURRENT_SCOPE.set(_CURRENT_SCOPE.get()[1])
+                        frame = stack[-1]
+                        scope, _, res, _, key = frame
+                        if value is not None:
+                            res[key] = value
+                    else:
+                        key, value = item
+                        frame[4] = key
+                        if value:
+                            if regions is None:
+                                child = scope.child(key)
+                                _CURRENT_SCOPE.set((child, _CURRENT_SCOPE.get()))
+                                stack.append([child, iter(value.items()), {},
+                                              await self._trigger_fan_out(event_data, _trigger, value), None])
+                                continue
+                            if regions[key] is not None:
+                                res[key] = regions[key]
+                frame[4] = None
+                if not res.get(key, None) and _trigger in scope.events:
+                    tmp = await scope.events[_trigger].trigger_nested(event_data)
                     if tmp is not None:
                         res[key] = tmp
-            if not res.get(key, None) and _trigger in self.events:
-                tmp = await self.events[_trigger].trigger_nested(event_data)
-                if tmp is not None:
-                    res[key] = tmp
-        return None if not res or all(v is None for v in res.values()) else any(res.values())
+        finally:
+            _CURRENT_SCOPE.set(outer)
+
+    async def _trigger_fan_out(self, event_data, trigger, state_tree):
+        if not self.concurrent_regions:
+            return None
+        return await self._trigger_regions(event_data, trigger, state_tree)
+
+    async def _trigger_regions(self, event_data, trigger, state_tree):
+        keys = [key for key, value in state_tree.items() if value]
+        if len(keys) < 2:
+            return None
+        lock = _REGION_LOCK.get() or asyncio.Lock()
+        region_data = [copy.copy(event_data) for _ in keys]
+        results = await asyncio.gather(*[self._trigger_region(data, trigger, key, state_tree[key], lock)
+                                         for key, data in zip(keys, region_data)], return_exceptions=True)
+        return self._merge_regions(event_data, keys, region_data, results)
+
+    async def _trigger_region(self, event_data, trigger, key, state_tree, lock):
+        # gather wraps every region into a task with its own context
+        _REGION_LOCK.set(lock)
+        with self(key):
+            return await self._trigger_event_nested(event_data, trigger, state_tree)
 
     async def _can_trigger(self, model, trigger, *args, **kwargs):
-        state_tree = self.build_state_tree(getattr(model, self.model_attribute), self.state_cls.separator)
-        ordered_states = resolve_order(state_tree)
+        _, ordered_states = self._get_state_tree(getattr(model, self.model_attribute))
         for state_path in ordered_states:
             with self():
-                return await self._can_trigger_nested(model, trigger, state_path, *args, **kwargs)
+                return await self._can_trigger_nested(model, trigger, list(state_path), *args, **kwargs)
 
     async def _can_trigger_nested(self, model, trigger, path, *args, **kwargs):
-        if trigger in self.events:
-            source_path = copy.copy(path)
-            while source_path:
-                event_data = AsyncEventData(self.get_state(source_path), AsyncEvent(name=trigger, machine=self), self,
-                                            model, args, kwargs)
-                state_name = self.state_cls.separator.join(source_path)
-                for transition in self.events[trigger].transitions.get(state_name, []):
-                    try:
-                        _ = self.get_state(transition.dest) if transition.dest is not None else transition.source
-                    except ValueError:
-                        continue
-                    event_data.transition = transition
-                    try:
-                        await self.callbacks(self.prepare_event, event_data)
-                        await self.callbacks(transition.prepare, event_data)
-                        if all(await self.await_all([partial(c.check, event_data) for c in transition.conditions])):
-                            return True
-                    except BaseException as err:
-                        event_data.error = err
-                        if self.on_exception:
-                            await self.callbacks(self.on_exception, event_data)
-                        else:
-                            raise
-                source_path.pop(-1)
-        if path:
-            with self(path.pop(0)):
-                return await self._can_trigger_nested(model, trigger, path, *args, **kwargs)
-        return False
+        outer = _CURRENT_SCOPE.get()
+        try:
+            while True:
+                if trigger in self.events:
+                    source_path = copy.copy(path)
+                    while source_path:
+                        event_data = AsyncEventData(self.get_state(source_path), AsyncEvent(name=trigger, machine=self),
+                                                    self, model, args, kwargs)
+                        state_name = self.state_cls.separator.join(source_path)
+                        for transition in self.events[trigger].transitions.get(state_name, []):
+                            try:
+                                _ = self.get_state(transition.dest) if transition.dest is not None \
+                                    else transition.source
+                            except ValueError:
+                                continue
+                            event_data.transition = transition
+                            try:
+                                await self.callbacks(self.prepare_event, event_data)
+                                await self.callbacks(transition.prepare, event_data)
+                                if await self.check_conditions(transition.conditions, event_data):
+                                    return True
+                            except BaseException as err:
+                                event_data.error = err
+                                if self.on_exception:
+                                    await self.callbacks(self.on_exception, event_data)
+                                else:
+                                    raise
+                        source_path.pop(-1)
+                if not path:
+                    return False
+                _CURRENT_SCOPE.set((self(path.pop(0)), _CURRENT_SCOPE.get()))
+        finally:
+            _CURRENT_SCOPE.set(outer)
 
 
 class AsyncTimeout(AsyncState):
@@ -633,7 +1166,7 @@ class AsyncTimeout(AsyncState):
         timeout (float): Seconds after which a timeout function should be
                          called.
         on_timeout (list): Functions to call when a timeout is triggered.
-        runner (dict): Keeps track of running timeout tasks to cancel when a state is exited.
+        runner (dict): Keeps track of scheduled timeouts to cancel when a state is exited.
     """
 
     dynamic_methods = ["on_timeout"]
@@ -673,7 +1206,7 @@ class AsyncTimeout(AsyncState):
 
     async def exit(self, event_data):
         """
-        Cancels running timeout tasks stored in `self.runner` first (when not note) before
+        Cancels scheduled timeouts stored in `self.runner` first (when not done) before
         calling further exit callbacks.
 
         Args:
@@ -682,24 +1215,22 @@ class AsyncTimeout(AsyncState):
         Returns:
 
         """
-        timer_task = self.runner.get(id(event_data.model), None)
-        if timer_task is not None and not timer_task.done():
-            timer_task.cancel()
+        timer = self.runner.pop(id(event_data.model), None)
+        if timer is not None and not timer.done():
+            timer.cancel()
         await super().exit(event_data)
 
     def create_timer(self, event_data):
         """
-        Creates and returns a running timer. Shields self._process_timeout to prevent cancellation when
-        transitioning away from the current state (which cancels the timer) while processing timeout callbacks.
+        Schedules a timeout with the machine's timeout scheduler. When the timeout is due, self._process_timeout
+        is processed in a new task which will not be cancelled when transitioning away from the current state
+        (which cancels the timer) while processing timeout callbacks.
         Args:
             event_data (EventData): Data representing the currently processed event.
 
-        Returns (cancellable): A running timer with a cancel method
+        Returns (cancellable): A scheduled timer with a cancel method
         """
-        async def _timeout():
-            await asyncio.sleep(self.timeout)
-            await asyncio.shield(self._process_timeout(event_data))
-        return asyncio.create_task(_timeout())
+        return event_data.machine.get_timeout_scheduler().schedule(self.timeout, self._process_timeout, event_data)
 
     async def _process_timeout(self, event_data):
         _LOGGER.debug("%sTimeout state %s. Processing callbacks...", event_data.machine.name, self.name)
@@ -738,6 +1269,175 @@ class AsyncTimeout(AsyncState):
         self._on_timeout = listify(value)
 
 
+class _ScheduledTimeout:
+    """A timeout scheduled by a `_TimeoutScheduler`. Cancelling a timeout only marks it as cancelled."""
+
+    __slots__ = ('deadline', 'func', 'args', 'context', 'scheduler')
+
+    def __init__(self, deadline, func, args, scheduler):
+        self.deadline = deadline
+        self.func = func
+        self.args = args
+        self.context = contextvars.copy_context()
+        self.scheduler = scheduler
+
+    def cancel(self):
+        """Cancels the timeout if it has not been processed yet."""
+        if self.func is not None:
+            self.func = None
+            self.args = None
+            self.scheduler._cancelled()
+
+    def done(self):
+        """Returns True if the timeout has been processed or cancelled."""
+        return self.func is None
+
+
+class _TimeoutScheduler:
+    """Processes timeouts of an event loop with a single loop timer. Timeouts are kept in a heap ordered by
+    their deadline. The loop timer is always set to the earliest deadline. Cancelled timeouts remain in the
+    heap until they are due or until more than half of the heap consists of cancelled timeouts.
+
+    Attributes:
+        loop (asyncio.AbstractEventLoop): The event loop timeouts are scheduled in.
+        pending (int): Number of scheduled timeouts which have been neither processed nor cancelled.
+    """
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.pending = 0
+        self._heap = []
+        self._counter = itertools.count()
+        self._handle = None
+        self._tasks = set()
+
+    def schedule(self, delay, func, *args):
+        """Schedules the coroutine function `func` to be processed in a new task after `delay` seconds.
+        Returns:
+            _ScheduledTimeout: The scheduled timeout which can be cancelled.
+        """
+        timeout = _ScheduledTimeout(self.loop.time() + delay, func, args, self)
+        heapq.heappush(self._heap, (timeout.deadline, next(self._counter), timeout))
+        self.pending += 1
+        if self._handle is None or timeout.deadline < self._handle.when():
+            self._set_timer(timeout.deadline)
+        return timeout
+
+    def _set_timer(self, deadline):
+        if self._handle is not None:
+            self._handle.cancel()
+        self._handle = self.loop.call_at(deadline, self._process)
+
+    def _cancelled(self):
+        self.pending -= 1
+        if len(self._heap) > 64 and self.pending < len(self._heap) // 2:
+            self._heap = [item for item in self._heap if item[2].func is not None]
+            heapq.heapify(self._heap)
+
+    def _process(self):
+        self._handle = None
+        now = self.loop.time()
+        while self._heap and self._heap[0][0] <= now:
+            timeout = heapq.heappop(self._heap)[2]
+            if timeout.func is None:
+                continue
+            func, args = timeout.func, timeout.args
+            timeout.func = timeout.args = None
+            self.pending -= 1
+            task = timeout.context.run(self.loop.create_task, func(*args))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        while self._heap and self._heap[0][2].func is None:
+            heapq.heappop(self._heap)
+        if self._heap:
+            self._set_timer(self._heap[0][0])
+
+
+if sys.version_info >= (3, 12):
+    def _create_task(coro, eager=False):
+        """Creates a task. Eager tasks start right away unless the running loop uses a custom task factory."""
+        loop = asyncio.get_running_loop()
+        if eager and loop.get_task_factory() is None:
+            return asyncio.eager_task_factory(loop, coro)
+        return loop.create_task(coro)
+else:
+    def _create_task(coro, eager=False):  # pylint: disable=unused-argument
+        return asyncio.get_running_loop().create_task(coro)
+
+
+def _retrieve_exception(task):
+    """Marks the exception of a task which is not awaited anymore as retrieved."""
+    if not task.cancelled():
+        task.exception()
+
+
+def _is_coroutine_function(func):
+    return inspect.iscoroutinefunction(func) or inspect.iscoroutinefunction(getattr(func, '__call__', None))
+
+
+class _TaskRegistry:
+    """Collects the running tasks of models. Models are identified by id since they might not be hashable
+    but are referenced weakly where possible. Entries are removed as soon as a model's last task is done or
+    the model has been garbage collected; tasks registered for a collected model are never returned for
+    another model which reuses its id."""
+
+    def __init__(self):
+        self._tasks = {}
+        self._refs = {}
+
+    def add(self, model, task):
+        """Registers a running task of a model."""
+        key = id(model)
+        tasks = self._tasks.get(key)
+        if tasks is None:
+            tasks = self._tasks[key] = set()
+            try:
+                self._refs[key] = weakref.ref(model, partial(self._drop, key))
+            except TypeError:  # model does not support weak references
+                pass
+        tasks.add(task)
+
+    def discard(self, model, task):
+        """Removes a task of a model if it has been registered."""
+        key = id(model)
+        tasks = self._tasks.get(key)
+        if tasks is not None:
+            tasks.discard(task)
+            if not tasks:
+                self._drop(key)
+
+    def get(self, model, default=()):
+        """Returns the registered tasks of a model or `default`."""
+        if type(model) is int:  # pylint: disable=unidiomatic-typecheck
+            _warn_model_id()
+            return list(self._tasks[model]) if model in self._tasks else default
+        key = id(model)
+        ref = self._refs.get(key)
+        if ref is not None and ref() is not model:
+            return default
+        return self._tasks.get(key, default)
+
+    def _drop(self, key, _=None):
+        self._tasks.pop(key, None)
+        self._refs.pop(key, None)
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def __contains__(self, model):
+        return len(self.get(model)) > 0
+
+    def __getitem__(self, key):
+        # async_tasks used to be a dictionary of task lists indexed by model id
+        _warn_model_id()
+        return list(self._tasks[key])
+
+
+def _warn_model_id():
+    warnings.warn("Pass models instead of model ids to 'AsyncMachine.async_tasks' which is no longer a dictionary.",
+                  category=DeprecationWarning, stacklevel=3)
+
+
 class _DictionaryMock(dict):
 
     def __init__(self, item):
@@ -1,17 +1,19 @@
 from ..core import Callback, Condition, Event, EventData, Machine, State, Transition, StateConfig, ModelParameter, \
     TransitionConfigList
 from .nesting import HierarchicalMachine, NestedEvent, NestedState, NestedTransition, NestedEventData, \
-    NestedStateConfig, NestedStateIdentifier
+    NestedStateConfig, NestedStateIdentifier, StateTree
 from typing import Any, Awaitable, Optional, List, Type, Dict, Deque, Callable, Union, Iterable, DefaultDict, Literal, \
-    Sequence, Coroutine, Required, TypedDict, Collection
-from asyncio import Task
+    Sequence, Coroutine, Required, TypedDict, Collection, Set, Tuple, Iterator, AsyncGenerator, AsyncIterable, TypeVar
+from asyncio import AbstractEventLoop, Future, Queue, Task, TimerHandle, Lock
 from logging import Logger
 from enum import Enum
-from contextvars import ContextVar
+from contextvars import Context, ContextVar
+from weakref import ReferenceType, WeakKeyDictionary, WeakSet
 
-from ..core import StateIdentifier, CallbackList
+from ..core import StateIdentifier, CallbackList, MemoryReport
 
 _LOGGER: Logger
+_T = TypeVar("_T")
 
 CANCELLED_MSG: str = ...
 
@@ -38,11 +40,11 @@ class AsyncState(State):
     def add_callback(self, trigger: str, func: AsyncCallback) -> Awaitable[Optional[bool]]: ...  # type: ignore[override]
 
 class NestedAsyncState(NestedState, AsyncState):
-    _scope: Any
     async def scoped_enter(self, event_data: AsyncEventData, scope: Optional[List[str]] = ...) -> None: ...  # type: ignore[override]
     async def scoped_exit(self, event_data: AsyncEventData, scope: Optional[List[str]] = ...) -> None: ...  # type: ignore[override]
 
 class AsyncCondition(Condition):
+    def evaluate(self, event_data: AsyncEventData) -> Any: ...
     async def check(self, event_data: AsyncEventData) -> bool: ...  # type: ignore[override]
 
 class AsyncTransition(Transition):
@@ -53,6 +55,7 @@ class AsyncTransition(Transition):
 
 class NestedAsyncTransition(AsyncTransition, NestedTransition):
     async def _change_state(self, event_data: AsyncEventData) -> None: ...  # type: ignore[override]
+    async def _change_nested_state(self, event_data: AsyncEventData) -> None: ...  # type: ignore[override]
 
 class AsyncEventData(EventData):
     machine: AsyncMachine
@@ -82,10 +85,20 @@ class AsyncMachine(Machine):
     state_cls: Type[NestedAsyncState]
     transition_cls: Type[AsyncTransition]
     event_cls: Type[AsyncEvent]
-    async_tasks: Dict[int, List[Task[Any]]]
+    async_tasks: _TaskRegistry
     events: Dict[str, AsyncEvent]  # type: ignore
     queued: Union[bool, Literal["model"]]
-    protected_tasks: List[Task[Any]]
+    protected_tasks: _ProtectedTasks
+    queue_capacity: Optional[int]
+    queue_overflow: Literal['wait', 'drop', 'drop_oldest']
+    queued_results: bool
+    dispatch_concurrency: Optional[int]
+    eager_tasks: bool
+    _coroutine_callbacks: Dict[Tuple[Type[object], str], bool]
+    _model_queues: Dict[int, List[Any]]
+    _timeout_scheduler: Optional[_TimeoutScheduler]
+    _queued_results: Dict[Callable[[], Awaitable[Optional[bool]]], Future[Optional[bool]]]
+    _coroutine_functions: WeakKeyDictionary[Callable[..., Any], bool]
     current_context: ContextVar[Optional[Task[Any]]]
     _transition_queue_dict: Dict[int, Deque[AsyncCallbackFunc]]
     _queued = Union[bool, str]
@@ -109,9 +122,23 @@ class AsyncMachine(Machine):
                        before: AsyncCallbacksArg = ..., after: AsyncCallbacksArg = ..., prepare: AsyncCallbacksArg = ...,
                        **kwargs: Any) -> None: ...
     def add_transitions(self, transitions: Sequence[AsyncTransitionConfig] = ...) -> None: ...
-    async def dispatch(self, trigger: str, *args: Any, **kwargs: Any) -> bool: ...  # type: ignore[override]
+    async def dispatch(self, trigger: str, *args: Any, concurrency: Optional[int] = ...,  # type: ignore[override]
+                       **kwargs: Any) -> bool: ...
+    def dispatch_iter(self, trigger: str, *args: Any, concurrency: int = ..., stop_on_failure: bool = ...,
+                      **kwargs: Any) -> AsyncGenerator[Tuple[object, Optional[bool]], None]: ...
+    def consume(self, source: AsyncIterable[Tuple[Any, ...]], key: Union[str, Callable[[Any], Any]],
+                concurrency: int = ...) -> AsyncGenerator[Tuple[Tuple[Any, ...], Optional[bool],
+                                                                Optional[BaseException]], None]: ...
+    def _index_models(self, get_key: Callable[[Any], Any]) -> Dict[Any, object]: ...
+    @staticmethod
+    async def _trigger_message(model: object, message: Tuple[Any, ...]) -> Optional[bool]: ...
     async def callbacks(self, funcs: Iterable[Callback], event_data: AsyncEventData) -> None: ...  # type: ignore[override]
     async def callback(self, func: AsyncCallback, event_data: AsyncEventData) -> None: ...  # type: ignore[override]
+    @property
+    def pending_timeouts(self) -> int: ...
+    def get_timeout_scheduler(self) -> _TimeoutScheduler: ...
+    def is_coroutine_callback(self, func: AsyncCallback, event_data: AsyncEventData) -> bool: ...
+    async def check_conditions(self, conditions: Iterable[AsyncCondition], event_data: AsyncEventData) -> bool: ...
     @staticmethod
     async def await_all(callables: List[AsyncCallbackFunc]) -> List[Optional[bool]]: ...
     async def cancel_running_transitions(self, model: object, msg: Optional[str] = ...) -> None: ...
@@ -119,13 +146,25 @@ class AsyncMachine(Machine):
     def get_state(self, state: Union[str, Enum]) -> AsyncState: ...
     async def process_context(self, func: Callable[[], Awaitable[None]], model: object) -> bool: ...
     def remove_model(self, model: object) -> None: ...
-    async def _process_async(self, trigger: Callable[[], Awaitable[None]], model: object) -> bool: ...
+    def _collect_memory_usage(self, report: MemoryReport) -> None: ...
+    async def _process_async(self, trigger: Callable[[], Awaitable[None]],
+                             model: object) -> Union[bool, Future[Optional[bool]]]: ...
+    async def _put_model_queue(self, trigger: Callable[[], Awaitable[None]],
+                               model: object) -> Union[bool, Future[Optional[bool]]]: ...
+    def _create_queued_result(self, trigger: Optional[Callable[[], Awaitable[Optional[bool]]]] = ...
+                              ) -> Future[Optional[bool]]: ...
+    def _resolve_queued_result(self, trigger: Callable[[], Awaitable[Optional[bool]]], result: Optional[bool] = ...,
+                               error: Optional[BaseException] = ...) -> bool: ...
+    def _cancel_queued_results(self, triggers: Iterable[Callable[[], Awaitable[Optional[bool]]]]) -> None: ...
+    async def _consume_model_queue(self, model: object, entry: List[Any]) -> None: ...
+    def _clear_model_queue(self, queue: Queue[Any]) -> None: ...
 
 
 class HierarchicalAsyncMachine(HierarchicalMachine, AsyncMachine):  # type: ignore
     state_cls: Type[NestedAsyncState]
     transition_cls: Type[NestedAsyncTransition]
     event_cls: Type[NestedAsyncEvent]  # type: ignore
+    concurrent_regions: bool
     def __init__(self, model: Optional[ModelParameter]=...,
                  states: Optional[Union[Sequence[NestedStateConfig], Type[Enum]]] = ...,
                  initial: Optional[NestedStateIdentifier] = ...,
@@ -139,6 +178,12 @@ class HierarchicalAsyncMachine(HierarchicalMachine, AsyncMachine):  # type: igno
     async def trigger_event(self, model: object, trigger: str,  # type: ignore[override]
                             *args: Any, **kwargs: Any) -> bool: ...
     async def _trigger_event(self, event_data: NestedAsyncEventData, trigger: str) -> bool: ...  # type: ignore[override]
+    async def _trigger_fan_out(self, event_data: NestedAsyncEventData, trigger: str,  # type: ignore[override]
+                               state_tree: StateTree) -> Optional[Dict[str, Optional[bool]]]: ...
+    async def _trigger_regions(self, event_data: NestedAsyncEventData, trigger: str,  # type: ignore[override]
+                               state_tree: StateTree) -> Optional[Dict[str, Optional[bool]]]: ...
+    async def _trigger_region(self, event_data: NestedAsyncEventData, trigger: str,  # type: ignore[override]
+                              key: str, state_tree: StateTree, lock: Lock) -> Optional[bool]: ...
 
     def get_state(self, state: Union[str, Enum, List[str]], hint: Optional[List[str]] = ...) -> NestedAsyncState: ...
 
@@ -147,17 +192,65 @@ class AsyncTimeout(AsyncState):
     dynamic_methods: List[str]
     timeout: float
     _on_timeout: AsyncCallbacksArg
-    runner: Dict[int, Task[Any]]
+    runner: Dict[int, _ScheduledTimeout]
     def __init__(self, *args: Any, **kwargs: Any) -> None: ...
     async def enter(self, event_data: AsyncEventData) -> None: ...  # type: ignore[override]
     async def exit(self, event_data: AsyncEventData) -> None: ...  # type: ignore[override]
-    def create_timer(self, event_data: AsyncEventData) -> Task[Any]: ...
+    def create_timer(self, event_data: AsyncEventData) -> _ScheduledTimeout: ...
     async def _process_timeout(self, event_data: AsyncEventData) -> None: ...
     @property
     def on_timeout(self) -> CallbackList: ...
     @on_timeout.setter
     def on_timeout(self, value: AsyncCallbacksArg) -> None: ...
 
+class _ScheduledTimeout:
+    deadline: float
+    func: Optional[Callable[..., Coroutine[Any, Any, Any]]]
+    args: Optional[Tuple[Any, ...]]
+    context: Context
+    scheduler: _TimeoutScheduler
+    def __init__(self, deadline: float, func: Callable[..., Coroutine[Any, Any, Any]], args: Tuple[Any, ...],
+                 scheduler: _TimeoutScheduler) -> None: ...
+    def cancel(self) -> None: ...
+    def done(self) -> bool: ...
+
+class _TimeoutScheduler:
+    loop: AbstractEventLoop
+    pending: int
+    _heap: List[Tuple[float, int, _ScheduledTimeout]]
+    _counter: Iterator[int]
+    _handle: Optional[TimerHandle]
+    _tasks: Set[Task[Any]]
+    def __init__(self, loop: AbstractEventLoop) -> None: ...
+    def schedule(self, delay: float, func: Callable[..., Coroutine[Any, Any, Any]],
+                 *args: Any) -> _ScheduledTimeout: ...
+    def _set_timer(self, deadline: float) -> None: ...
+    def _cancelled(self) -> None: ...
+    def _process(self) -> None: ...
+
+def _create_task(coro: Coroutine[Any, Any, _T], eager: bool = ...) -> Task[_T]: ...
+
+def _retrieve_exception(task: Future[Any]) -> None: ...
+
+def _is_coroutine_function(func: Any) -> bool: ...
+
+class _TaskRegistry:
+    _tasks: Dict[int, Set[Task[Any]]]
+    _refs: Dict[int, ReferenceType[object]]
+    def __init__(self) -> None: ...
+    def add(self, model: object, task: Task[Any]) -> None: ...
+    def discard(self, model: object, task: Task[Any]) -> None: ...
+    def get(self, model: object, default: Collection[Task[Any]] = ...) -> Collection[Task[Any]]: ...
+    def _drop(self, key: int, _: Optional[ReferenceType[object]] = ...) -> None: ...
+    def __len__(self) -> int: ...
+    def __contains__(self, model: object) -> bool: ...
+    def __getitem__(self, key: int) -> List[Task[Any]]: ...
+
+def _warn_model_id() -> None: ...
+
+class _ProtectedTasks(WeakSet[Task[Any]]):
+    def append(self, task: Task[Any]) -> None: ...
+
 class _DictionaryMock(Dict[Any, Any]):
     _value: Any
     def __init__(self, item: Any) -> None: ...
@@ -20,7 +20,7 @@ from transitions import Transition
 
 from ..core import listify
 from .markup import MarkupMachine, HierarchicalMarkupMachine
-from .nesting import NestedTransition
+from .nesting import NestedTransition, _region_lock
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -223,6 +223,16 @@ class GraphMachine(MarkupMachine):
             setattr(mod, "get_graph", partial(self._get_graph, mod))
             _ = mod.get_graph(title=self.title, force_new=True)  # initialises graph
 
+    def _collect_memory_usage(self, report):
+        super(GraphMachine, self)._collect_memory_usage(report)
+        for graph in self.model_graphs.values():
+            report.add('graphs', graph)
+            # graphviz and mermaid graphs only keep track of styles; pygraphviz' AGraph is allocated by graphviz
+            for styles in getattr(graph, 'custom_styles', {}).values():
+                report.add('graphs', styles, count=False)
+                for value in styles.values():
+                    report.add('graphs', value, count=False)
+
     def add_states(
         self, states, on_enter=None, on_exit=None, ignore_invalid_triggers=None, **kwargs
     ):
@@ -258,6 +268,11 @@ class NestedGraphTransition(TransitionGraphSupport, NestedTransition):
         `LockedHierarchicalGraphMachine`.
     """
 
+    def _change_state(self, event_data):
+        # graphs are styled along with the model state when regions are processed concurrently
+        with _region_lock():
+            super(NestedGraphTransition, self)._change_state(event_data)
+
 
 class HierarchicalGraphMachine(GraphMachine, HierarchicalMarkupMachine):
     """
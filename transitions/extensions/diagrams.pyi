@@ -1,7 +1,7 @@
 from transitions.core import (
-    StateIdentifier, StateConfig, CallbacksArg, Transition, EventData, TransitionConfig, ModelParameter
+    StateIdentifier, StateConfig, CallbacksArg, Transition, EventData, TransitionConfig, ModelParameter, MemoryReport
 )
-from transitions.extensions.nesting import NestedTransition
+from transitions.extensions.nesting import NestedTransition, NestedEventData
 from transitions.extensions.diagrams_base import BaseGraph, GraphModelProtocol, GraphProtocol
 from transitions.extensions.markup import MarkupMachine, HierarchicalMarkupMachine
 from logging import Logger
@@ -56,6 +56,7 @@ class GraphMachine(MarkupMachine):
                            show_roi: bool = ...) -> GraphProtocol: ...
     def add_model(self, model: Union[Union[Literal['self'], object], List[Union[Literal['self'], object]]],
                   initial: Optional[StateIdentifier] = ...) -> None: ...
+    def _collect_memory_usage(self, report: MemoryReport) -> None: ...
     def add_states(self, states: Union[Sequence[StateConfig], StateConfig],
                    on_enter: CallbacksArg = ..., on_exit: CallbacksArg = ...,
                    ignore_invalid_triggers: Optional[bool] = ..., **kwargs: Any) -> None: ...
@@ -67,7 +68,8 @@ class GraphMachine(MarkupMachine):
                        **kwargs: Any) -> None: ...
 
 
-class NestedGraphTransition(TransitionGraphSupport, NestedTransition): ...
+class NestedGraphTransition(TransitionGraphSupport, NestedTransition):
+    def _change_state(self, event_data: NestedEventData) -> None: ...  # type: ignore[override]
 
 
 class HierarchicalGraphMachine(GraphMachine, HierarchicalMarkupMachine):  # type: ignore
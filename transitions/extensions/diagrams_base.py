@@ -154,3 +154,20 @@ class BaseGraph(object):
         except KeyError:
             _LOGGER.error("Graph creation incomplete!")
         return states, transitions
+
+
+def filter_states(states, state_names, state_cls, prefix=None):
+    prefix = prefix or []
+    result = []
+    for state in states:
+        pref = prefix + [state["name"]]
+        included = getattr(state_cls, "separator", "_").join(pref) in state_names
+        if "children" in state:
+            state["children"] = filter_states(
+                state["children"], state_names, state_cls, prefix=pref
+            )
+            if state["children"] or included:
+                result.append(state)
+        elif included:
+            result.append(state)
+    return result
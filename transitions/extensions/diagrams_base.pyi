@@ -1,8 +1,8 @@
 import abc
-from typing import BinaryIO, Protocol, Optional, Union, List, Dict, Tuple, Generator
+from typing import BinaryIO, Protocol, Optional, Union, List, Dict, Tuple, Generator, Iterable, Type
 
 from .diagrams import GraphMachine, HierarchicalGraphMachine
-from ..core import ModelState
+from ..core import ModelState, State
 
 
 class GraphProtocol(Protocol):
@@ -35,3 +35,6 @@ class BaseGraph(metaclass=abc.ABCMeta):
     def _get_global_name(self, path: List[str]) -> str: ...
     def _get_elements(self) -> Tuple[List[Dict[str, str]], List[Dict[str, str]]]: ...
     def _flatten(self, *lists: Union[str, Tuple[str]]) -> List[str]: ...
+
+def filter_states(states: List[Dict[str, str]], state_names: Iterable[str], state_cls: Type[State],
+                  prefix: Optional[List[str]] = ...) -> List[Dict[str, str]]: ...
@@ -16,7 +16,7 @@ try:
 except ImportError:
     pgv = None
 
-from .diagrams_base import BaseGraph
+from .diagrams_base import BaseGraph, filter_states  # filter_states is re-exported for compatibility
 
 _LOGGER = logging.getLogger(__name__)
 _LOGGER.addHandler(logging.NullHandler())
@@ -271,20 +271,3 @@ class NestedGraph(Graph):
         attr["source"] = src_name
         attr["dest"] = dst_name
         return attr
-
-
-def filter_states(states, state_names, state_cls, prefix=None):
-    prefix = prefix or []
-    result = []
-    for state in states:
-        pref = prefix + [state["name"]]
-        included = getattr(state_cls, "separator", "_").join(pref) in state_names
-        if "children" in state:
-            state["children"] = filter_states(
-                state["children"], state_names, state_cls, prefix=pref
-            )
-            if state["children"] or included:
-                result.append(state)
-        elif included:
-            result.append(state)
-    return result
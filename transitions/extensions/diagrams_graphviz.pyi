@@ -1,6 +1,6 @@
 from ..core import State, ModelState
 from .diagrams import GraphMachine
-from .diagrams_base import BaseGraph
+from .diagrams_base import BaseGraph, filter_states as filter_states
 from logging import Logger
 from typing import BinaryIO, Type, Optional, Dict, List, Union, DefaultDict, Any, Iterable
 try:
@@ -45,5 +45,3 @@ class NestedGraph(Graph):
                    container: Union[Digraph, SubgraphContext]) -> None: ...
     def _create_edge_attr(self, src: str, dst: str, transition: Dict[str, str]) -> Dict[str, Any]: ...
 
-def filter_states(states: List[Dict[str, str]], state_names: Iterable[str], state_cls: Type[State],
-                  prefix: Optional[List[str]] = ...) -> List[Dict[str, str]]: ...
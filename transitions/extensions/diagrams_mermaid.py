@@ -9,8 +9,7 @@ import copy
 import logging
 from collections import defaultdict
 
-from .diagrams_graphviz import filter_states
-from .diagrams_base import BaseGraph
+from .diagrams_base import BaseGraph, filter_states
 
 _LOGGER = logging.getLogger(__name__)
 _LOGGER.addHandler(logging.NullHandler())
@@ -64,6 +64,11 @@ class LockedHierarchicalMachine(LockedMachine, HierarchicalMachine):
     def _get_qualified_state_name(self, state):
         return self.get_global_name(state.name)
 
+    # Regions are always processed sequentially. Worker threads would wait for the machine lock
+    # which is held by the thread that triggered the event.
+    def _trigger_regions(self, event_data, trigger, state_tree):
+        return None
+
 
 class LockedGraphMachine(GraphMachine, LockedMachine):
     """
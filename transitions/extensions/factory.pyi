@@ -1,8 +1,8 @@
 from ..core import CallbackFunc, Machine, State
 from .diagrams import GraphMachine, NestedGraphTransition, HierarchicalGraphMachine
 from .locking import LockedMachine
-from .nesting import HierarchicalMachine, NestedEvent
-from typing import Any, Type, Dict, Tuple, Callable, Union
+from .nesting import HierarchicalMachine, NestedEvent, NestedEventData, StateTree
+from typing import Any, Type, Dict, Tuple, Callable, Union, Optional
 
 try:
     from transitions.extensions.asyncio import AsyncMachine, AsyncTransition
@@ -36,6 +36,8 @@ class LockedHierarchicalMachine(LockedMachine, HierarchicalMachine):  # type: ig
     # replaces LockedEvent with NestedEvent; method overridden by LockedEvent is not used in HSMs
     event_cls: Type[NestedEvent]  # type: ignore
     def _get_qualified_state_name(self, state: State) -> str: ...
+    def _trigger_regions(self, event_data: NestedEventData, trigger: str,
+                         state_tree: StateTree) -> Optional[Dict[str, Optional[bool]]]: ...
 
 class LockedGraphMachine(GraphMachine, LockedMachine):  # type: ignore
     @staticmethod
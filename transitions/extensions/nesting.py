@@ -8,10 +8,13 @@
 """
 
 from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
 import copy
 from functools import partial, reduce
 import inspect
 import logging
+import threading
 
 try:
     # Enums are supported for Python 3.4+ and Python 2.7 with enum34 package installed
@@ -27,10 +30,41 @@ except ImportError:  # pragma: no cover
 from six import string_types
 
 from ..core import State, Machine, Transition, Event, listify, MachineError, EventData
+from .locking import PicklableLock
 
 _LOGGER = logging.getLogger(__name__)
 _LOGGER.addHandler(logging.NullHandler())
 
+# The innermost entered scope and the previous value as a linked list of (NestedScope, previous) tuples.
+# Since every thread and every asyncio task has its own context, concurrent triggers do not share scopes.
+_CURRENT_SCOPE = ContextVar('transitions_nesting_scope', default=None)
+
+# States which are currently entered or exited as a linked list of (NestedState, scoped name, previous) tuples.
+# A state's name depends on its scope. States are shared by all models and must not store the scope themselves.
+_STATE_SCOPE = ContextVar('transitions_nesting_state_scope', default=None)
+
+# Set while parallel regions are processed concurrently. Model state changes are serialized with this lock.
+# The variable is cleared while the lock is held to allow nested state changes in the same context.
+_REGION_LOCK = ContextVar('transitions_nesting_region_lock', default=None)
+# Set in worker threads which process a region to prevent nested fan-outs from exhausting the executor.
+_REGION_WORKER = ContextVar('transitions_nesting_region_worker', default=False)
+
+
+@contextmanager
+def _region_lock():
+    """Acquires the region lock of the current context (if any). The lock is not reentrant, nested state
+    changes in the same context will skip it while it is held."""
+    lock = _REGION_LOCK.get()
+    if lock is None:
+        yield
+        return
+    with lock:
+        token = _REGION_LOCK.set(None)
+        try:
+            yield
+        finally:
+            _REGION_LOCK.reset(token)
+
 
 # converts a hierarchical tree into a list of current states
 def _build_state_list(state_tree, separator, prefix=None):
@@ -44,6 +78,36 @@ def _build_state_list(state_tree, separator, prefix=None):
     return res if len(res) > 1 else res[0]
 
 
+def _freeze_state_value(value):
+    """Converts a model state value into a hashable cache key. Lists (of parallel states) are converted
+    into tuples. Enum members are paired with their type since members of Enums with mixins (e.g. str) are
+    equal to their plain values. Raises TypeError if the value cannot be hashed."""
+    if isinstance(value, list):
+        return tuple(_freeze_state_value(elem) for elem in value)
+    if isinstance(value, Enum):
+        return type(value), value
+    hash(value)
+    return value
+
+
+def _lru_get(cache, key, lock):
+    """Returns the value cached for key or None and marks the entry as recently used."""
+    with lock:
+        value = cache.pop(key, None)
+        if value is not None:
+            cache[key] = value
+    return value
+
+
+def _lru_put(cache, key, value, maxsize, lock):
+    """Adds a value to an OrderedDict used as LRU cache and drops the least recently used entry if required."""
+    if maxsize > 0:
+        with lock:
+            if len(cache) >= maxsize:
+                cache.popitem(last=False)
+            cache[key] = value
+
+
 def resolve_order(state_tree):
     """Converts a (model) state tree into a list of state paths. States are ordered in the way in which states
     should be visited to process the event correctly (Breadth-first). This makes sure that ALL children are evaluated
@@ -70,14 +134,18 @@ def resolve_order(state_tree):
 
 class FunctionWrapper(object):
     """A wrapper to enable transitions' convenience function to_<state> for nested states.
-        This allows to call model.to_A.s1.C() in case a custom separator has been chosen."""
-    def __init__(self, func):
+        This allows to call model.to_A.s1.C() in case a custom separator has been chosen.
+        If a resolver is passed, wrappers of substates are created when they are accessed for the first time."""
+    def __init__(self, func, resolve=None, path=None):
         """
         Args:
             func: Function to be called at the end of the path.
-            path: If path is an empty string, assign function
+            resolve (callable): Returns the function of a substate path or None if the path does not exist.
+            path (list of strings): The path of this wrapper which is passed to resolve.
         """
         self._func = func
+        self._resolve = resolve
+        self._path = path or []
 
     def add(self, func, path):
         """Assigns a `FunctionWrapper` as an attribute named like the next segment of the substates
@@ -98,6 +166,20 @@ class FunctionWrapper(object):
                 assert not path[1:], "nested path should be empty"
                 setattr(self, name, FunctionWrapper(func))
 
+    def __getattr__(self, name):
+        # only called for attributes which have not been added or resolved yet
+        resolve = self.__dict__.get('_resolve')
+        if resolve is None or name.startswith('__'):
+            raise AttributeError("'{0}' has no attribute '{1}'".format(type(self).__name__, name))
+        # substates starting with a digit are prefixed with 's'
+        for segment in (name, name[1:]) if name[1:2].isdigit() and name[0] == 's' else (name,):
+            func = resolve(self._path + [segment])
+            if func is not None:
+                wrapper = FunctionWrapper(func, resolve, self._path + [segment])
+                setattr(self, name, wrapper)
+                return wrapper
+        raise AttributeError("'{0}' has no attribute '{1}'".format(type(self).__name__, name))
+
     def __call__(self, *args, **kwargs):
         return self._func(*args, **kwargs)
 
@@ -123,9 +205,8 @@ class NestedEvent(Event):
         """
         machine = event_data.machine
         model = event_data.model
-        state_tree = machine.build_state_tree(getattr(model, machine.model_attribute), machine.state_cls.separator)
-        state_tree = reduce(dict.get, machine.get_global_name(join=False), state_tree)
-        ordered_states = resolve_order(state_tree)
+        _, ordered_states = machine._get_state_tree(getattr(model, machine.model_attribute),
+                                                    machine.get_global_name(join=False))
         done = set()
         event_data.event = self
         for state_path in ordered_states:
@@ -133,13 +214,11 @@ class NestedEvent(Event):
             if state_name not in done and state_name in self.transitions:
                 event_data.state = machine.get_state(state_name)
                 event_data.source_name = state_name
-                event_data.source_path = copy.copy(state_path)
+                event_data.source_path = list(state_path)
                 self._process(event_data)
                 if event_data.result:
-                    elems = state_path
-                    while elems:
-                        done.add(machine.state_cls.separator.join(elems))
-                        elems.pop()
+                    for idx in range(len(state_path), 0, -1):
+                        done.add(machine.state_cls.separator.join(state_path[:idx]))
         return event_data.result
 
     def _process(self, event_data):
@@ -187,7 +266,6 @@ class NestedState(State):
         self.events = {}
         self.states = OrderedDict()
         self.on_final = listify(on_final)
-        self._scope = []
 
     def add_substate(self, state):
         """Adds a state as a substate.
@@ -210,11 +288,11 @@ class NestedState(State):
             event_data (NestedEventData): The currently processed event.
             scope (list(str)): Names of the state's parents starting with the top most parent.
         """
-        self._scope = scope or []
+        token = self._set_scope(scope)
         try:
             self.enter(event_data)
         finally:
-            self._scope = []
+            _STATE_SCOPE.reset(token)
 
     def scoped_exit(self, event_data, scope=None):
         """Exits a state with the provided scope.
@@ -222,28 +300,69 @@ class NestedState(State):
             event_data (NestedEventData): The currently processed event.
             scope (list(str)): Names of the state's parents starting with the top most parent.
         """
-        self._scope = scope or []
+        token = self._set_scope(scope)
         try:
             self.exit(event_data)
         finally:
-            self._scope = []
+            _STATE_SCOPE.reset(token)
+
+    def _set_scope(self, scope):
+        # the scoped name is resolved once per enter or exit call instead of every time `name` is accessed
+        name = super(NestedState, self).name
+        if scope:
+            name = self.separator.join(scope + [name])
+        return _STATE_SCOPE.set((self, name, _STATE_SCOPE.get()))
 
     @property
     def name(self):
-        return self.separator.join(self._scope + [super(NestedState, self).name])
+        frame = _STATE_SCOPE.get()
+        # the innermost frame usually belongs to this state; outer frames are only present in nested triggers
+        while frame is not None:
+            if frame[0] is self:
+                return frame[1]
+            frame = frame[2]
+        return super(NestedState, self).name
 
 
 class NestedTransition(Transition):
     """A transition which handles entering and leaving nested states."""
 
     def _resolve_transition(self, event_data):
-        dst_name_path = self.dest.split(event_data.machine.state_cls.separator)
-        _ = event_data.machine.get_state(dst_name_path)
-        state_tree = event_data.machine.build_state_tree(
-            listify(getattr(event_data.model, event_data.machine.model_attribute)),
-            event_data.machine.state_cls.separator)
+        machine = event_data.machine
+        scope = machine.get_global_name(join=False)
+        model_states = getattr(event_data.model, machine.model_attribute)
+        # the plan only depends on the destination, the current state(s) of the model and the scope
+        try:
+            key = (self.dest, _freeze_state_value(model_states), tuple(scope))
+        except TypeError:  # unhashable state values are not cached
+            key = None
+            plan = None
+        else:
+            plan = _lru_get(machine._transition_plan_cache, key, machine._cache_lock)
+        if plan is None:
+            plan = self._plan_transition(machine, listify(model_states), scope)
+            if key is not None:
+                _lru_put(machine._transition_plan_cache, key, plan, machine.transition_plan_cache_size,
+                         machine._cache_lock)
+        state_tree, exit_steps, enter_steps = plan
+        exit_partials = [partial(state.scoped_exit, event_data, path) for state, path in exit_steps]
+        enter_partials = [partial(state.scoped_enter, event_data, path) for state, path in enter_steps]
+        return state_tree, exit_partials, enter_partials
+
+    def _plan_transition(self, machine, model_states, scope):
+        """Determines which states have to be exited and entered to reach the destination.
+        Args:
+            machine (HierarchicalMachine): The machine processing the transition.
+            model_states (list): The current state(s) of the model.
+            scope (list(str)): The path of the currently processed scope.
+        Returns:
+            tuple: The resulting state tree (which must not be altered) as well as lists of (state, scope)
+                tuples of the states to exit and enter in the order they should be processed.
+        """
+        dst_name_path = self.dest.split(machine.state_cls.separator)
+        _ = machine.get_state(dst_name_path)
+        state_tree = machine.build_state_tree(model_states, machine.state_cls.separator)
 
-        scope = event_data.machine.get_global_name(join=False)
         tmp_tree = state_tree.get(dst_name_path[0], None)
         root = []
         while tmp_tree is not None:
@@ -265,11 +384,10 @@ class NestedTransition(Transition):
         else:
             exit_scope = scoped_tree
 
-        exit_partials = [partial(event_data.machine.get_state(root + state_name).scoped_exit,
-                                 event_data, scope + root + state_name[:-1])
-                         for state_name in resolve_order(exit_scope)]
+        exit_steps = [(machine.get_state(root + state_name), scope + root + state_name[:-1])
+                      for state_name in resolve_order(exit_scope)]
 
-        new_states, enter_partials = self._enter_nested(root, dst_name_path, scope + root, event_data)
+        new_states, enter_steps = self._enter_nested(root, dst_name_path, scope + root, machine)
 
         # we reset/clear the whole branch if it is scoped, otherwise only reset the sibling
         if exit_scope == scoped_tree:
@@ -278,9 +396,16 @@ class NestedTransition(Transition):
             scoped_tree[new_key] = value
             break
 
-        return state_tree, exit_partials, enter_partials
+        return state_tree, exit_steps, enter_steps
 
     def _change_state(self, event_data):
+        if _REGION_LOCK.get() is None:
+            self._change_nested_state(event_data)
+        else:
+            with _region_lock():
+                self._change_nested_state(event_data)
+
+    def _change_nested_state(self, event_data):
         state_tree, exit_partials, enter_partials = self._resolve_transition(event_data)
         for func in exit_partials:
             func()
@@ -293,61 +418,75 @@ class NestedTransition(Transition):
                 on_final_cb()
 
     def _final_check(self, event_data, state_tree, enter_partials):
-        on_final_cbs = []
-        is_final = False
-        # processes states with children
-        if state_tree:
-            all_children_final = True
-            for child_cbs, is_final in (self._final_check_nested(state, event_data, state_tree, enter_partials) for state in state_tree):
-                # if one child is not considered final, processing can stop
-                if not is_final:
-                    all_children_final = False
-                    # if one child has recently transitioned to a final state, we need to update all parents
-                on_final_cbs.extend(child_cbs)
-            # if and only if all other children are also in a final state and a child has recently reached a final
-            # state OR the scoped state has just been entered, trigger callbacks
-            if all_children_final:
-                if on_final_cbs or any(event_data.machine.scoped.scoped_enter == part.func for part in enter_partials):
-                    on_final_cbs.append(
-                        partial(event_data.machine.callbacks, event_data.machine.scoped.on_final, event_data))
+        machine = event_data.machine
+        entered = {id(getattr(part.func, '__self__', None)) for part in enter_partials}
+        # substates are checked before their parents; every frame contains the scope, its state tree,
+        # the remaining substates to check, the collected callbacks and whether all substates are final
+        root = machine._get_current_scope() or machine._get_root_scope()
+        stack = [[root, state_tree, iter(state_tree), [], True]]
+        while True:
+            scope, tree, names, on_final_cbs, all_children_final = stack[-1]
+            name = next(names, None)
+            if name is not None:
+                stack.append([scope.child(name), tree[name], iter(tree[name]), [], True])
+                continue
+            stack.pop()
+            scoped = scope.scoped
+            is_final = False
+            # processes states with children
+            if tree:
+                # if and only if all children are in a final state and a child has recently reached a final
+                # state OR the scoped state has just been entered, trigger callbacks
+                if all_children_final:
+                    if on_final_cbs or id(scoped) in entered:
+                        on_final_cbs.append(partial(machine.callbacks, scoped.on_final, event_data))
+                    is_final = True
+            # if a state is a leaf state OR has children not in a final state
+            elif getattr(scoped, 'final', False):
+                # if the state itself is considered final and has recently been entered trigger callbacks
+                # thus, a state with non-final children may still trigger callbacks if itself is considered final
+                if id(scoped) in entered:
+                    on_final_cbs.append(partial(machine.callbacks, scoped.on_final, event_data))
                 is_final = True
-        # if a state is a leaf state OR has children not in a final state
-        elif getattr(event_data.machine.scoped, 'final', False):
-            # if the state itself is considered final and has recently been entered trigger callbacks
-            # thus, a state with non-final children may still trigger callbacks if itself is considered final
-            if any(event_data.machine.scoped.scoped_enter == part.func for part in enter_partials):
-                on_final_cbs.append(partial(event_data.machine.callbacks, event_data.machine.scoped.on_final, event_data))
-            is_final = True
-        return on_final_cbs, is_final
-
-    def _final_check_nested(self, state, event_data, state_tree, enter_partials):
-        with event_data.machine(state):
-            return self._final_check(event_data, state_tree[state], enter_partials)
-
-    def _enter_nested(self, root, dest, prefix_path, event_data):
-        if root:
-            state_name = root.pop(0)
-            with event_data.machine(state_name):
-                return self._enter_nested(root, dest, prefix_path, event_data)
-        elif dest:
-            new_states = OrderedDict()
-            state_name = dest.pop(0)
-            with event_data.machine(state_name):
-                new_states[state_name], new_enter = self._enter_nested([], dest, prefix_path + [state_name], event_data)
-                enter_partials = [partial(event_data.machine.scoped.scoped_enter, event_data, prefix_path)] + new_enter
-            return new_states, enter_partials
-        elif event_data.machine.scoped.initial:
-            new_states = OrderedDict()
-            enter_partials = []
+            if not stack:
+                return on_final_cbs, is_final
+            parent = stack[-1]
+            parent[3].extend(on_final_cbs)
+            if not is_final:
+                parent[4] = False
+
+    def _enter_nested(self, root, dest, prefix_path, machine):
+        """Determines the states to enter when the destination is reached.
+        Args:
+            root (list(str)): The path from the current scope to the parent of the destination which is already
+                active and must not be entered.
+            dest (list(str)): The path of the destination relative to root.
+            prefix_path (list(str)): The path of the root state.
+            machine (HierarchicalMachine): The machine processing the transition.
+        Returns:
+            tuple: The state tree of the entered states as well as a list of (state, scope) tuples of the
+                states to enter in the order they should be processed.
+        """
+        scope = machine._get_current_scope() or machine._get_root_scope()
+        for state_name in root:
+            scope = scope.child(state_name)
+        new_states = OrderedDict()
+        enter_steps = []
+        scoped_tree = new_states
+        prefix = prefix_path
+        for state_name in dest:
+            scope = scope.child(state_name)
+            enter_steps.append((scope.scoped, prefix))
+            prefix = prefix + [state_name]
+            scoped_tree[state_name] = OrderedDict()
+            scoped_tree = scoped_tree[state_name]
+        if scope.scoped.initial:
             queue = []
-            prefix = prefix_path
-            scoped_tree = new_states
-            initial_names = [i.name if hasattr(i, 'name') else i for i in listify(event_data.machine.scoped.initial)]
-            initial_states = [event_data.machine.scoped.states[n] for n in initial_names]
+            initial_names = [i.name if hasattr(i, 'name') else i for i in listify(scope.scoped.initial)]
+            initial_states = [scope.states[n] for n in initial_names]
             while True:
-                event_data.scope = prefix
                 for state in initial_states:
-                    enter_partials.append(partial(state.scoped_enter, event_data, prefix))
+                    enter_steps.append((state, prefix))
                     scoped_tree[state.name] = OrderedDict()
                     if state.initial:
                         queue.append((scoped_tree[state.name], prefix + [state.name],
@@ -356,9 +495,7 @@ class NestedTransition(Transition):
                 if not queue:
                     break
                 scoped_tree, prefix, initial_states = queue.pop(0)
-            return new_states, enter_partials
-        else:
-            return {}, []
+        return new_states, enter_steps
 
     @staticmethod
     def _update_model(event_data, tree):
@@ -384,15 +521,77 @@ class NestedTransition(Transition):
         return result
 
 
+class NestedScope(object):
+    """An immutable view on a (nested) level of a HierarchicalMachine. Scopes are created and cached by
+    `HierarchicalMachine.__call__` and are used as context managers to temporarily make a level the
+    current scope of the machine. The current scope is stored in a context variable and not in the
+    machine which makes scope changes thread- and task-local.
+    Attributes:
+        machine (HierarchicalMachine): The machine the scope belongs to.
+        scoped (NestedState or HierarchicalMachine): The state (or the machine for the root scope) of this level.
+        states (OrderedDict): The states of this level.
+        events (dict): The events of this level.
+        prefix_path (list(str)): The path of the scoped state. Must not be altered.
+        name (str): The fully qualified name of the scoped state or an empty string for the root scope.
+    """
+
+    __slots__ = ('machine', 'scoped', 'states', 'events', 'prefix_path', 'name', '_children')
+
+    def __init__(self, machine, scoped, states, events, prefix_path):
+        self.machine = machine
+        self.scoped = scoped
+        self.states = states
+        self.events = events
+        self.prefix_path = prefix_path
+        self.name = machine.state_cls.separator.join(prefix_path)
+        self._children = {}
+
+    def child(self, name):
+        """Returns the scope of a substate.
+        Args:
+            name (str or Enum): The name of the substate. Only the first element is considered if the name is a path.
+        Returns:
+            NestedScope of the substate.
+        """
+        try:
+            return self._children[name]
+        except KeyError:
+            pass
+        if isinstance(name, Enum):
+            state_name = name.name
+        else:
+            state_name = name.split(self.machine.state_cls.separator)[0]
+        state = self.states[state_name]
+        scope = NestedScope(self.machine, state, state.states, state.events, self.prefix_path + [state_name])
+        self._children[name] = scope
+        return scope
+
+    def __enter__(self):
+        _CURRENT_SCOPE.set((self, _CURRENT_SCOPE.get()))
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        _CURRENT_SCOPE.set(_CURRENT_SCOPE.get()[1])
+
+
 class HierarchicalMachine(Machine):
     """Extends transitions.core.Machine by capabilities to handle nested states.
         A hierarchical machine REQUIRES NestedStates, NestedEvent and NestedTransitions
         (or any subclass of it) to operate.
+    Attributes:
+        state_tree_cache_size (int): The maximum number of parsed model states kept in the state tree cache.
+            Set to 0 to disable caching.
+        transition_plan_cache_size (int): The maximum number of cached transition plans (states to exit and enter
+            for a destination and the current model state). Set to 0 to disable caching.
+        region_executor (concurrent.futures.Executor): If set, events are processed in the regions of parallel
+            states concurrently with this executor. Model state changes are still applied one at a time.
     """
 
     state_cls = NestedState
     transition_cls = NestedTransition
     event_cls = NestedEvent
+    state_tree_cache_size = 128
+    transition_plan_cache_size = 512
+    region_executor = None
 
     def __init__(self, model=Machine.self_literal, states=None, initial='initial', transitions=None,
                  send_event=False, auto_transitions=True,
@@ -403,10 +602,11 @@ class HierarchicalMachine(Machine):
         assert issubclass(self.state_cls, NestedState)
         assert issubclass(self.event_cls, NestedEvent)
         assert issubclass(self.transition_cls, NestedTransition)
-        self._stack = []
-        self.prefix_path = []
-        self.scoped = self
-        self._next_scope = None
+        self._root_scope = None
+        self._state_tree_cache = OrderedDict()
+        self._transition_plan_cache = OrderedDict()
+        # guards the caches above which are shared by all threads that trigger events of this machine
+        self._cache_lock = PicklableLock()
         super(HierarchicalMachine, self).__init__(
             model=model, states=states, initial=initial, transitions=transitions,
             send_event=send_event, auto_transitions=auto_transitions,
@@ -417,29 +617,72 @@ class HierarchicalMachine(Machine):
         )
 
     def __call__(self, to_scope=None):
-        if isinstance(to_scope, Enum):
-            state = self.states[to_scope.name]
-            to_scope = (state, state.states, state.events, self.prefix_path + [to_scope.name])
-        elif isinstance(to_scope, string_types):
-            state_name = to_scope.split(self.state_cls.separator)[0]
-            state = self.states[state_name]
-            to_scope = (state, state.states, state.events, self.prefix_path + [state_name])
-        elif to_scope is None:
-            if self._stack:
-                to_scope = self._stack[0]
-            else:
-                to_scope = (self, self.states, self.events, [])
-        self._next_scope = to_scope
+        """Returns a scope to be used as a context manager. Within the context, state names and events are
+        resolved relative to the scoped state.
+        Args:
+            to_scope (str, Enum or NestedScope): The (name of the) substate of the current scope to switch to.
+                If None, the root scope of the machine is returned.
+        Returns:
+            NestedScope
+        """
+        if to_scope is None:
+            return self._get_root_scope()
+        if isinstance(to_scope, NestedScope):
+            return to_scope
+        return (self._get_current_scope() or self._get_root_scope()).child(to_scope)
+
+    def _get_root_scope(self):
+        if self._root_scope is None:
+            self._root_scope = NestedScope(self, self, self._states, self._events, [])
+        return self._root_scope
+
+    def _get_current_scope(self):
+        # returns None if the machine has no active scope in the current context
+        frame = _CURRENT_SCOPE.get()
+        while frame is not None:
+            if frame[0].machine is self:
+                return frame[0]
+            frame = frame[1]
+        return None
 
-        return self
+    @property
+    def scoped(self):
+        """NestedState or HierarchicalMachine: The state of the current scope or the machine itself."""
+        scope = self._get_current_scope()
+        return self if scope is None else scope.scoped
 
-    def __enter__(self):
-        self._stack.append((self.scoped, self.states, self.events, self.prefix_path))
-        self.scoped, self.states, self.events, self.prefix_path = self._next_scope
-        self._next_scope = None
+    @property
+    def states(self):
+        """OrderedDict: The states of the current scope."""
+        scope = self._get_current_scope()
+        return self._states if scope is None else scope.states
+
+    @states.setter
+    def states(self, value):
+        self._states = value
+        self._root_scope = None
+        self._state_index = {}
+        self._state_paths = {}
+        self._registered_states = {}
+        self._nested_cache = {}
 
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self.scoped, self.states, self.events, self.prefix_path = self._stack.pop()
+    @property
+    def events(self):
+        """dict: The events of the current scope."""
+        scope = self._get_current_scope()
+        return self._events if scope is None else scope.events
+
+    @events.setter
+    def events(self, value):
+        self._events = value
+        self._root_scope = None
+        self._nested_cache = {}
+
+    @property
+    def prefix_path(self):
+        """list(str): The path of the current scope."""
+        scope = self._get_current_scope()
+        return [] if scope is None else scope.prefix_path
 
     def add_model(self, model, initial=None):
         """Extends transitions.core.Machine.add_model by applying a custom 'to' function to
@@ -509,6 +752,11 @@ class HierarchicalMachine(Machine):
         """
         remap = kwargs.pop('remap', None)
         ignore = self.ignore_invalid_triggers if ignore_invalid_triggers is None else ignore_invalid_triggers
+        # cached trees may contain resolved enum paths and cached scopes and plans may reference outdated substates
+        self._state_tree_cache.clear()
+        self._transition_plan_cache.clear()
+        self._nested_cache.clear()
+        self._root_scope = None
 
         for state in listify(states):
             if isinstance(state, Enum):
@@ -537,6 +785,7 @@ class HierarchicalMachine(Machine):
 
     def add_transition(self, trigger, source, dest, conditions=None,
                        unless=None, before=None, after=None, prepare=None, **kwargs):
+        self._nested_cache.clear()
         if source == self.wildcard_all and dest == self.wildcard_same:
             source = self.get_nested_state_names()
         else:
@@ -567,18 +816,33 @@ class HierarchicalMachine(Machine):
 
     def get_nested_state_names(self):
         """Returns a list of global names of all states of a machine.
+        Results are cached until states or transitions are added or removed through the machine.
         Returns:
             list(str) of global state names.
         """
+        key = ('state_names', self.get_global_name())
+        try:
+            return list(self._nested_cache[key])
+        except KeyError:
+            pass
+        separator = self.state_cls.separator
         ordered_states = []
-        for state in self.states.values():
-            ordered_states.append(self.get_global_name(state))
-            with self(state.name):
-                ordered_states.extend(self.get_nested_state_names())
+        stack = [(key[1], iter(self.states.values()))]
+        while stack:
+            prefix, states = stack[-1]
+            state = next(states, None)
+            if state is None:
+                stack.pop()
+                continue
+            state_name = prefix + separator + state.name if prefix else state.name
+            ordered_states.append(state_name)
+            stack.append((state_name, iter(state.states.values())))
+        self._nested_cache[key] = tuple(ordered_states)
         return ordered_states
 
     def get_nested_transitions(self, trigger="", src_path=None, dest_path=None):
         """Retrieves a list of all transitions matching the passed requirements.
+        Results are cached until states or transitions are added or removed through the machine.
         Args:
             trigger (str): If set, return only transitions related to this trigger.
             src_path (list(str)): If set, return only transitions with this source state.
@@ -587,50 +851,72 @@ class HierarchicalMachine(Machine):
         Returns:
             list(NestedTransitions) of valid transitions.
         """
+        key = ('transitions', self.get_global_name(), trigger,
+               tuple(src_path) if src_path else None, tuple(dest_path) if dest_path else None)
+        try:
+            return list(self._nested_cache[key])
+        except KeyError:
+            pass
+        transitions = self._get_nested_transitions(trigger, src_path, dest_path)
+        self._nested_cache[key] = tuple(transitions)
+        return transitions
+
+    def _get_nested_transitions(self, trigger, src_path, dest_path):
         if src_path and dest_path:
             src = self.state_cls.separator.join(src_path)
             dest = self.state_cls.separator.join(dest_path)
             transitions = super(HierarchicalMachine, self).get_transitions(trigger, src, dest)
             if len(src_path) > 1 and len(dest_path) > 1:
                 with self(src_path[0]):
-                    transitions.extend(self.get_nested_transitions(trigger, src_path[1:], dest_path[1:]))
+                    transitions.extend(self._get_nested_transitions(trigger, src_path[1:], dest_path[1:]))
         elif src_path:
             src = self.state_cls.separator.join(src_path)
             transitions = super(HierarchicalMachine, self).get_transitions(trigger, src, "*")
             if len(src_path) > 1:
                 with self(src_path[0]):
-                    transitions.extend(self.get_nested_transitions(trigger, src_path[1:], None))
+                    transitions.extend(self._get_nested_transitions(trigger, src_path[1:], None))
         elif dest_path:
             dest = self.state_cls.separator.join(dest_path)
             transitions = super(HierarchicalMachine, self).get_transitions(trigger, "*", dest)
             if len(dest_path) > 1:
                 for state_name in self.states:
                     with self(state_name):
-                        transitions.extend(self.get_nested_transitions(trigger, None, dest_path[1:]))
+                        transitions.extend(self._get_nested_transitions(trigger, None, dest_path[1:]))
         else:
             transitions = super(HierarchicalMachine, self).get_transitions(trigger, "*", "*")
             for state_name in self.states:
                 with self(state_name):
-                    transitions.extend(self.get_nested_transitions(trigger, None, None))
+                    transitions.extend(self._get_nested_transitions(trigger, None, None))
         return transitions
 
     def get_nested_triggers(self, src_path=None):
         """Retrieves a list of valid triggers.
+        Results are cached until states or transitions are added or removed through the machine.
         Args:
             src_path (list(str)): A list representation of the source state's name.
         Returns:
             list(str) of valid trigger names.
         """
+        key = ('triggers', self.get_global_name(), tuple(src_path) if src_path else None)
+        try:
+            return list(self._nested_cache[key])
+        except KeyError:
+            pass
+        triggers = self._get_nested_triggers(src_path)
+        self._nested_cache[key] = tuple(triggers)
+        return triggers
+
+    def _get_nested_triggers(self, src_path):
         if src_path:
             triggers = super(HierarchicalMachine, self).get_triggers(self.state_cls.separator.join(src_path))
             if len(src_path) > 1 and src_path[0] in self.states:
                 with self(src_path[0]):
-                    triggers.extend(self.get_nested_triggers(src_path[1:]))
+                    triggers.extend(self._get_nested_triggers(src_path[1:]))
         else:
             triggers = list(self.events.keys())
             for state_name in self.states:
                 with self(state_name):
-                    triggers.extend(self.get_nested_triggers())
+                    triggers.extend(self._get_nested_triggers(None))
         return triggers
 
     def get_state(self, state, hint=None):
@@ -644,29 +930,35 @@ class HierarchicalMachine(Machine):
         if isinstance(state, Enum):
             state = self._get_enum_path(state)
         elif isinstance(state, string_types):
+            scope = self._get_current_scope()
+            entry = self._state_index.get(
+                scope.name + self.state_cls.separator + state if scope is not None and scope.name else state
+            )
+            if entry is not None:
+                return entry[0]
+            # states might have been added to a NestedState directly and are not indexed
             state = state.split(self.state_cls.separator)
-        if not hint:
-            state = copy.copy(state)
-            hint = copy.copy(state)
+        states = self.states
         if len(state) > 1:
-            child = state.pop(0)
+            # resolve the path relative to the current scope first and fall back to the root scope
             try:
-                with self(child):
-                    return self.get_state(state, hint)
-            except (KeyError, ValueError):
+                for elem in state[:-1]:
+                    states = states[elem].states
+                return states[state[-1]]
+            except KeyError:
+                hint = hint or state
                 try:
-                    with self():
-                        state = self
-                        for elem in hint:
-                            state = state.states[elem]
-                        return state
+                    states = self._states
+                    for elem in hint[:-1]:
+                        states = states[elem].states
+                    return states[hint[-1]]
                 except KeyError:
                     raise ValueError(
                         "State '%s' is not a registered state." % self.state_cls.separator.join(hint)
                     )  # from KeyError
-        elif state[0] not in self.states:
+        elif state[0] not in states:
             raise ValueError("State '%s' is not a registered state." % state)
-        return self.states[state[0]]
+        return states[state[0]]
 
     def get_states(self, states):
         """Retrieves a list of NestedStates.
@@ -721,20 +1013,23 @@ class HierarchicalMachine(Machine):
             src_path (list(str)): If empty, all transitions that match dest_path and trigger will be removed.
             dest_path (list(str)): If empty, all transitions that match src_path and trigger will be removed.
         """
-        cur_src = self.state_cls.separator.join(src_path)
-        cur_dst = self.state_cls.separator.join(dest_path)
-        if trigger in self.scoped.events:
-            evt = self.scoped.events[trigger]
-            for src, transitions in evt.transitions.items():
-                evt.transitions[src] = [trans for trans in transitions
-                                        if (src_path and trans.source != cur_src) or (cur_dst and trans.dest != cur_dst)]
-        for state_name in self.scoped.states:
-            with self(state_name):
+        stack = [(self._get_current_scope() or self._get_root_scope(), src_path, dest_path)]
+        while stack:
+            scope, src_path, dest_path = stack.pop()
+            cur_src = self.state_cls.separator.join(src_path)
+            cur_dst = self.state_cls.separator.join(dest_path)
+            if trigger in scope.events:
+                evt = scope.events[trigger]
+                for src, transitions in evt.transitions.items():
+                    evt.transitions[src] = [trans for trans in transitions
+                                            if (src_path and trans.source != cur_src)
+                                            or (cur_dst and trans.dest != cur_dst)]
+            for state_name in scope.states:
                 if state_name in [cur_src, cur_dst]:
                     continue
-                self._remove_nested_transitions(trigger,
-                                                src_path if not src_path or state_name != src_path[0] else src_path[1:],
-                                                dest_path if not dest_path or state_name != dest_path[0] else dest_path[1:])
+                stack.append((scope.child(state_name),
+                              src_path if not src_path or state_name != src_path[0] else src_path[1:],
+                              dest_path if not dest_path or state_name != dest_path[0] else dest_path[1:]))
 
     def remove_transition(self, trigger, source="*", dest="*"):
         """Removes transitions matching the passed criteria.
@@ -753,6 +1048,7 @@ class HierarchicalMachine(Machine):
                 else dest.split(self.state_cls.separator) if isinstance(dest, string_types) \
                 else self._get_state_path(dest)
             self._remove_nested_transitions(trigger, source_path, dest_path)
+        self._nested_cache.clear()
 
         # remove trigger from models if no transition is left for trigger
         if not self.get_transitions(trigger):
@@ -760,43 +1056,48 @@ class HierarchicalMachine(Machine):
                 delattr(model, trigger)
 
     def _can_trigger(self, model, trigger, *args, **kwargs):
-        state_tree = self.build_state_tree(getattr(model, self.model_attribute), self.state_cls.separator)
-        ordered_states = resolve_order(state_tree)
+        _, ordered_states = self._get_state_tree(getattr(model, self.model_attribute))
         with self():
             return any(
-                self._can_trigger_nested(model, trigger, state_path, *args, **kwargs)
+                self._can_trigger_nested(model, trigger, list(state_path), *args, **kwargs)
                 for state_path in ordered_states
             )
 
     def _can_trigger_nested(self, model, trigger, path, *args, **kwargs):
-        if trigger in self.events:
-            source_path = copy.copy(path)
-            while source_path:
-                event_data = EventData(self.get_state(source_path), Event(name=trigger, machine=self), self, model,
-                                       args, kwargs)
-                state_name = self.state_cls.separator.join(source_path)
-                for transition in self.events[trigger].transitions.get(state_name, []):
-                    try:
-                        _ = self.get_state(transition.dest) if transition.dest is not None else transition.source
-                    except ValueError:
-                        continue
-                    event_data.transition = transition
-                    try:
-                        self.callbacks(self.prepare_event, event_data)
-                        self.callbacks(transition.prepare, event_data)
-                        if all(c.check(event_data) for c in transition.conditions):
-                            return True
-                    except BaseException as err:
-                        event_data.error = err
-                        if self.on_exception:
-                            self.callbacks(self.on_exception, event_data)
-                        else:
-                            raise
-                source_path.pop(-1)
-        if path:
-            with self(path.pop(0)):
-                return self._can_trigger_nested(model, trigger, path, *args, **kwargs)
-        return False
+        # checks the levels of the path from the current scope downwards
+        outer = _CURRENT_SCOPE.get()
+        try:
+            while True:
+                if trigger in self.events:
+                    source_path = copy.copy(path)
+                    while source_path:
+                        event_data = EventData(self.get_state(source_path), Event(name=trigger, machine=self), self,
+                                               model, args, kwargs)
+                        state_name = self.state_cls.separator.join(source_path)
+                        for transition in self.events[trigger].transitions.get(state_name, []):
+                            try:
+                                _ = self.get_state(transition.dest) if transition.dest is not None \
+                                    else transition.source
+                            except ValueError:
+                                continue
+                            event_data.transition = transition
+                            try:
+                                self.callbacks(self.prepare_event, event_data)
+                                self.callbacks(transition.prepare, event_data)
+                                if all(c.check(event_data) for c in transition.conditions):
+                                    return True
+                            except BaseException as err:
+                                event_data.error = err
+                                if self.on_exception:
+                                    self.callbacks(self.on_exception, event_data)
+                                else:
+                                    raise
+                        source_path.pop(-1)
+                if not path:
+                    return False
+                _CURRENT_SCOPE.set((self(path.pop(0)), _CURRENT_SCOPE.get()))
+        finally:
+            _CURRENT_SCOPE.set(outer)
 
     def get_triggers(self, *args):
         """Extends transitions.core.Machine.get_triggers to also include parent state triggers."""
@@ -827,8 +1128,7 @@ class HierarchicalMachine(Machine):
         return trigger in state.events or any(self.has_trigger(trigger, sta) for sta in state.states.values())
 
     def is_state(self, state, model, allow_substates=False):
-        tree = self.build_state_tree(listify(getattr(model, self.model_attribute)),
-                                     self.state_cls.separator)
+        tree, _ = self._get_state_tree(getattr(model, self.model_attribute))
 
         path = self._get_enum_path(state) if isinstance(state, Enum) else state.split(self.state_cls.separator)
         for elem in path:
@@ -943,13 +1243,12 @@ class HierarchicalMachine(Machine):
                     state.add_callback(callback[3:], method)
         else:
             path = name.split(self.state_cls.separator)
-            value = state.value if isinstance(state.value, Enum) else name
-            trig_func = partial(self.is_state, value, model)
-            if hasattr(model, 'is_' + path[0]):
-                getattr(model, 'is_' + path[0]).add(trig_func, path[1:])
-            else:
-                assert not path[1:], "nested path should be empty"
-                self._checked_assignment(model, 'is_' + path[0], FunctionWrapper(trig_func))
+            # wrappers of nested states are resolved when they are accessed
+            if len(path) == 1:
+                value = state.value if isinstance(state.value, Enum) else name
+                self._checked_assignment(model, 'is_' + name,
+                                         FunctionWrapper(partial(self.is_state, value, model),
+                                                         partial(self._resolve_is_state, model), path))
         with self(state.name):
             for event in self.events.values():
                 self._add_trigger_to_model(event.name, model)
@@ -1011,6 +1310,7 @@ class HierarchicalMachine(Machine):
                 self.events[evt.name] = evt
                 for model in self.models:
                     self._add_trigger_to_model(evt.name, model)
+        self._nested_cache.clear()
         if self.scoped.initial is None:
             self.scoped.initial = state.initial
 
@@ -1041,15 +1341,36 @@ class HierarchicalMachine(Machine):
         # FunctionWrappers are only necessary if a custom separator is used
         if trigger.startswith('to_') and self.state_cls.separator != '_':
             path = trigger[3:].split(self.state_cls.separator)
-            if hasattr(model, 'to_' + path[0]):
-                # add path to existing function wrapper
-                getattr(model, 'to_' + path[0]).add(trig_func, path[1:])
+            wrapper = getattr(model, 'to_' + path[0], None)
+            if isinstance(wrapper, FunctionWrapper):
+                # wrappers of nested paths are resolved when they are accessed
+                if len(path) == 1 or wrapper._resolve is None:  # pylint: disable=protected-access
+                    wrapper.add(trig_func, path[1:])
+            elif len(path) == 1:
+                self._checked_assignment(model, 'to_' + path[0],
+                                         FunctionWrapper(trig_func, partial(self._resolve_to_state, model), path))
             else:
-                # create a new function wrapper
+                # nested triggers of scoped events without a root trigger cannot be resolved
                 self._checked_assignment(model, 'to_' + path[0], FunctionWrapper(trig_func))
         else:
             self._checked_assignment(model, trigger, trig_func)
 
+    def _resolve_to_state(self, model, path):
+        trigger = 'to_' + self.state_cls.separator.join(path)
+        return partial(self.trigger_event, model, trigger) if trigger in self._events else None
+
+    def _resolve_is_state(self, model, path):
+        name = self.state_cls.separator.join(path)
+        entry = self._state_index.get(name)
+        if entry is None:
+            try:
+                state = self.get_state(path)
+            except ValueError:
+                return None
+        else:
+            state = entry[0]
+        return partial(self.is_state, state.value if isinstance(state.value, Enum) else name, model)
+
     def build_state_tree(self, model_states, separator, tree=None):
         """Converts a list of current states into a hierarchical state tree.
         Args:
@@ -1074,15 +1395,44 @@ class HierarchicalMachine(Machine):
                 tmp = tmp.setdefault(elem.name if hasattr(elem, 'name') else elem, OrderedDict())
         return tree
 
+    def _get_state_tree(self, model_states, scope=None):
+        """Returns the state tree of the passed model state(s) and the order in which the tree's states
+        should be processed. Results are cached per model state and scope in a bounded LRU cache
+        (see `state_tree_cache_size`) which is cleared whenever states are added. The returned tree is
+        shared between calls and must not be altered.
+        Args:
+            model_states (str, Enum or list): The current state(s) of a model.
+            scope (list(str)): The path of the (sub)tree that should be returned. Defaults to the root.
+        Returns:
+            tuple: The state tree (OrderedDict) and the processing order (tuple of tuples of str).
+        """
+        scope = scope or []
+        try:
+            key = (_freeze_state_value(model_states), tuple(scope))
+        except TypeError:  # unhashable state values are not cached
+            key = None
+        else:
+            entry = _lru_get(self._state_tree_cache, key, self._cache_lock)
+            if entry is not None:
+                return entry
+        tree = reduce(dict.get, scope, self.build_state_tree(listify(model_states), self.state_cls.separator))
+        entry = (tree, tuple(tuple(state_path) for state_path in resolve_order(tree)))
+        if key is not None:
+            _lru_put(self._state_tree_cache, key, entry, self.state_tree_cache_size, self._cache_lock)
+        return entry
+
     def _get_enum_path(self, enum_state, prefix=None):
         prefix = prefix or []
-        if enum_state.name in self.states and self.states[enum_state.name].value == enum_state:
-            return prefix + [enum_state.name]
-        for name in self.states:
-            with self(name):
-                res = self._get_enum_path(enum_state, prefix=prefix + [name])
-                if res:
-                    return res
+        path = self._get_indexed_path(enum_state)
+        if path is not None:
+            return prefix + path
+        # states which are not indexed are searched depth-first
+        stack = [(self.states, prefix)]
+        while stack:
+            states, path = stack.pop()
+            if enum_state.name in states and states[enum_state.name].value == enum_state:
+                return path + [enum_state.name]
+            stack.extend((states[name].states, path + [name]) for name in reversed(states))
         # if we reach this point without a prefix, we looped over all nested states
         # and could not find a suitable enum state
         if not prefix:
@@ -1091,15 +1441,65 @@ class HierarchicalMachine(Machine):
 
     def _get_state_path(self, state, prefix=None):
         prefix = prefix or []
-        if state in self.states.values():
-            return prefix + [state.name]
-        for name in self.states:
-            with self(name):
-                res = self._get_state_path(state, prefix=prefix + [name])
-                if res:
-                    return res
+        path = self._get_indexed_path(state)
+        if path is not None:
+            return prefix + path
+        stack = [(self.states, prefix)]
+        while stack:
+            states, path = stack.pop()
+            if state in states.values():
+                return path + [state.name]
+            stack.extend((states[name].states, path + [name]) for name in reversed(states))
         return []
 
+    def _get_indexed_path(self, key):
+        # returns the path of an indexed state (or enum) relative to the current scope or None if the path
+        # is unknown, ambiguous or not part of the current scope
+        try:
+            path = self._state_paths.get(key)
+        except TypeError:
+            return None
+        if path is not None:
+            scope_path = self.prefix_path
+            depth = len(scope_path)
+            if len(path) > depth and path[:depth] == scope_path:
+                return path[depth:]
+        return None
+
+    def _index_state(self, state):
+        """Adds a state which has been added to the current scope to the state indices. The state index maps
+        fully qualified names to the state and its parents while the path index maps state objects and
+        enum values to the state's path. Additionally, all indexed states are registered by identity.
+        Args:
+            state (NestedState): The state to be indexed.
+        """
+        path = self.prefix_path + [state.name]
+        name = self.state_cls.separator.join(path)
+        previous = self._state_index.get(name)
+        if previous is not None and previous[0] is not state:
+            # a state has been replaced; drop the entries of the former state and its substates
+            prefix = name + self.state_cls.separator
+            for key in [key for key in self._state_index if key == name or key.startswith(prefix)]:
+                dropped = self._state_index.pop(key)[0]
+                self._registered_states.pop(id(dropped), None)
+                self._state_paths.pop(dropped, None)
+                if isinstance(dropped.value, Enum):
+                    self._state_paths.pop(dropped.value, None)
+        parents = []
+        states = self._states
+        for elem in path[:-1]:
+            parents.append(states[elem])
+            states = parents[-1].states
+        self._state_index[name] = (state, tuple(parents))
+        self._registered_states[id(state)] = state
+        for key in (state, state.value) if isinstance(state.value, Enum) else (state,):
+            try:
+                # a state (or enum) which is referenced in multiple locations must be searched
+                known = self._state_paths.get(key, path)
+                self._state_paths[key] = path if known == path else None
+            except TypeError:  # unhashable state
+                pass
+
     def _check_event_result(self, res, model, trigger):
         if res is None:
             state_names = getattr(model, self.model_attribute)
@@ -1130,8 +1530,16 @@ class HierarchicalMachine(Machine):
         """
         return self.trigger_event(model, trigger_name, *args, **kwargs)
 
+    def _collect_state_memory_usage(self, report, state):
+        super(HierarchicalMachine, self)._collect_state_memory_usage(report, state)
+        # transitions of substates are stored in the events of their parent state
+        for event in state.events.values():
+            self._collect_event_memory_usage(report, event)
+        for child in state.states.values():
+            self._collect_state_memory_usage(report, child)
+
     def _has_state(self, state, raise_error=False):
-        """This function
+        """Checks whether a state object has been added to the machine or one of its nested states.
         Args:
             state (NestedState): state to be tested
             raise_error (bool): whether ValueError should be raised when the state
@@ -1141,29 +1549,41 @@ class HierarchicalMachine(Machine):
         Raises:
             ValueError: When raise_error is True and state is not registered
         """
+        if id(state) in self._registered_states:
+            return True
+        # states added to a NestedState directly are not registered
         found = super(HierarchicalMachine, self)._has_state(state)
         if not found:
-            for a_state in self.states:
-                with self(a_state):
-                    if self._has_state(state):
-                        return True
+            substates = [a_state.states for a_state in self.states.values()]
+            while substates:
+                states = substates.pop()
+                if state in states.values():
+                    return True
+                substates.extend(a_state.states for a_state in states.values())
         if not found and raise_error:
             msg = 'State %s has not been added to the machine' % (state.name if hasattr(state, 'name') else state)
             raise ValueError(msg)
         return found
 
     def _init_state(self, state):
+        self._nested_cache.clear()
+        self._index_state(state)
         for model in self.models:
             self._add_model_to_state(state, model)
         if self.auto_transitions:
             state_name = self.get_global_name(state.name)
             parent = state_name.split(self.state_cls.separator, 1)
             with self():
-                for a_state in self.get_nested_state_names():
-                    if a_state == parent[0]:
+                if len(parent) > 1:
+                    # nested states can be reached from all root states
+                    if parent[0] in self.states:
                         self.add_transition('to_%s' % state_name, self.wildcard_all, state_name)
-                    elif len(parent) == 1:
-                        self.add_transition('to_%s' % a_state, state_name, a_state)
+                else:
+                    for a_state in self.get_nested_state_names():
+                        if a_state == parent[0]:
+                            self.add_transition('to_%s' % state_name, self.wildcard_all, state_name)
+                        else:
+                            self.add_transition('to_%s' % a_state, state_name, a_state)
         with self(state.name):
             for substate in self.states.values():
                 self._init_state(substate)
@@ -1189,12 +1609,16 @@ class HierarchicalMachine(Machine):
     def _remap_state(self, state, remap):
         drop_event = []
         remapped_transitions = []
+        # every embedding gets its own events and transitions which can be altered without affecting the
+        # original machine; only Condition objects and callables are shared
         for evt in self.events.values():
             self.events[evt.name] = copy.copy(evt)
         for trigger, event in self.events.items():
             drop_source = []
-            event.transitions = copy.deepcopy(event.transitions)
+            event.transitions = copy.copy(event.transitions)
             for source_name, trans_source in event.transitions.items():
+                trans_source = event.transitions[source_name] = [self._copy_transition(trans)
+                                                                 for trans in trans_source]
                 if source_name in remap:
                     drop_source.append(source_name)
                     continue
@@ -1225,8 +1649,18 @@ class HierarchicalMachine(Machine):
                 drop_event.append(trigger)
         for d_event in drop_event:
             del self.events[d_event]
+        self._nested_cache.clear()
         return remapped_transitions
 
+    @staticmethod
+    def _copy_transition(transition):
+        # a shallow copy with its own callback and condition lists is sufficient and faster than a deep copy
+        res = copy.copy(transition)
+        for method in transition.dynamic_methods:
+            setattr(res, method, list(getattr(transition, method)))
+        res.conditions = list(transition.conditions)
+        return res
+
     def _resolve_initial(self, models, state_name_path, prefix=None):
         prefix = prefix or []
         if state_name_path:
@@ -1247,21 +1681,96 @@ class HierarchicalMachine(Machine):
         a_state = self.get_state(state_name)
         return a_state.value if isinstance(a_state.value, Enum) else state_name
 
+    def _trigger_regions(self, event_data, trigger, state_tree):
+        """Processes an event in all regions (substates with active children) of the current scope concurrently
+        with `region_executor`. Every region works on a copy of the event data. The event data of regions
+        which processed the event are merged back in the order of the regions.
+        Args:
+            event_data (NestedEventData): The currently processed event.
+            trigger (str): The name of the event.
+            state_tree (OrderedDict): The state tree of the current scope.
+        Returns:
+            dict: The results of the regions or None if there is only one region to process.
+        """
+        keys = [key for key, value in state_tree.items() if value]
+        if len(keys) < 2:
+            return None
+        lock = _REGION_LOCK.get() or threading.Lock()
+        region_data = [copy.copy(event_data) for _ in keys]
+        futures = [self.region_executor.submit(copy_context().run, self._trigger_region, data, trigger, key,
+                                               state_tree[key], lock)
+                   for key, data in zip(keys, region_data)]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except BaseException as err:  # pylint: disable=broad-except; raised after all regions are done
+                results.append(err)
+        return self._merge_regions(event_data, keys, region_data, results)
+
+    def _trigger_region(self, event_data, trigger, key, state_tree, lock):
+        _REGION_LOCK.set(lock)
+        _REGION_WORKER.set(True)
+        with self(key):
+            return self._trigger_event_nested(event_data, trigger, state_tree)
+
+    @staticmethod
+    def _merge_regions(event_data, keys, region_data, results):
+        for data, result in zip(region_data, results):
+            if isinstance(result, BaseException):
+                raise result
+            if result is not None:
+                event_data.__dict__.update(data.__dict__)
+        return dict(zip(keys, results))
+
     def _trigger_event_nested(self, event_data, trigger, _state_tree):
-        model = event_data.model
         if _state_tree is None:
-            _state_tree = self.build_state_tree(listify(getattr(model, self.model_attribute)),
-                                                self.state_cls.separator)
-        res = {}
-        for key, value in _state_tree.items():
-            if value:
-                with self(key):
-                    tmp = self._trigger_event_nested(event_data, trigger, value)
+            _state_tree, _ = self._get_state_tree(getattr(event_data.model, self.model_attribute))
+        outer = _CURRENT_SCOPE.get()
+        # substates are processed before their parents; every frame contains the scope, the remaining items
+        # of its state tree, the results per substate, the results of concurrently processed regions
+        # and the substate which is currently processed
+        stack = [[self._get_current_scope() or self._get_root_scope(), iter(_state_tree.items()), {},
+                  self._trigger_fan_out(event_data, trigger, _state_tree), None]]
+        try:
+            while True:
+                frame = stack[-1]
+                scope, items, res, regions, key = frame
+                if key is None:
+                    item = next(items, None)
+                    if item is None:
+                        stack.pop()
+                        value = None if not res or all(v is None for v in res.values()) else any(res.values())
+                        if not stack:
+                            return value
+                        _CURRENT_SCOPE.set(_CURRENT_SCOPE.get()[1])
+                        frame = stack[-1]
+                        scope, _, res, _, key = frame
+                        if value is not None:
+                            res[key] = value
+                    else:
+                        key, value = item
+                        frame[4] = key
+                        if value:
+                            if regions is None:
+                                child = scope.child(key)
+                                _CURRENT_SCOPE.set((child, _CURRENT_SCOPE.get()))
+                                stack.append([child, iter(value.items()), {},
+                                              self._trigger_fan_out(event_data, trigger, value), None])
+                                continue
+                            if regions[key] is not None:
+                                res[key] = regions[key]
+                frame[4] = None
+                if res.get(key, False) is False and trigger in scope.events:
+                    event_data.event = scope.events[trigger]
+                    tmp = event_data.event.trigger_nested(event_data)
                     if tmp is not None:
                         res[key] = tmp
-            if res.get(key, False) is False and trigger in self.events:
-                event_data.event = self.events[trigger]
-                tmp = event_data.event.trigger_nested(event_data)
-                if tmp is not None:
-                    res[key] = tmp
-        return None if not res or all(v is None for v in res.values()) else any(res.values())
+        finally:
+            _CURRENT_SCOPE.set(outer)
+
+    def _trigger_fan_out(self, event_data, trigger, state_tree):
+        # returns the results of concurrently processed regions of the current scope or None
+        if self.region_executor is None or _REGION_WORKER.get():
+            return None
+        return self._trigger_regions(event_data, trigger, state_tree)
@@ -1,17 +1,27 @@
-from ..core import CallbackFunc, Event, EventData, Machine, State, Transition, CallbacksArg, Callback, ModelParameter, TransitionConfig
+from ..core import CallbackFunc, Event, EventData, Machine, State, Transition, CallbacksArg, Callback, ModelParameter, TransitionConfig, \
+    MemoryReport
 from collections import defaultdict as defaultdict
-from typing import OrderedDict, Sequence, Union, List, Dict, Optional, Type, Tuple, Callable, Any, Collection
+from typing import OrderedDict, Sequence, Union, List, Dict, Optional, Type, Tuple, Callable, Any, Collection, \
+    ContextManager
 from types import TracebackType
+from contextvars import ContextVar, Token
 from logging import Logger
 from enum import Enum
 from functools import partial
+from concurrent.futures import Executor
+from threading import Lock
+from .locking import PicklableLock
 
 _LOGGER: Logger
 
 class FunctionWrapper:
     _func: Optional[CallbackFunc]
-    def __init__(self, func: CallbackFunc, path: List[str]) -> None: ...
+    _resolve: Optional[Callable[[List[str]], Optional[CallbackFunc]]]
+    _path: List[str]
+    def __init__(self, func: CallbackFunc, resolve: Optional[Callable[[List[str]], Optional[CallbackFunc]]] = ...,
+                 path: Optional[List[str]] = ...) -> None: ...
     def add(self, func: CallbackFunc, path: List[str]) -> None: ...
+    def __getattr__(self, name: str) -> FunctionWrapper: ...
     def __call__(self, *args: Any, **kwargs: Any) -> Any: ...
 
 
@@ -34,7 +44,6 @@ class NestedState(State):
     initial: Optional[str]
     events: Dict[str, NestedEvent]
     states: OrderedDict[str, NestedState]
-    _scope: List[str]
     def __init__(self, name: Union[str, Enum], on_enter: CallbacksArg = ..., on_exit: CallbacksArg = ...,
                  ignore_invalid_triggers: bool = ..., final: bool = ..., initial: Optional[str] = ...,
                  on_final: CallbacksArg = ...) -> None: ...
@@ -42,6 +51,7 @@ class NestedState(State):
     def add_substates(self, states: List[NestedState]) -> None: ...
     def scoped_enter(self, event_data: NestedEventData, scope: List[str]=...) -> None: ...
     def scoped_exit(self, event_data: NestedEventData, scope: List[str]=...) -> None: ...
+    def _set_scope(self, scope: Optional[List[str]]) -> Token[Optional[Tuple[NestedState, str, Any]]]: ...
     @property
     def name(self) -> str: ...
 
@@ -49,34 +59,69 @@ NestedStateIdentifier = Union[str, Enum, NestedState, Sequence[Union[str, Enum,
 NestedStateConfig =  Union[NestedStateIdentifier, Dict[str, Any], Collection[str], 'HierarchicalMachine']
 # mypy does not support cyclic definitions, use Any instead of `StateTree`
 StateTree = OrderedDict[str, Any]
+# resulting state tree, states to exit and states to enter with their scope
+TransitionPlan = Tuple[StateTree, List[Tuple[NestedState, List[str]]], List[Tuple[NestedState, List[str]]]]
 
 def _build_state_list(state_tree: StateTree, separator: str,
                       prefix: Optional[List[str]] = ...) -> Union[str, List[str]]: ...
+def _freeze_state_value(value: Any) -> Any: ...
+def _lru_get(cache: OrderedDict[Any, Any], key: Any, lock: ContextManager[Any]) -> Any: ...
+def _lru_put(cache: OrderedDict[Any, Any], key: Any, value: Any, maxsize: int, lock: ContextManager[Any]) -> None: ...
 def resolve_order(state_tree: Dict[str, str]) -> List[List[str]]: ...
 
 class NestedTransition(Transition):
     def _resolve_transition(self, event_data: NestedEventData) -> Tuple[StateTree, List[Callable[[], None]], List[Callable[[], Any]]]: ...
     def _change_state(self, event_data: NestedEventData) -> None: ...  # type: ignore[override]
+    def _change_nested_state(self, event_data: NestedEventData) -> None: ...
+    def _plan_transition(self, machine: HierarchicalMachine, model_states: List[Any],
+                         scope: List[str]) -> TransitionPlan: ...
     def _enter_nested(self, root: List[str], dest: List[str], prefix_path: List[str],
-                      event_data: NestedEventData) -> Tuple[StateTree, List[Callable[[], None]]]: ...
+                      machine: HierarchicalMachine) -> Tuple[StateTree, List[Tuple[NestedState, List[str]]]]: ...
     @staticmethod
     def _update_model(event_data: NestedEventData, tree: StateTree) -> None: ...
     def __deepcopy__(self, memo: Dict[str, Any]) -> NestedTransition: ...
 
-ScopeTuple = Tuple[Union[NestedState, 'HierarchicalMachine'], OrderedDict[str, NestedState],
-                   Dict[str, NestedEvent], List[str]]
+_CURRENT_SCOPE: ContextVar[Optional[Tuple[NestedScope, Any]]]
+_REGION_LOCK: ContextVar[Any]
+_REGION_WORKER: ContextVar[bool]
+_STATE_SCOPE: ContextVar[Optional[Tuple[NestedState, str, Any]]]
+
+def _region_lock() -> ContextManager[None]: ...
+
+class NestedScope:
+    machine: HierarchicalMachine
+    scoped: Union[NestedState, HierarchicalMachine]
+    states: OrderedDict[str, NestedState]
+    events: Dict[str, NestedEvent]
+    prefix_path: List[str]
+    name: str
+    _children: Dict[Union[str, Enum], NestedScope]
+    def __init__(self, machine: HierarchicalMachine, scoped: Union[NestedState, HierarchicalMachine],
+                 states: OrderedDict[str, NestedState], events: Dict[str, NestedEvent],
+                 prefix_path: List[str]) -> None: ...
+    def child(self, name: Union[str, Enum]) -> NestedScope: ...
+    def __enter__(self) -> None: ...
+    def __exit__(self, exc_type: Optional[Type[BaseException]], exc_val: Optional[BaseException],
+                 exc_tb: Optional[TracebackType]) -> None: ...
 
 class HierarchicalMachine(Machine):
     state_cls: Type[NestedState]
     transition_cls: Type[NestedTransition]
     event_cls: Type[NestedEvent]
-    # mypy does not approve State being overridden with NestedState and Event with NestedEvent
-    states: OrderedDict[str, NestedState]  # type: ignore
-    events: Dict[str, NestedEvent]  # type:ignore
-    _stack: List[ScopeTuple]
+    state_tree_cache_size: int
+    transition_plan_cache_size: int
+    region_executor: Optional[Executor]
+    _states: OrderedDict[str, NestedState]
+    _events: Dict[str, NestedEvent]
+    _root_scope: Optional[NestedScope]
+    _state_index: Dict[str, Tuple[NestedState, Tuple[NestedState, ...]]]
+    _state_paths: Dict[Union[NestedState, Enum], Optional[List[str]]]
+    _registered_states: Dict[int, NestedState]
+    _nested_cache: Dict[Tuple[Any, ...], Tuple[Any, ...]]
+    _state_tree_cache: OrderedDict[Tuple[Any, Tuple[str, ...]], Tuple[StateTree, Tuple[Tuple[str, ...], ...]]]
+    _transition_plan_cache: OrderedDict[Tuple[Optional[str], Any, Tuple[str, ...]], TransitionPlan]
+    _cache_lock: PicklableLock
     _initial: Optional[str]
-    prefix_path: List[str]
-    scoped: Union[NestedState, HierarchicalMachine]
     def __init__(self, model: Optional[ModelParameter]=...,
                  states: Optional[Union[Sequence[NestedStateConfig], Type[Enum]]] = ...,
                  initial: Optional[NestedStateIdentifier] = ...,
@@ -87,11 +132,22 @@ class HierarchicalMachine(Machine):
                  name: str = ..., queued: Union[bool, str] = ...,
                  prepare_event: CallbacksArg = ..., finalize_event: CallbacksArg = ...,
                  model_attribute: str = ..., on_exception: CallbacksArg = ..., **kwargs: Any) -> None: ...
-    _next_scope: Optional[ScopeTuple]
-    def __call__(self, to_scope: Optional[Union[ScopeTuple, str, Enum]] = ...) -> HierarchicalMachine: ...
-    def __enter__(self) -> None: ...
-    def __exit__(self, exc_type: Optional[Type[BaseException]], exc_val: Optional[BaseException],
-                 exc_tb: Optional[TracebackType]) -> None: ...
+    def __call__(self, to_scope: Optional[Union[NestedScope, str, Enum]] = ...) -> NestedScope: ...
+    def _get_root_scope(self) -> NestedScope: ...
+    def _get_current_scope(self) -> Optional[NestedScope]: ...
+    @property
+    def scoped(self) -> Union[NestedState, HierarchicalMachine]: ...
+    # mypy does not approve State being overridden with NestedState and Event with NestedEvent
+    @property  # type: ignore[override]
+    def states(self) -> OrderedDict[str, NestedState]: ...
+    @states.setter
+    def states(self, value: OrderedDict[str, NestedState]) -> None: ...
+    @property  # type: ignore[override]
+    def events(self) -> Dict[str, NestedEvent]: ...
+    @events.setter
+    def events(self, value: Dict[str, NestedEvent]) -> None: ...
+    @property
+    def prefix_path(self) -> List[str]: ...
     def add_model(self, model: ModelParameter, initial: Optional[NestedStateIdentifier] = ...) -> None: ...  # type: ignore[override]
     @property
     def initial(self) -> Optional[str]: ...
@@ -115,6 +171,9 @@ class HierarchicalMachine(Machine):
     def get_nested_transitions(self, trigger: str = ..., src_path: Optional[List[str]] = ...,
                                dest_path: Optional[List[str]] = ...) -> List[NestedTransition]: ...
     def get_nested_triggers(self, src_path: Optional[List[str]] = ...) -> List[str]: ...
+    def _get_nested_transitions(self, trigger: str, src_path: Optional[List[str]],
+                                dest_path: Optional[List[str]]) -> List[NestedTransition]: ...
+    def _get_nested_triggers(self, src_path: Optional[List[str]]) -> List[str]: ...
     def get_state(self, state: Union[str, Enum, List[str]], hint: Optional[List[str]] = ...) -> NestedState: ...
     def get_states(self, states: Union[str, Enum, List[Union[str, Enum]]]) -> List[NestedState]: ...
     def get_transitions(self, trigger: str = ..., source: NestedStateIdentifier = ...,  # type: ignore[override]
@@ -138,8 +197,12 @@ class HierarchicalMachine(Machine):
                           ignore_invalid_triggers: bool, remap: Optional[Dict[str, str]],
                           **kwargs: Any) -> None: ...
     def _add_trigger_to_model(self, trigger: str, model: object) -> None: ...
+    def _resolve_to_state(self, model: object, path: List[str]) -> Optional[CallbackFunc]: ...
+    def _resolve_is_state(self, model: object, path: List[str]) -> Optional[CallbackFunc]: ...
     def build_state_tree(self, model_states: Union[str, Enum, Sequence[Union[str, Enum, Sequence[Any]]]],
                          separator: str, tree: Optional[StateTree] = ...) -> StateTree: ...
+    def _get_state_tree(self, model_states: Union[str, Enum, Sequence[Union[str, Enum, Sequence[Any]]]],
+                        scope: Optional[List[str]] = ...) -> Tuple[StateTree, Tuple[Tuple[str, ...], ...]]: ...
     @classmethod
     def _create_transition(cls, *args: Any, **kwargs: Any) -> NestedTransition: ...
     @classmethod
@@ -148,13 +211,27 @@ class HierarchicalMachine(Machine):
     def _create_state(cls, *args: Any, **kwargs: Any) -> NestedState: ...
     def _get_enum_path(self, enum_state: Enum, prefix: Optional[List[str]] =...) -> List[str]: ...
     def _get_state_path(self, state: NestedState, prefix: Optional[List[str]] = ...) -> List[str]: ...
+    def _get_indexed_path(self, key: Union[NestedState, Enum]) -> Optional[List[str]]: ...
+    def _index_state(self, state: NestedState) -> None: ...
     def _check_event_result(self, res: bool, model: object, trigger: str) -> bool: ...
     def _get_trigger(self, model: object, trigger_name: str, *args: Any, **kwargs: Any) -> bool: ...
+    def _collect_state_memory_usage(self, report: MemoryReport, state: NestedState) -> None: ...  # type: ignore[override]
     def _has_state(self, state: NestedState, raise_error: bool = ...) -> bool: ...  # type: ignore[override]
     def _init_state(self, state: NestedState) -> None: ...
     def _recursive_initial(self, value: NestedStateIdentifier) -> Union[str, List[str]]: ...
     def _remap_state(self, state: NestedState, remap: Dict[str, str]) -> List[NestedTransition]: ...
+    @staticmethod
+    def _copy_transition(transition: NestedTransition) -> NestedTransition: ...
     def _resolve_initial(self, models: List[object], state_name_path: List[str],
                          prefix: Optional[List[str]] = ...) -> str: ...
     def _set_state(self, state_name: Union[str, List[str]]) -> Union[str, Enum, List[Union[str, Enum]]]: ...
     def _trigger_event(self, event_data: NestedEventData, trigger: str) -> Optional[bool]: ...
+    def _trigger_fan_out(self, event_data: NestedEventData, trigger: str,
+                         state_tree: StateTree) -> Optional[Dict[str, Optional[bool]]]: ...
+    def _trigger_regions(self, event_data: NestedEventData, trigger: str,
+                         state_tree: StateTree) -> Optional[Dict[str, Optional[bool]]]: ...
+    def _trigger_region(self, event_data: NestedEventData, trigger: str, key: str, state_tree: StateTree,
+                        lock: Lock) -> Optional[bool]: ...
+    @staticmethod
+    def _merge_regions(event_data: NestedEventData, keys: List[str], region_data: Sequence[NestedEventData],
+                       results: Sequence[Union[Optional[bool], BaseException]]) -> Dict[str, Optional[bool]]: ...
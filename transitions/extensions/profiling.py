@@ -0,0 +1,251 @@
+"""
+    transitions.extensions.profiling
+    --------------------------------
+
+    This module contains a callback profiler and machine mixins which hook it into `Machine.callback`.
+    Every callback passed through a profiled machine is timed and attributed to an identifier which is
+    either the string name of the callback or the qualified name of the passed callable. Nested callbacks
+    (e.g. a callback triggering another event) are considered when calculating a callback's self time.
+"""
+
+import contextvars
+import logging
+from functools import partial
+from threading import Lock
+from time import perf_counter
+
+from ..core import Machine
+
+_LOGGER = logging.getLogger(__name__)
+_LOGGER.addHandler(logging.NullHandler())
+
+# default of ProfiledMachine's profiler argument which creates a new profiler since None disables profiling
+_NEW_PROFILER = object()
+
+
+class CallbackStats(object):
+    """Aggregated measurements of a single callback identifier.
+
+    Attributes:
+        name (str): The identifier of the callback.
+        calls (int): How often the callback has been executed.
+        exceptions (int): How often the callback has raised an exception.
+        cumulative_time (float): Time spent in the callback including nested callbacks in seconds.
+        self_time (float): Time spent in the callback excluding nested profiled callbacks in seconds.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.exceptions = 0
+        self.cumulative_time = 0.0
+        self.self_time = 0.0
+
+    @property
+    def mean_time(self):
+        """The average cumulative time of a callback invocation."""
+        return self.cumulative_time / self.calls if self.calls else 0.0
+
+    def __repr__(self):
+        return "<%s('%s', calls=%d, cumulative=%.6f, self=%.6f)@%s>" % (type(self).__name__, self.name, self.calls,
+                                                                        self.cumulative_time, self.self_time, id(self))
+
+
+class _ProfileFrame(object):
+    """Keeps track of the time consumed by nested callbacks of a currently executed callback."""
+
+    __slots__ = ('child_time',)
+
+    def __init__(self):
+        self.child_time = 0.0
+
+
+class _Measurement(object):
+    """Context manager which measures a single callback execution and reports it to the profiler."""
+
+    __slots__ = ('profiler', 'name', 'frame', 'token', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.frame = _ProfileFrame()
+        self.token = None
+        self.start = 0.0
+
+    def __enter__(self):
+        self.token = self.profiler.current_frame.set(self.frame)
+        self.start = self.profiler.timer()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        elapsed = self.profiler.timer() - self.start
+        self.profiler.current_frame.reset(self.token)
+        parent = self.profiler.current_frame.get()
+        if parent is not None:
+            parent.child_time += elapsed
+        # concurrently executed children (e.g. AsyncMachine.callbacks) may exceed the parent's wall time
+        self.profiler.add(self.name, elapsed, max(elapsed - self.frame.child_time, 0.0), exc_type is not None)
+
+
+class CallbackProfiler(object):
+    """Collects execution times, call counts and exceptions of callbacks.
+        Measurements are tracked per context (thread or asyncio task) to attribute nested callbacks
+        to their respective parent. A profiler can be shared by several machines.
+
+    Attributes:
+        stats (dict): Maps callback identifiers to `CallbackStats`.
+        timer (callable): Clock function used for measurements. Defaults to `time.perf_counter`.
+        current_frame (ContextVar): The frame of the currently measured callback in the active context.
+    """
+
+    def __init__(self, timer=None):
+        """
+        Args:
+            timer (callable): Optional clock function returning seconds as float.
+        """
+        self.timer = timer or perf_counter
+        self.stats = {}
+        self._lock = Lock()
+        self.current_frame = contextvars.ContextVar('current_frame_%s' % id(self), default=None)
+
+    @staticmethod
+    def identify(func):
+        """Returns the identifier used to aggregate measurements of a callback.
+        Args:
+            func (str or callable): The callback as passed to the machine.
+        Returns:
+            str: The string itself or the qualified name of the callable.
+        """
+        if isinstance(func, str):
+            return func
+        while isinstance(func, partial):
+            func = func.func
+        name = getattr(func, '__qualname__', None) or getattr(func, '__name__', None)
+        if name is None:
+            return repr(func)
+        module = getattr(func, '__module__', None)
+        return "%s.%s" % (module, name) if module else name
+
+    def measure(self, func):
+        """Returns a context manager which measures the execution of the passed callback.
+        Args:
+            func (str or callable): The callback to be executed.
+        Returns:
+            context manager which records the measurement when left.
+        """
+        return _Measurement(self, self.identify(func))
+
+    def add(self, name, cumulative_time, self_time, failed=False):
+        """Adds a measurement to the collected statistics.
+        Args:
+            name (str): Callback identifier.
+            cumulative_time (float): Time spent in the callback including nested callbacks.
+            self_time (float): Time spent in the callback excluding nested callbacks.
+            failed (bool): Whether the callback raised an exception.
+        """
+        with self._lock:
+            try:
+                stats = self.stats[name]
+            except KeyError:
+                stats = self.stats[name] = CallbackStats(name)
+            stats.calls += 1
+            stats.cumulative_time += cumulative_time
+            stats.self_time += self_time
+            if failed:
+                stats.exceptions += 1
+
+    def reset(self):
+        """Removes all collected statistics."""
+        with self._lock:
+            self.stats = {}
+
+    def report(self, sort_by='cumulative_time', limit=None):
+        """Returns the collected statistics in descending order.
+        Args:
+            sort_by (str): `CallbackStats` attribute used for sorting.
+            limit (int): If set, return only the first `limit` entries.
+        Returns:
+            list(CallbackStats) of all (or the `limit` most significant) callbacks.
+        """
+        with self._lock:
+            res = sorted(self.stats.values(), key=lambda stats: getattr(stats, sort_by), reverse=True)
+        return res[:limit] if limit is not None else res
+
+    def format_report(self, sort_by='cumulative_time', limit=None):
+        """Renders the result of `report` as a table.
+        Args:
+            sort_by (str): `CallbackStats` attribute used for sorting.
+            limit (int): If set, return only the first `limit` entries.
+        Returns:
+            str: A table with one line per callback identifier.
+        """
+        lines = ["%10s %10s %14s %14s %14s  %s" % ("calls", "exceptions", "cumulative", "self", "mean", "callback")]
+        for stats in self.report(sort_by=sort_by, limit=limit):
+            lines.append("%10d %10d %14.6f %14.6f %14.6f  %s" % (stats.calls, stats.exceptions,
+                                                                 stats.cumulative_time, stats.self_time,
+                                                                 stats.mean_time, stats.name))
+        return "\n".join(lines)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        del state['current_frame']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = Lock()
+        self.current_frame = contextvars.ContextVar('current_frame_%s' % id(self), default=None)
+
+
+class ProfiledMachine(Machine):
+    """Machine mixin which passes every callback through a `CallbackProfiler`.
+        It can be combined with other (synchronous) machine classes such as `HierarchicalMachine`.
+    Attributes:
+        profiler (CallbackProfiler): The profiler collecting measurements. Profiling is disabled when None.
+            A new profiler is created unless a profiler (or None) is passed to the constructor.
+    """
+
+    def __init__(self, model=Machine.self_literal, states=None, initial='initial', transitions=None,
+                 send_event=False, auto_transitions=True,
+                 ordered_transitions=False, ignore_invalid_triggers=None,
+                 before_state_change=None, after_state_change=None, name=None,
+                 queued=False, prepare_event=None, finalize_event=None, model_attribute='state',
+                 model_override=False, on_exception=None, on_final=None, profiler=_NEW_PROFILER, **kwargs):
+        self.profiler = CallbackProfiler() if profiler is _NEW_PROFILER else profiler
+        super(ProfiledMachine, self).__init__(
+            model=model, states=states, initial=initial, transitions=transitions,
+            send_event=send_event, auto_transitions=auto_transitions,
+            ordered_transitions=ordered_transitions, ignore_invalid_triggers=ignore_invalid_triggers,
+            before_state_change=before_state_change, after_state_change=after_state_change, name=name,
+            queued=queued, prepare_event=prepare_event, finalize_event=finalize_event,
+            model_attribute=model_attribute, model_override=model_override, on_exception=on_exception,
+            on_final=on_final, **kwargs
+        )
+
+    def callback(self, func, event_data):
+        """Extends `transitions.core.Machine.callback` by measuring the callback's execution."""
+        if self.profiler is None:
+            return super(ProfiledMachine, self).callback(func, event_data)
+        with self.profiler.measure(func):
+            return super(ProfiledMachine, self).callback(func, event_data)
+
+
+try:
+    from .asyncio import AsyncMachine
+
+    class AsyncProfiledMachine(ProfiledMachine, AsyncMachine):
+        """Machine mixin which passes every callback of an `AsyncMachine` through a `CallbackProfiler`.
+            Callbacks executed concurrently are measured individually since every asyncio task keeps
+            track of its own nested callbacks.
+        """
+
+        async def callback(self, func, event_data):
+            """Extends `transitions.extensions.asyncio.AsyncMachine.callback` by measuring the callback's
+                execution including the time it takes to await its result."""
+            if self.profiler is None:
+                return await super(ProfiledMachine, self).callback(func, event_data)
+            with self.profiler.measure(func):
+                return await super(ProfiledMachine, self).callback(func, event_data)
+
+except (ImportError, SyntaxError):  # pragma: no cover
+    pass
@@ -0,0 +1,86 @@
+from contextvars import ContextVar, Token
+from logging import Logger
+from threading import Lock
+from types import TracebackType
+from typing import Any, Callable, Dict, List, Literal, Optional, Sequence, Type, Union
+from enum import Enum
+
+from ..core import Callback, CallbacksArg, EventData, Machine, ModelParameter, StateConfig, StateIdentifier, \
+    TransitionConfig
+from .asyncio import AsyncMachine, AsyncEventData, AsyncCallback, AsyncCallbacksArg, AsyncTransitionConfig
+
+_LOGGER: Logger
+_NEW_PROFILER: object
+
+class CallbackStats:
+    name: str
+    calls: int
+    exceptions: int
+    cumulative_time: float
+    self_time: float
+    def __init__(self, name: str) -> None: ...
+    @property
+    def mean_time(self) -> float: ...
+    def __repr__(self) -> str: ...
+
+class _ProfileFrame:
+    child_time: float
+    def __init__(self) -> None: ...
+
+class _Measurement:
+    profiler: CallbackProfiler
+    name: str
+    frame: _ProfileFrame
+    token: Optional[Token[Optional[_ProfileFrame]]]
+    start: float
+    def __init__(self, profiler: CallbackProfiler, name: str) -> None: ...
+    def __enter__(self) -> None: ...
+    def __exit__(self, exc_type: Optional[Type[BaseException]], exc_val: Optional[BaseException],
+                 exc_tb: Optional[TracebackType]) -> None: ...
+
+class CallbackProfiler:
+    timer: Callable[[], float]
+    stats: Dict[str, CallbackStats]
+    _lock: Lock
+    current_frame: ContextVar[Optional[_ProfileFrame]]
+    def __init__(self, timer: Optional[Callable[[], float]] = ...) -> None: ...
+    @staticmethod
+    def identify(func: Union[Callback, AsyncCallback]) -> str: ...
+    def measure(self, func: Union[Callback, AsyncCallback]) -> _Measurement: ...
+    def add(self, name: str, cumulative_time: float, self_time: float, failed: bool = ...) -> None: ...
+    def reset(self) -> None: ...
+    def report(self, sort_by: str = ..., limit: Optional[int] = ...) -> List[CallbackStats]: ...
+    def format_report(self, sort_by: str = ..., limit: Optional[int] = ...) -> str: ...
+    def __getstate__(self) -> Dict[str, Any]: ...
+    def __setstate__(self, state: Dict[str, Any]) -> None: ...
+
+class ProfiledMachine(Machine):
+    profiler: Optional[CallbackProfiler]
+    def __init__(self, model: Optional[ModelParameter] = ...,
+                 states: Optional[Union[Sequence[StateConfig], Type[Enum]]] = ...,
+                 initial: Optional[StateIdentifier] = ...,
+                 transitions: Optional[Union[TransitionConfig, Sequence[TransitionConfig]]] = ...,
+                 send_event: bool = ..., auto_transitions: bool = ..., ordered_transitions: bool = ...,
+                 ignore_invalid_triggers: Optional[bool] = ...,
+                 before_state_change: CallbacksArg = ..., after_state_change: CallbacksArg = ...,
+                 name: str = ..., queued: bool = ...,
+                 prepare_event: CallbacksArg = ..., finalize_event: CallbacksArg = ...,
+                 model_attribute: str = ..., model_override: bool = ..., on_exception: CallbacksArg = ...,
+                 on_final: CallbacksArg = ..., profiler: Optional[CallbackProfiler] = ...,
+                 **kwargs: Any) -> None: ...
+    def callback(self, func: Callback, event_data: EventData) -> None: ...
+
+class AsyncProfiledMachine(ProfiledMachine, AsyncMachine):
+    def __init__(self, model: Optional[ModelParameter] = ...,
+                 states: Optional[Union[Sequence[StateConfig], Type[Enum]]] = ...,
+                 initial: Optional[StateIdentifier] = ...,
+                 transitions: Optional[Sequence[AsyncTransitionConfig]] = ...,
+                 send_event: bool = ..., auto_transitions: bool = ..., ordered_transitions: bool = ...,
+                 ignore_invalid_triggers: Optional[bool] = ...,
+                 before_state_change: AsyncCallbacksArg = ..., after_state_change: AsyncCallbacksArg = ...,
+                 name: str = ..., queued: Union[bool, Literal["model"]] = ...,
+                 prepare_event: AsyncCallbacksArg = ..., finalize_event: AsyncCallbacksArg = ...,
+                 model_attribute: str = ..., model_override: bool = ..., on_exception: AsyncCallbacksArg = ...,
+                 on_final: AsyncCallbacksArg = ..., profiler: Optional[CallbackProfiler] = ...,
+                 **kwargs: Any) -> None: ...
+    async def callback(self, func: AsyncCallback, event_data: AsyncEventData) -> None: ...  # type: ignore[override]
@@ -6,7 +6,11 @@
 """
 
 from collections import Counter
-from threading import Timer
+from concurrent.futures import ThreadPoolExecutor
+from threading import Condition, Thread
+from time import monotonic
+import heapq
+import itertools
 import logging
 import inspect
 
@@ -65,12 +69,19 @@ class Error(Tags):
 
 class Timeout(State):
     """Adds timeout functionality to a state. Timeouts are handled model-specific.
+        All timeouts are scheduled with a single scheduler thread. Due timeouts are processed by a small
+        thread pool shared by all Timeout states unless `timeout_executor` is set.
     Attributes:
         timeout (float): Seconds after which a timeout function should be called.
         on_timeout (list): Functions to call when a timeout is triggered.
+        runner (dict): Scheduled timeouts of models which have entered the state. Scheduled timeouts can be
+            cancelled but are no `threading.Timer` objects.
+        timeout_executor (concurrent.futures.Executor): If set, due timeouts are submitted to this executor
+            instead of the default thread pool.
     """
 
     dynamic_methods = ['on_timeout']
+    timeout_executor = None
 
     def __init__(self, *args, **kwargs):
         """
@@ -96,19 +107,24 @@ class Timeout(State):
             when the state is entered and self.timeout is larger than 0.
         """
         if self.timeout > 0:
-            timer = Timer(self.timeout, self._process_timeout, args=(event_data,))
-            timer.daemon = True
-            timer.start()
-            self.runner[id(event_data.model)] = timer
+            self.runner[id(event_data.model)] = _SCHEDULER.schedule(self.timeout, self._timeout_due, event_data,
+                                                                    executor=self.timeout_executor)
         return super(Timeout, self).enter(event_data)
 
     def exit(self, event_data):
         """Extends `transitions.core.State.exit` by canceling a timer for the current model."""
-        timer = self.runner.get(id(event_data.model), None)
-        if timer is not None and timer.is_alive():
+        timer = self.runner.pop(id(event_data.model), None)
+        if timer is not None:
             timer.cancel()
         return super(Timeout, self).exit(event_data)
 
+    def _timeout_due(self, event_data):
+        # remove the timer unless the model has entered the state again in the meantime
+        timer = self.runner.get(id(event_data.model), None)
+        if timer is not None and not timer.is_alive():
+            self.runner.pop(id(event_data.model), None)
+        self._process_timeout(event_data)
+
     def _process_timeout(self, event_data):
         _LOGGER.debug("%sTimeout state %s. Processing callbacks...", event_data.machine.name, self.name)
         for callback in self.on_timeout:
@@ -126,6 +142,115 @@ class Timeout(State):
         self._on_timeout = listify(value)
 
 
+class _ScheduledTimeout(object):
+    """A timeout scheduled by `_TimeoutScheduler`. Cancelling a timeout only marks it as cancelled."""
+
+    __slots__ = ('deadline', 'func', 'args', 'executor', 'scheduler')
+
+    def __init__(self, deadline, func, args, executor, scheduler):
+        self.deadline = deadline
+        self.func = func
+        self.args = args
+        self.executor = executor
+        self.scheduler = scheduler
+
+    def cancel(self):
+        """Cancels the timeout if it is not due yet."""
+        self.scheduler.cancel(self)
+
+    def is_alive(self):
+        """Returns True if the timeout has been neither processed nor cancelled."""
+        return self.func is not None
+
+
+class _TimeoutScheduler(object):
+    """Keeps track of timeouts in a single daemon thread. Timeouts are kept in a heap ordered by their deadline.
+        Cancelled timeouts remain in the heap until they are due or until more than half of the heap consists
+        of cancelled timeouts. The thread ends when there are no timeouts left and is started again when a
+        timeout is scheduled. Due timeouts are submitted to their executor or to a thread pool with at most
+        `max_workers` threads which is created when it is needed for the first time. Thus, long running
+        timeout callbacks do not delay other timeouts.
+    Attributes:
+        pending (int): Number of scheduled timeouts which have been neither processed nor cancelled.
+        max_workers (int): Number of threads of the default thread pool.
+    """
+
+    max_workers = 4
+
+    def __init__(self):
+        self.pending = 0
+        self._heap = []
+        self._counter = itertools.count()
+        self._condition = Condition()
+        self._thread = None
+        self._executor = None
+
+    def schedule(self, delay, func, *args, **kwargs):
+        """Schedules `func` to be called with `args` after `delay` seconds. If `executor` is passed,
+            `func` will be submitted to the executor instead of the default thread pool.
+        Returns:
+            _ScheduledTimeout: The scheduled timeout which can be cancelled.
+        """
+        timeout = _ScheduledTimeout(monotonic() + delay, func, args, kwargs.get('executor'), self)
+        with self._condition:
+            heapq.heappush(self._heap, (timeout.deadline, next(self._counter), timeout))
+            self.pending += 1
+            if self._thread is None:
+                self._thread = Thread(target=self._run, name='transitions-timeouts')
+                self._thread.daemon = True
+                self._thread.start()
+            elif self._heap[0][2] is timeout:
+                self._condition.notify()
+        return timeout
+
+    def cancel(self, timeout):
+        """Cancels a scheduled timeout."""
+        with self._condition:
+            if timeout.func is None:
+                return
+            timeout.func = timeout.args = None
+            self.pending -= 1
+            if len(self._heap) > 64 and self.pending < len(self._heap) // 2:
+                self._heap = [item for item in self._heap if item[2].func is not None]
+                heapq.heapify(self._heap)
+
+    def _run(self):
+        with self._condition:
+            while True:
+                while self._heap and self._heap[0][2].func is None:
+                    heapq.heappop(self._heap)
+                if not self._heap:
+                    self._thread = None
+                    return
+                delay = self._heap[0][0] - monotonic()
+                if delay > 0:
+                    self._condition.wait(delay)
+                    continue
+                timeout = heapq.heappop(self._heap)[2]
+                func, args = timeout.func, timeout.args
+                timeout.func = timeout.args = None
+                self.pending -= 1
+                executor = timeout.executor
+                if executor is None:
+                    if self._executor is None:
+                        self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                            thread_name_prefix='transitions-timeouts')
+                    executor = self._executor
+                # the scheduler thread only keeps time; callbacks must not delay other timeouts
+                try:
+                    executor.submit(func, *args).add_done_callback(_log_timeout_error)
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception("Exception raised while submitting timeout!")
+
+
+def _log_timeout_error(future):
+    if not future.cancelled() and future.exception() is not None:
+        _LOGGER.error("Exception raised while processing timeout!", exc_info=future.exception())
+
+
+_SCHEDULER = _TimeoutScheduler()
+
+
 class Volatile(State):
     """Adds scopes/temporal variables to the otherwise persistent state objects.
     Attributes:
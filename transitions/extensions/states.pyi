@@ -2,8 +2,9 @@ from ..core import State, EventData, Callback, CallbacksArg
 
 from enum import Enum
 from logging import Logger
-from threading import Timer
-from typing import List, Union, Any, Dict, Optional, Type
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from threading import Condition, Thread
+from typing import List, Union, Any, Dict, Optional, Type, Callable, Tuple, Iterator
 
 _LOGGER: Logger
 
@@ -18,16 +19,47 @@ class Timeout(State):
     dynamic_methods: List[str]
     timeout: float
     _on_timeout: Optional[List[Callback]]
-    runner: Dict[int, Timer]
+    runner: Dict[int, _ScheduledTimeout]
+    timeout_executor: Optional[Executor]
     def __init__(self, *args: Any, **kwargs: Any) -> None: ...
     def enter(self, event_data: EventData) -> None: ...
     def exit(self, event_data: EventData) -> None: ...
+    def _timeout_due(self, event_data: EventData) -> None: ...
     def _process_timeout(self, event_data: EventData) -> None: ...
     @property
     def on_timeout(self) -> List[Callback]: ...
     @on_timeout.setter
     def on_timeout(self, value: Union[Callback, List[Callback]]) -> None: ...
 
+class _ScheduledTimeout:
+    deadline: float
+    func: Optional[Callable[..., None]]
+    args: Optional[Tuple[Any, ...]]
+    executor: Optional[Executor]
+    scheduler: _TimeoutScheduler
+    def __init__(self, deadline: float, func: Callable[..., None], args: Tuple[Any, ...],
+                 executor: Optional[Executor], scheduler: _TimeoutScheduler) -> None: ...
+    def cancel(self) -> None: ...
+    def is_alive(self) -> bool: ...
+
+class _TimeoutScheduler:
+    pending: int
+    max_workers: int
+    _heap: List[Tuple[float, int, _ScheduledTimeout]]
+    _counter: Iterator[int]
+    _condition: Condition
+    _thread: Optional[Thread]
+    _executor: Optional[ThreadPoolExecutor]
+    def __init__(self) -> None: ...
+    def schedule(self, delay: float, func: Callable[..., None], *args: Any,
+                 executor: Optional[Executor] = ...) -> _ScheduledTimeout: ...
+    def cancel(self, timeout: _ScheduledTimeout) -> None: ...
+    def _run(self) -> None: ...
+
+def _log_timeout_error(future: Future[Any]) -> None: ...
+
+_SCHEDULER: _TimeoutScheduler
+
 class Volatile(State):
     volatile_cls: Any
     volatile_hook: str
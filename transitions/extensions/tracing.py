@@ -0,0 +1,572 @@
+"""
+    transitions.extensions.tracing
+    ------------------------------
+
+    This module contains a sampling tracer and machine, event and transition mixins that open a span for every
+    triggered event. Condition checks, callback phases and state changes are recorded as child spans.
+    Spans can be collected in memory or written to a file as OpenTelemetry (OTLP) JSON lines which allows
+    to correlate state machine latency with other traces without a running collector.
+"""
+
+import contextvars
+import inspect
+import json
+import logging
+import random
+import time
+from threading import Lock
+
+from ..core import Machine, Event, Transition, listify
+from ..version import __version__
+from .nesting import HierarchicalMachine, NestedEvent, NestedTransition
+from .profiling import CallbackProfiler
+
+_LOGGER = logging.getLogger(__name__)
+_LOGGER.addHandler(logging.NullHandler())
+
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+SPAN_KIND_INTERNAL = 1
+
+_NOT_SAMPLED = object()
+# default of TracedMachine's tracer argument which creates a new tracer since None disables tracing
+_NEW_TRACER = object()
+
+
+class Span(object):
+    """A timed operation which is part of a trace.
+
+    Attributes:
+        name (str): Name of the span.
+        trace_id (str): Hex encoded 16 byte identifier of the trace.
+        span_id (str): Hex encoded 8 byte identifier of the span.
+        parent_span_id (str): Identifier of the parent span or None if the span is a root span.
+        start_time (int): Start of the span in nanoseconds since epoch.
+        end_time (int): End of the span in nanoseconds since epoch. None while the span is running.
+        attributes (dict): Additional information about the span.
+        status_code (int): One of `STATUS_UNSET`, `STATUS_OK` or `STATUS_ERROR`.
+        status_message (str): Description of an error status.
+    """
+
+    def __init__(self, name, trace_id, span_id, parent_span_id=None, attributes=None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_span_id = parent_span_id
+        self.attributes = attributes if attributes is not None else {}
+        self.start_time = time.time_ns()
+        self.end_time = None
+        self.status_code = STATUS_UNSET
+        self.status_message = ""
+        self._buffer = None
+
+    def set_attribute(self, key, value):
+        """Adds or replaces an attribute of the span."""
+        self.attributes[key] = value
+
+    def set_error(self, err):
+        """Marks the span as failed.
+        Args:
+            err (BaseException): The exception that caused the failure.
+        """
+        self.status_code = STATUS_ERROR
+        self.status_message = str(err)
+        self.attributes['exception.type'] = type(err).__name__
+
+    def to_otlp(self):
+        """Returns the span as OTLP JSON compatible dictionary."""
+        res = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': SPAN_KIND_INTERNAL,
+            'startTimeUnixNano': str(self.start_time),
+            'endTimeUnixNano': str(self.end_time if self.end_time is not None else self.start_time),
+            'attributes': [{'key': key, 'value': _encode_value(value)} for key, value in self.attributes.items()],
+            'status': {'code': self.status_code}
+        }
+        if self.parent_span_id:
+            res['parentSpanId'] = self.parent_span_id
+        if self.status_message:
+            res['status']['message'] = self.status_message
+        return res
+
+    def __repr__(self):
+        return "<%s('%s', %s)@%s>" % (type(self).__name__, self.name, self.span_id, id(self))
+
+
+class _RemoteParent(object):
+    """Span context of a span which has been created outside of the current process (e.g. a request handler)."""
+
+    __slots__ = ('trace_id', 'span_id', '_buffer')
+
+    def __init__(self, trace_id, span_id):
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self._buffer = None
+
+
+class _Attached(object):
+    """Context manager which makes a remote parent the current span."""
+
+    def __init__(self, tracer, parent):
+        self.tracer = tracer
+        self.parent = parent
+        self.token = None
+
+    def __enter__(self):
+        self.token = self.tracer.current_span.set(self.parent)
+        return self.parent
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.tracer.current_span.reset(self.token)
+
+
+def _encode_value(value):
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    if isinstance(value, (list, tuple)):
+        return {'arrayValue': {'values': [_encode_value(val) for val in value]}}
+    return {'stringValue': str(value)}
+
+
+def encode_spans(spans, resource_attributes=None):
+    """Converts spans into an OTLP JSON `ExportTraceServiceRequest`.
+    Args:
+        spans (list): The spans to encode.
+        resource_attributes (dict): Attributes describing the producing entity (e.g. 'service.name').
+    Returns:
+        dict that can be serialized with `json.dumps`.
+    """
+    resource_attributes = resource_attributes or {'service.name': 'transitions'}
+    return {'resourceSpans': [{
+        'resource': {'attributes': [{'key': key, 'value': _encode_value(value)}
+                                    for key, value in resource_attributes.items()]},
+        'scopeSpans': [{
+            'scope': {'name': 'transitions', 'version': __version__},
+            'spans': [span.to_otlp() for span in spans]
+        }]
+    }]}
+
+
+class InMemorySpanExporter(object):
+    """Collects exported spans in a list. Mostly useful for testing and debugging.
+    Attributes:
+        spans (list): All spans exported so far.
+    """
+
+    def __init__(self):
+        self.spans = []
+        self._lock = Lock()
+
+    def export(self, spans):
+        """Stores finished spans.
+        Args:
+            spans (list): Finished spans of a trace.
+        """
+        with self._lock:
+            self.spans.extend(spans)
+
+    def clear(self):
+        """Removes all stored spans."""
+        with self._lock:
+            self.spans = []
+
+    def shutdown(self):
+        """Nothing to release here."""
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = Lock()
+
+
+class FileSpanExporter(object):
+    """Appends exported spans as OTLP JSON lines to a file. Every line contains an `ExportTraceServiceRequest`
+        with the spans of one trigger and can be replayed to a collector (e.g. with the otlpjsonfile receiver).
+    Attributes:
+        path (str): File to write to.
+        resource_attributes (dict): Attributes added to the resource of every line.
+    """
+
+    def __init__(self, path, resource_attributes=None):
+        self.path = path
+        self.resource_attributes = resource_attributes
+        self._file = None
+        self._lock = Lock()
+
+    def export(self, spans):
+        """Writes finished spans to the file.
+        Args:
+            spans (list): Finished spans of a trace.
+        """
+        line = json.dumps(encode_spans(spans, self.resource_attributes), separators=(',', ':'))
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, 'a')  # pylint: disable=consider-using-with
+            self._file.write(line + '\n')
+            self._file.flush()
+
+    def shutdown(self):
+        """Closes the file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        state['_file'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = Lock()
+
+
+class Tracer(object):
+    """Creates spans for sampled triggers and passes finished traces to an exporter.
+        The currently active span is tracked per context (thread or asyncio task). Whether a trigger is sampled
+        is decided when its root span is created. Events triggered from within callbacks become part of the
+        already running trace.
+
+    Attributes:
+        sample_rate (float): Share of triggers that should be traced between 0 and 1.
+        exporter (object): Receives lists of finished spans via `export`. Defaults to `InMemorySpanExporter`.
+        current_span (ContextVar): The currently active span.
+    """
+
+    def __init__(self, sample_rate=1.0, exporter=None, rng=None):
+        """
+        Args:
+            sample_rate (float): Share of triggers that should be traced between 0 and 1.
+            exporter (object): An object with an `export(spans)` method.
+            rng (random.Random): Random number generator used for sampling and id generation.
+        """
+        if not 0 <= sample_rate <= 1:
+            raise ValueError("Sample rate must be between 0 and 1 but was {0}.".format(sample_rate))
+        self.sample_rate = sample_rate
+        self.exporter = exporter if exporter is not None else InMemorySpanExporter()
+        self._rng = rng or random.Random()
+        self.current_span = contextvars.ContextVar('current_span_%s' % id(self), default=None)
+
+    def attach(self, trace_id, span_id):
+        """Returns a context manager which continues an external trace. Spans created within the context
+            will use the passed span as parent.
+        Args:
+            trace_id (str): Hex encoded trace id.
+            span_id (str): Hex encoded span id of the parent.
+        Returns:
+            context manager
+        """
+        return _Attached(self, _RemoteParent(trace_id, span_id))
+
+    def attach_traceparent(self, traceparent):
+        """Continues an external trace passed as W3C 'traceparent' header (e.g. '00-<trace_id>-<span_id>-01').
+            Unsampled parents will not be traced.
+        Args:
+            traceparent (str): Value of the traceparent header.
+        Returns:
+            context manager
+        """
+        try:
+            _, trace_id, span_id, flags = traceparent.split('-')
+        except ValueError:
+            raise ValueError("Invalid traceparent '{0}'.".format(traceparent))
+        if not int(flags, 16) & 1:
+            return _Attached(self, _NOT_SAMPLED)
+        return self.attach(trace_id, span_id)
+
+    def start_span(self, name, attributes=None):
+        """Creates a new span as a child of the current span or as a new root when no span is active.
+        Args:
+            name (str): Name of the span.
+            attributes (dict): Initial span attributes.
+        Returns:
+            Span or None if the trace is not sampled.
+        """
+        parent = self.current_span.get()
+        if parent is _NOT_SAMPLED:
+            return None
+        if parent is None:
+            if self.sample_rate < 1 and self._rng.random() >= self.sample_rate:
+                return None
+            span = Span(name, '%032x' % self._rng.getrandbits(128), '%016x' % self._rng.getrandbits(64),
+                        attributes=attributes)
+        else:
+            span = Span(name, parent.trace_id, '%016x' % self._rng.getrandbits(64), parent.span_id,
+                        attributes=attributes)
+            span._buffer = parent._buffer  # pylint: disable=protected-access
+        if span._buffer is None:  # pylint: disable=protected-access
+            # span is the first span of this trace in the current process
+            span._buffer = [span]  # pylint: disable=protected-access
+        else:
+            span._buffer.append(span)  # pylint: disable=protected-access
+        return span
+
+    def end_span(self, span):
+        """Finishes a span and exports its trace if span is the trace's local root.
+        Args:
+            span (Span): The span to finish.
+        """
+        span.end_time = time.time_ns()
+        buffer = span._buffer  # pylint: disable=protected-access
+        if buffer[0] is span:
+            self.exporter.export(buffer)
+        span._buffer = None  # pylint: disable=protected-access
+
+    def trace(self, name, attributes, func, *args):
+        """Executes a function within a new span. If the function returns an awaitable, the span will be
+            finished when the returned awaitable has been awaited.
+        Args:
+            name (str): Name of the span.
+            attributes (dict): Initial span attributes.
+            func (callable): The function to execute.
+            *args: Arguments passed to func.
+        Returns:
+            The result of func.
+        """
+        parent = self.current_span.get()
+        if parent is _NOT_SAMPLED:
+            return func(*args)
+        span = self.start_span(name, attributes)
+        token = self.current_span.set(span if span is not None else _NOT_SAMPLED)
+        try:
+            res = func(*args)
+        except BaseException as err:
+            if span is not None:
+                span.set_error(err)
+                self.end_span(span)
+            raise
+        finally:
+            self.current_span.reset(token)
+        if span is None:
+            return res
+        if inspect.isawaitable(res):
+            return self._trace_awaitable(span, res)
+        self._finish(span, res)
+        return res
+
+    async def _trace_awaitable(self, span, awaitable):
+        token = self.current_span.set(span)
+        try:
+            res = await awaitable
+        except BaseException as err:
+            span.set_error(err)
+            self.end_span(span)
+            raise
+        finally:
+            self.current_span.reset(token)
+        self._finish(span, res)
+        return res
+
+    def _finish(self, span, res):
+        if isinstance(res, bool):
+            span.set_attribute('transitions.result', res)
+        self.end_span(span)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['current_span']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.current_span = contextvars.ContextVar('current_span_%s' % id(self), default=None)
+
+
+class TracedEvent(Event):
+    """Event mixin which opens a root span for every processed trigger."""
+
+    def _trigger(self, event_data):
+        tracer = self.machine.tracer
+        if tracer is None:
+            return super(TracedEvent, self)._trigger(event_data)
+        return tracer.trace('trigger ' + self.name,
+                            {'transitions.machine': self.machine.name.rstrip(': '), 'transitions.event': self.name,
+                             'transitions.model': type(event_data.model).__name__,
+                             'transitions.source': str(getattr(event_data.model, self.machine.model_attribute))},
+                            super(TracedEvent, self)._trigger, event_data)
+
+
+class TracedNestedEvent(NestedEvent):
+    """NestedEvent mixin which opens a span for each (scoped) processing of an event in a hierarchical machine."""
+
+    def trigger_nested(self, event_data):
+        tracer = event_data.machine.tracer
+        if tracer is None:
+            return super(TracedNestedEvent, self).trigger_nested(event_data)
+        return tracer.trace('trigger_nested', {'transitions.event': self.name,
+                                               'transitions.scope': event_data.machine.get_global_name()},
+                            super(TracedNestedEvent, self).trigger_nested, event_data)
+
+
+class TracedTransition(Transition):
+    """Transition mixin which records condition checks and state changes as spans."""
+
+    def _eval_conditions(self, event_data):
+        tracer = event_data.machine.tracer
+        if tracer is None or not self.conditions:
+            return super(TracedTransition, self)._eval_conditions(event_data)
+        return tracer.trace('conditions',
+                            {'transitions.source': self.source, 'transitions.dest': str(self.dest),
+                             'transitions.callbacks': [CallbackProfiler.identify(cond.func)
+                                                       for cond in self.conditions]},
+                            super(TracedTransition, self)._eval_conditions, event_data)
+
+    def _change_state(self, event_data):
+        tracer = event_data.machine.tracer
+        if tracer is None:
+            return super(TracedTransition, self)._change_state(event_data)
+        return tracer.trace('change_state', {'transitions.source': self.source, 'transitions.dest': str(self.dest)},
+                            super(TracedTransition, self)._change_state, event_data)
+
+    def execute(self, event_data):
+        """Extends `transitions.core.Transition.execute` by passing the machine's and the transition's
+            'before' and 'after' callbacks separately to `callbacks` which allows to name their spans."""
+        if event_data.machine.tracer is None:
+            return super(TracedTransition, self).execute(event_data)
+        _LOGGER.debug("%sInitiating transition from state %s to state %s...",
+                      event_data.machine.name, self.source, self.dest)
+
+        event_data.machine.callbacks(self.prepare, event_data)
+        _LOGGER.debug("%sExecuted callbacks before conditions.", event_data.machine.name)
+
+        if not self._eval_conditions(event_data):
+            return False
+
+        event_data.machine.callbacks(event_data.machine.before_state_change, event_data)
+        event_data.machine.callbacks(self.before, event_data)
+        _LOGGER.debug("%sExecuted callback before transition.", event_data.machine.name)
+
+        if self.dest is not None:
+            self._change_state(event_data)
+
+        event_data.machine.callbacks(self.after, event_data)
+        event_data.machine.callbacks(event_data.machine.after_state_change, event_data)
+        _LOGGER.debug("%sExecuted callback after transition.", event_data.machine.name)
+        return True
+
+
+class TracedNestedTransition(TracedTransition, NestedTransition):
+    """A NestedTransition which records condition checks and state changes as spans."""
+
+
+class TracedMachine(Machine):
+    """Machine mixin which traces triggered events. Spans are created for triggers, condition checks,
+        state changes and every non-empty list of callbacks. Callback spans are named after their phase
+        (e.g. 'prepare', 'before' or 'on_enter') if the phase can be determined.
+    Attributes:
+        tracer (Tracer): The tracer which creates spans. Tracing is disabled when None. A new tracer
+            is created when the argument is omitted.
+    """
+
+    event_cls = TracedEvent
+    transition_cls = TracedTransition
+
+    _machine_phases = ['prepare_event', 'before_state_change', 'after_state_change', 'finalize_event',
+                       'on_exception', 'on_final']
+
+    def __init__(self, model=Machine.self_literal, states=None, initial='initial', transitions=None,
+                 send_event=False, auto_transitions=True,
+                 ordered_transitions=False, ignore_invalid_triggers=None,
+                 before_state_change=None, after_state_change=None, name=None,
+                 queued=False, prepare_event=None, finalize_event=None, model_attribute='state',
+                 model_override=False, on_exception=None, on_final=None, tracer=_NEW_TRACER, **kwargs):
+        self.tracer = Tracer() if tracer is _NEW_TRACER else tracer
+        super(TracedMachine, self).__init__(
+            model=model, states=states, initial=initial, transitions=transitions,
+            send_event=send_event, auto_transitions=auto_transitions,
+            ordered_transitions=ordered_transitions, ignore_invalid_triggers=ignore_invalid_triggers,
+            before_state_change=before_state_change, after_state_change=after_state_change, name=name,
+            queued=queued, prepare_event=prepare_event, finalize_event=finalize_event,
+            model_attribute=model_attribute, model_override=model_override, on_exception=on_exception,
+            on_final=on_final, **kwargs
+        )
+
+    def callbacks(self, funcs, event_data):
+        """Extends `transitions.core.Machine.callbacks` by opening a span for non-empty callback lists."""
+        if self.tracer is None or not funcs:
+            return super(TracedMachine, self).callbacks(funcs, event_data)
+        funcs = listify(funcs)
+        return self.tracer.trace(self._get_callback_phase(funcs, event_data),
+                                 {'transitions.callbacks': [CallbackProfiler.identify(func) for func in funcs]},
+                                 super(TracedMachine, self).callbacks, funcs, event_data)
+
+    def _get_callback_phase(self, funcs, event_data):
+        for phase in self._machine_phases:
+            if funcs is getattr(self, phase):
+                return phase
+        if event_data.transition is not None:
+            for phase in self.transition_cls.dynamic_methods:
+                if funcs is getattr(event_data.transition, phase, None):
+                    return phase
+        for phase in self.state_cls.dynamic_methods:
+            if funcs is getattr(event_data.state, phase, None):
+                return phase
+        return 'callbacks'
+
+
+class TracedHierarchicalMachine(TracedMachine, HierarchicalMachine):
+    """A hierarchical machine which traces triggered events including the processing of nested scopes."""
+
+    event_cls = TracedNestedEvent
+    transition_cls = TracedNestedTransition
+
+    def _trigger_event(self, event_data, trigger):
+        if self.tracer is None:
+            return super(TracedHierarchicalMachine, self)._trigger_event(event_data, trigger)
+        return self.tracer.trace('trigger ' + trigger,
+                                 {'transitions.machine': self.name.rstrip(': '), 'transitions.event': trigger,
+                                  'transitions.model': type(event_data.model).__name__,
+                                  'transitions.source': str(getattr(event_data.model, self.model_attribute))},
+                                 super(TracedHierarchicalMachine, self)._trigger_event, event_data, trigger)
+
+
+try:
+    from .asyncio import AsyncMachine, AsyncEvent, AsyncTransition
+    from .asyncio import HierarchicalAsyncMachine, NestedAsyncEvent, NestedAsyncTransition
+
+    class TracedAsyncEvent(TracedEvent, AsyncEvent):
+        """An AsyncEvent which opens a root span for every processed trigger."""
+
+    class TracedNestedAsyncEvent(TracedNestedEvent, NestedAsyncEvent):
+        """A NestedAsyncEvent which opens a span for each (scoped) processing of an event."""
+
+    class TracedAsyncTransition(TracedTransition, AsyncTransition):
+        """An AsyncTransition which records condition checks and state changes as spans."""
+
+        # AsyncTransition already passes the 'before' and 'after' callbacks separately
+        execute = AsyncTransition.execute
+
+    class TracedNestedAsyncTransition(TracedTransition, NestedAsyncTransition):
+        """A NestedAsyncTransition which records condition checks and state changes as spans."""
+
+        # AsyncTransition already passes the 'before' and 'after' callbacks separately
+        execute = NestedAsyncTransition.execute
+
+    class TracedAsyncMachine(TracedMachine, AsyncMachine):
+        """An asynchronous machine which traces triggered events. Spans are propagated via context variables
+            and thus concurrently executed callbacks become siblings of the same parent span."""
+
+        event_cls = TracedAsyncEvent
+        transition_cls = TracedAsyncTransition
+
+    class TracedHierarchicalAsyncMachine(TracedHierarchicalMachine, HierarchicalAsyncMachine):
+        """An asynchronous hierarchical machine which traces triggered events."""
+
+        event_cls = TracedNestedAsyncEvent
+        transition_cls = TracedNestedAsyncTransition
+
+except (ImportError, SyntaxError):  # pragma: no cover
+    pass
@@ -0,0 +1,170 @@
+from contextvars import ContextVar, Token
+from logging import Logger
+from random import Random
+from threading import Lock
+from types import TracebackType
+from typing import Any, Awaitable, Callable, Dict, IO, Iterable, List, Literal, Optional, Protocol, Sequence, Type, Union
+from enum import Enum
+
+from ..core import Callback, CallbacksArg, Event, EventData, Machine, ModelParameter, StateConfig, \
+    StateIdentifier, Transition, TransitionConfig
+from .nesting import HierarchicalMachine, NestedEvent, NestedEventData, NestedTransition
+from .asyncio import AsyncMachine, AsyncEvent, AsyncTransition, HierarchicalAsyncMachine, NestedAsyncEvent, \
+    NestedAsyncTransition, AsyncCallbacksArg, AsyncTransitionConfig
+
+_LOGGER: Logger
+
+STATUS_UNSET: int
+STATUS_OK: int
+STATUS_ERROR: int
+SPAN_KIND_INTERNAL: int
+
+_NOT_SAMPLED: object
+_NEW_TRACER: object
+
+AttributeValue = Union[str, bool, int, float, Sequence[str]]
+
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_span_id: Optional[str]
+    start_time: int
+    end_time: Optional[int]
+    attributes: Dict[str, AttributeValue]
+    status_code: int
+    status_message: str
+    _buffer: Optional[List[Span]]
+    def __init__(self, name: str, trace_id: str, span_id: str, parent_span_id: Optional[str] = ...,
+                 attributes: Optional[Dict[str, AttributeValue]] = ...) -> None: ...
+    def set_attribute(self, key: str, value: AttributeValue) -> None: ...
+    def set_error(self, err: BaseException) -> None: ...
+    def to_otlp(self) -> Dict[str, Any]: ...
+    def __repr__(self) -> str: ...
+
+class _RemoteParent:
+    trace_id: str
+    span_id: str
+    _buffer: Optional[List[Span]]
+    def __init__(self, trace_id: str, span_id: str) -> None: ...
+
+class _Attached:
+    tracer: Tracer
+    parent: Union[_RemoteParent, object]
+    token: Optional[Token[Union[Span, _RemoteParent, object, None]]]
+    def __init__(self, tracer: Tracer, parent: Union[_RemoteParent, object]) -> None: ...
+    def __enter__(self) -> Union[_RemoteParent, object]: ...
+    def __exit__(self, exc_type: Optional[Type[BaseException]], exc_val: Optional[BaseException],
+                 exc_tb: Optional[TracebackType]) -> None: ...
+
+def _encode_value(value: AttributeValue) -> Dict[str, Any]: ...
+
+def encode_spans(spans: Sequence[Span],
+                 resource_attributes: Optional[Dict[str, AttributeValue]] = ...) -> Dict[str, Any]: ...
+
+class SpanExporter(Protocol):
+    def export(self, spans: List[Span]) -> None: ...
+    def shutdown(self) -> None: ...
+
+class InMemorySpanExporter:
+    spans: List[Span]
+    _lock: Lock
+    def __init__(self) -> None: ...
+    def export(self, spans: List[Span]) -> None: ...
+    def clear(self) -> None: ...
+    def shutdown(self) -> None: ...
+    def __getstate__(self) -> Dict[str, Any]: ...
+    def __setstate__(self, state: Dict[str, Any]) -> None: ...
+
+class FileSpanExporter:
+    path: str
+    resource_attributes: Optional[Dict[str, AttributeValue]]
+    _file: Optional[IO[str]]
+    _lock: Lock
+    def __init__(self, path: str, resource_attributes: Optional[Dict[str, AttributeValue]] = ...) -> None: ...
+    def export(self, spans: List[Span]) -> None: ...
+    def shutdown(self) -> None: ...
+    def __getstate__(self) -> Dict[str, Any]: ...
+    def __setstate__(self, state: Dict[str, Any]) -> None: ...
+
+class Tracer:
+    sample_rate: float
+    exporter: SpanExporter
+    _rng: Random
+    current_span: ContextVar[Union[Span, _RemoteParent, object, None]]
+    def __init__(self, sample_rate: float = ..., exporter: Optional[SpanExporter] = ...,
+                 rng: Optional[Random] = ...) -> None: ...
+    def attach(self, trace_id: str, span_id: str) -> _Attached: ...
+    def attach_traceparent(self, traceparent: str) -> _Attached: ...
+    def start_span(self, name: str, attributes: Optional[Dict[str, AttributeValue]] = ...) -> Optional[Span]: ...
+    def end_span(self, span: Span) -> None: ...
+    def trace(self, name: str, attributes: Optional[Dict[str, AttributeValue]], func: Callable[..., Any],
+              *args: Any) -> Any: ...
+    async def _trace_awaitable(self, span: Span, awaitable: Awaitable[Any]) -> Any: ...
+    def _finish(self, span: Span, res: Any) -> None: ...
+    def __getstate__(self) -> Dict[str, Any]: ...
+    def __setstate__(self, state: Dict[str, Any]) -> None: ...
+
+class TracedEvent(Event):
+    machine: TracedMachine
+    def _trigger(self, event_data: EventData) -> bool: ...
+
+class TracedNestedEvent(NestedEvent):
+    def trigger_nested(self, event_data: NestedEventData) -> bool: ...
+
+class TracedTransition(Transition):
+    def _eval_conditions(self, event_data: EventData) -> bool: ...
+    def _change_state(self, event_data: EventData) -> None: ...
+    def execute(self, event_data: EventData) -> bool: ...
+
+class TracedNestedTransition(TracedTransition, NestedTransition): ...
+
+class TracedMachine(Machine):
+    tracer: Optional[Tracer]
+    _machine_phases: List[str]
+    def __init__(self, model: Optional[ModelParameter] = ...,
+                 states: Optional[Union[Sequence[StateConfig], Type[Enum]]] = ...,
+                 initial: Optional[StateIdentifier] = ...,
+                 transitions: Optional[Union[TransitionConfig, Sequence[TransitionConfig]]] = ...,
+                 send_event: bool = ..., auto_transitions: bool = ..., ordered_transitions: bool = ...,
+                 ignore_invalid_triggers: Optional[bool] = ...,
+                 before_state_change: CallbacksArg = ..., after_state_change: CallbacksArg = ...,
+                 name: str = ..., queued: bool = ...,
+                 prepare_event: CallbacksArg = ..., finalize_event: CallbacksArg = ...,
+                 model_attribute: str = ..., model_override: bool = ..., on_exception: CallbacksArg = ...,
+                 on_final: CallbacksArg = ..., tracer: Optional[Tracer] = ...,
+                 **kwargs: Any) -> None: ...
+    def callbacks(self, funcs: Iterable[Callback], event_data: EventData) -> None: ...
+    def _get_callback_phase(self, funcs: Iterable[Callback], event_data: EventData) -> str: ...
+
+class TracedHierarchicalMachine(TracedMachine, HierarchicalMachine):
+    def _trigger_event(self, event_data: NestedEventData, trigger: str) -> Optional[bool]: ...
+
+class TracedAsyncEvent(TracedEvent, AsyncEvent):  # type: ignore[misc]
+    ...
+
+class TracedNestedAsyncEvent(TracedNestedEvent, NestedAsyncEvent):  # type: ignore[misc]
+    ...
+
+class TracedAsyncTransition(TracedTransition, AsyncTransition):  # type: ignore[misc]
+    ...
+
+class TracedNestedAsyncTransition(TracedTransition, NestedAsyncTransition):  # type: ignore[misc]
+    ...
+
+class TracedAsyncMachine(TracedMachine, AsyncMachine):  # type: ignore[misc]
+    def __init__(self, model: Optional[ModelParameter] = ...,
+                 states: Optional[Union[Sequence[StateConfig], Type[Enum]]] = ...,
+                 initial: Optional[StateIdentifier] = ...,
+                 transitions: Optional[Sequence[AsyncTransitionConfig]] = ...,
+                 send_event: bool = ..., auto_transitions: bool = ..., ordered_transitions: bool = ...,
+                 ignore_invalid_triggers: Optional[bool] = ...,
+                 before_state_change: AsyncCallbacksArg = ..., after_state_change: AsyncCallbacksArg = ...,
+                 name: str = ..., queued: Union[bool, Literal["model"]] = ...,
+                 prepare_event: AsyncCallbacksArg = ..., finalize_event: AsyncCallbacksArg = ...,
+                 model_attribute: str = ..., model_override: bool = ..., on_exception: AsyncCallbacksArg = ...,
+                 on_final: AsyncCallbacksArg = ..., tracer: Optional[Tracer] = ...,
+                 **kwargs: Any) -> None: ...
+
+class TracedHierarchicalAsyncMachine(TracedHierarchicalMachine, HierarchicalAsyncMachine):  # type: ignore[misc]
+    ...